@@ -1,40 +1,26 @@
 import sys
-import random
-import string
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QPushButton, 
                              QGridLayout, QLineEdit, QLabel, QProgressBar, 
-                             QTextEdit, QMessageBox, QComboBox, QSpinBox, 
+                             QMessageBox, QComboBox, QSpinBox, 
                              QCheckBox)
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
-class RandomWordGenerator:
-    """
-    Класс для генерации случайных слов и имен.
-    """
-    @staticmethod
-    def generate_random_word(length):
-        """
-        Генерация случайного слова заданной длины.
-        """
-        letters = string.ascii_lowercase
-        return ''.join(random.choice(letters) for _ in range(length))
-
-    @staticmethod
-    def generate_random_name():
-        """
-        Генерация случайного имени.
-        """
-        first_names = ["Алексей", "Мария", "Дмитрий", "Анна", "Сергей", "Екатерина", "Иван", "Ольга"]
-        last_names = ["Иванов", "Петров", "Сидоров", "Кузнецов", "Смирнов", "Попов", "Зайцев", "Лебедев"]
-        return f"{random.choice(first_names)} {random.choice(last_names)}"
+from rwg import RandomWordGenerator
+from rwg.alphabet import compile_alphabet
+from rwg.gui import (DIAGNOSTICS_FLAG, GUI_CHUNK_SIZE, PREFETCH_LIMIT, DiagnosticsPanel,
+                     GenerationRunner, ResultView, enable_diagnostics)
+from rwg.prefetch import PrefetchPool
 
-    @staticmethod
-    def generate_random_words(count, length):
-        """
-        Генерация списка случайных слов заданной длины.
-        """
-        return [RandomWordGenerator.generate_random_word(length) for _ in range(count)]
+# Алфавиты для выбора в окне: подпись и имя встроенного алфавита
+ALPHABET_CHOICES = (
+    ("Латиница", "latin"),
+    ("Кириллица", "cyrillic"),
+    ("Кириллица (разный регистр)", "cyrillic_mixed"),
+    ("Латиница (разный регистр)", "latin_mixed"),
+    ("Буквы и цифры", "alphanumeric"),
+    ("Цифры", "digits"),
+)
 
 class WordGenerator(QWidget):
     """
@@ -47,23 +33,37 @@ class WordGenerator(QWidget):
 
         font = QFont("Arial", 16)
 
+        # Собственный генератор окна: фоновая генерация не делит состояние
+        # с глобальным модулем random
+        self.generator = RandomWordGenerator()
+        # Небольшие запросы берутся из буферов, которые пополняются в фоне
+        self.pool = PrefetchPool(RandomWordGenerator())
+        self.runner = GenerationRunner(self)
+        self.runner.chunk_ready.connect(self.on_chunk_ready)
+        self.runner.progress.connect(self.on_progress)
+        self.runner.failed.connect(self.on_generation_failed)
+        self.runner.finished.connect(self.on_generation_finished)
+
         # Кнопки управления
         self.help_button = QPushButton("?")
         self.help_button.clicked.connect(self.show_help)
 
+        self.copy_button = QPushButton("Копировать")
+        self.copy_button.clicked.connect(self.copy_result)
+
         layout = QGridLayout()
         layout.addWidget(self.help_button, 0, 0)
+        layout.addWidget(self.copy_button, 0, 1)
 
         # Результат
-        self.result = QTextEdit()
-        self.result.setReadOnly(True)
+        self.result = ResultView()
         self.result.setFont(font)
         layout.addWidget(self.result, 1, 0, 1, 5)
 
         # Количество слов
         layout.addWidget(QLabel("Количество слов:"), 2, 0)
         self.count_input = QSpinBox()
-        self.count_input.setRange(1, 100)
+        self.count_input.setRange(1, 1_000_000)
         self.count_input.setValue(1)
         layout.addWidget(self.count_input, 2, 1)
 
@@ -74,25 +74,115 @@ class WordGenerator(QWidget):
         self.length_input.setValue(5)
         layout.addWidget(self.length_input, 2, 3)
 
-        # Кнопка генерации
+        # Алфавит: встроенный или свой набор символов
+        layout.addWidget(QLabel("Алфавит:"), 3, 0)
+        self.alphabet_input = QComboBox()
+        for title, name in ALPHABET_CHOICES:
+            self.alphabet_input.addItem(title, name)
+        self.alphabet_input.setEditable(True)
+        self.alphabet_input.setToolTip("Выберите алфавит или введите свои символы")
+        layout.addWidget(self.alphabet_input, 3, 1, 1, 3)
+
+        # Кнопки генерации и отмены
         self.generate_button = QPushButton("Сгенерировать")
-        self.generate_button.clicked.connect(self.generate_words)
-        layout.addWidget(self.generate_button, 3, 0, 1, 5)
+        # Через lambda: аргумент checked сигнала clicked не должен попасть в
+        # generate_words, в том числе в обертку пробы (--diagnostics)
+        self.generate_button.clicked.connect(lambda: self.generate_words())
+        layout.addWidget(self.generate_button, 4, 0, 1, 4)
+
+        self.cancel_button = QPushButton("Отмена")
+        self.cancel_button.clicked.connect(self.runner.cancel)
+        self.cancel_button.setEnabled(False)
+        layout.addWidget(self.cancel_button, 4, 4)
+
+        # Индикатор выполнения
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 100)
+        self.progress.setValue(0)
+        layout.addWidget(self.progress, 5, 0, 1, 5)
 
         self.setLayout(layout)
 
     def generate_words(self):
         """
-        Генерация случайных слов и имен.
+        Запуск генерации случайных слов в фоновом потоке.
         """
+        if self.runner.is_running():
+            return
+        count = self.count_input.value()
+        length = self.length_input.value()
         try:
-            count = self.count_input.value()
-            length = self.length_input.value()
-            words = RandomWordGenerator.generate_random_words(count, length)
-            result_text = f"Сгенерированные слова ({count} шт.):\n{words}"
-            self.result.setText(result_text)
-        except Exception as e:
-            self.result.setText(f"Ошибка: {str(e)}")
+            alphabet = compile_alphabet(self.selected_alphabet())
+        except ValueError as e:
+            QMessageBox.warning(self, "Алфавит", str(e))
+            return
+        self.result.clear(f"Сгенерированные слова ({count} шт.):")
+        if count <= PREFETCH_LIMIT and self.pool.accepts('words', length):
+            # Небольшой запрос - выборка из буфера пула прямо в потоке окна;
+            # длинные слова пул не буферизует, они идут в фоновый поток
+            self.result.append_items(self.pool.draw('words', count, length, alphabet))
+            self.progress.setValue(100)
+            return
+        chunks = self.generator.iter_words_batches(count, length, GUI_CHUNK_SIZE,
+                                                   alphabet=alphabet)
+        self.progress.setValue(0)
+        self.set_generating(True)
+        self.runner.start(chunks, count)
+
+    def selected_alphabet(self):
+        """
+        Имя выбранного алфавита или введенная строка символов.
+        """
+        text = self.alphabet_input.currentText()
+        index = self.alphabet_input.findText(text)
+        return self.alphabet_input.itemData(index) if index >= 0 else text
+
+    def set_generating(self, running):
+        """
+        Переключение кнопок на время фоновой генерации.
+        """
+        self.generate_button.setEnabled(not running)
+        self.cancel_button.setEnabled(running)
+
+    def on_chunk_ready(self, chunk):
+        """
+        Добавление очередной порции результата.
+        """
+        self.result.append_items(chunk)
+
+    def on_progress(self, value):
+        """
+        Обновление индикатора выполнения.
+        """
+        self.progress.setValue(value)
+
+    def on_generation_failed(self, message):
+        """
+        Показ ошибки генерации.
+        """
+        self.result.clear(f"Ошибка: {message}")
+
+    def on_generation_finished(self, cancelled):
+        """
+        Завершение фоновой генерации.
+        """
+        self.set_generating(False)
+        if cancelled:
+            self.result.set_header("Генерация отменена")
+
+    def copy_result(self):
+        """
+        Копирование всего результата в буфер обмена.
+        """
+        self.result.copy_to_clipboard()
+
+    def closeEvent(self, event):
+        """
+        Остановка фоновой генерации при закрытии окна.
+        """
+        self.runner.shutdown()
+        self.pool.close()
+        super().closeEvent(event)
 
     def show_help(self):
         """
@@ -101,10 +191,14 @@ class WordGenerator(QWidget):
         QMessageBox.information(self, "Справка", 
             "Генератор случайных слов:\n"
             "1. Укажите количество и длину слов.\n"
-            "2. Нажмите 'Сгенерировать' для получения результата.")
+            "2. Выберите алфавит или введите свои символы.\n"
+            "3. Нажмите 'Сгенерировать' для получения результата.")
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    if DIAGNOSTICS_FLAG in sys.argv:
+        diagnostics = DiagnosticsPanel(enable_diagnostics(WordGenerator))
+        diagnostics.show()
     generator = WordGenerator()
     generator.show()
     sys.exit(app.exec_())
\ No newline at end of file
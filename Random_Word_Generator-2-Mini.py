@@ -1,48 +1,20 @@
 import sys
-import random
-import string
-from PyQt5.QtWidgets import (QApplication, QWidget, QPushButton, 
-                             QGridLayout, QLabel, QTextEdit, QMessageBox, 
-                             QComboBox, QSpinBox)
-from PyQt5.QtGui import QFont
-
-class RandomWordGenerator:
-    """
-    Класс для генерации случайных слов и словосочетаний.
-    """
-    @staticmethod
-    def generate_random_word(length):
-        """
-        Генерация случайного слова заданной длины.
-        """
-        letters = string.ascii_lowercase
-        return ''.join(random.choice(letters) for _ in range(length))
-
-    @staticmethod
-    def generate_random_phrase(word_count):
-        """
-        Генерация случайного словосочетания.
-        """
-        nouns = ['кот', 'дом', 'стол', 'книга', 'город', 'друг', 'машина', 'солнце']
-        adjectives = ['красный', 'большой', 'маленький', 'яркий', 'старый', 'новый', 'синий', 'зеленый']
-        verbs = ['идет', 'читает', 'смеется', 'думает', 'работает', 'играет', 'танцует', 'поет']
+import time
 
-        phrase_types = [
-            lambda: f"{random.choice(adjectives)} {random.choice(nouns)}",
-            lambda: f"{random.choice(nouns)} {random.choice(verbs)}",
-            lambda: f"{random.choice(adjectives)} {random.choice(nouns)} {random.choice(verbs)}"
-        ]
+# Начало отсчета времени до готовности окна (--measure-startup)
+STARTED = time.perf_counter()
 
-        return [random.choice(phrase_types)() for _ in range(word_count)]
+from PyQt5.QtWidgets import (QApplication, QWidget, QPushButton, 
+                             QGridLayout, QLabel, QMessageBox, 
+                             QComboBox, QSpinBox, QProgressBar, QFileDialog)
+from PyQt5.QtGui import QFont
 
-    @staticmethod
-    def generate_random_names(count):
-        """
-        Генерация случайных имен.
-        """
-        first_names = ["Алексей", "Мария", "Дмитрий", "Анна", "Сергей", "Екатерина", "Иван", "Ольга"]
-        last_names = ["Иванов", "Петров", "Сидоров", "Кузнецов", "Смирнов", "Попов", "Зайцев", "Лебедев"]
-        return [f"{random.choice(first_names)} {random.choice(last_names)}" for _ in range(count)]
+from rwg import RandomWordGenerator
+from rwg.gui import (DIAGNOSTICS_FLAG, EXPORT_FILTERS, GUI_CHUNK_SIZE, HISTORY_FLAG,
+                     MEASURE_STARTUP_FLAG, PREFETCH_LIMIT, DiagnosticsPanel, GenerationRunner,
+                     ResultView, enable_diagnostics, report_startup)
+from rwg.history import DEFAULT_EXPORT_PATH, DEFAULT_PATH, HistoryStore
+from rwg.prefetch import PrefetchPool
 
 class RandomGenerator(QWidget):
     """
@@ -53,7 +25,20 @@ class RandomGenerator(QWidget):
         self.is_dark_theme = True
         self.setWindowTitle("Генератор Случайных Слов")
         self.setGeometry(100, 100, 600, 500)
-        self.history = []
+        # Без --history журнал временный и удаляется при закрытии окна
+        self.history = HistoryStore(DEFAULT_PATH if HISTORY_FLAG in sys.argv else None)
+        self.current_header = None
+
+        # Собственный генератор окна: фоновая генерация не делит состояние
+        # с глобальным модулем random
+        self.generator = RandomWordGenerator()
+        # Небольшие запросы берутся из буферов, которые пополняются в фоне
+        self.pool = PrefetchPool(RandomWordGenerator())
+        self.runner = GenerationRunner(self)
+        self.runner.chunk_ready.connect(self.on_chunk_ready)
+        self.runner.progress.connect(self.on_progress)
+        self.runner.failed.connect(self.on_generation_failed)
+        self.runner.finished.connect(self.on_generation_finished)
         
         self.init_ui()
 
@@ -68,14 +53,15 @@ class RandomGenerator(QWidget):
         self.theme_button = self.create_button("Светлая тема", self.toggle_theme)
         self.help_button = self.create_button("?", self.show_help)
         self.export_button = self.create_button("Экспорт", self.export_history)
+        self.copy_button = self.create_button("Копировать", self.copy_result)
 
         layout.addWidget(self.theme_button, 0, 0)
         layout.addWidget(self.help_button, 0, 1)
         layout.addWidget(self.export_button, 0, 2)
+        layout.addWidget(self.copy_button, 0, 3)
 
         # Результат
-        self.result = QTextEdit()
-        self.result.setReadOnly(True)
+        self.result = ResultView()
         self.result.setFont(font)
         layout.addWidget(self.result, 1, 0, 1, 5)
 
@@ -92,13 +78,22 @@ class RandomGenerator(QWidget):
         # Длина слова / количество
         layout.addWidget(QLabel("Длина слова/Количество:"), 3, 0)
         self.count_input = QSpinBox()
-        self.count_input.setRange(1, 100)
+        self.count_input.setRange(1, 1_000_000)
         self.count_input.setValue(1)
         layout.addWidget(self.count_input, 3, 1)
 
-        # Кнопка генерации
+        # Кнопки генерации и отмены
         self.generate_button = self.create_button("Сгенерировать", self.generate_words)
-        layout.addWidget(self.generate_button, 4, 0, 1, 5)
+        layout.addWidget(self.generate_button, 4, 0, 1, 4)
+        self.cancel_button = self.create_button("Отмена", self.runner.cancel)
+        self.cancel_button.setEnabled(False)
+        layout.addWidget(self.cancel_button, 4, 4)
+
+        # Индикатор выполнения
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 100)
+        self.progress.setValue(0)
+        layout.addWidget(self.progress, 5, 0, 1, 5)
 
         self.setLayout(layout)
         self.apply_theme()
@@ -106,35 +101,100 @@ class RandomGenerator(QWidget):
     def create_button(self, text, connection):
         """
         Создание кнопки с заданным текстом и обработчиком.
+
+        Обработчик вызывается без аргументов: checked сигнала clicked не
+        должен попасть в него, в том числе в обертку пробы (--diagnostics).
         """
         button = QPushButton(text)
-        button.clicked.connect(connection)
+        button.clicked.connect(lambda: connection())
         return button
 
     def generate_words(self):
         """
-        Генерация случайных слов, словосочетаний или имен.
+        Запуск генерации случайных слов, словосочетаний или имен в фоновом потоке.
         """
-        try:
-            count = self.count_input.value()
-            generation_type = self.generation_type.currentText()
+        if self.runner.is_running():
+            return
+        count = self.count_input.value()
+        generation_type = self.generation_type.currentText()
+
+        if generation_type == 'Случайные слова':
+            chunks = self.generator.iter_words_batches(5, count, GUI_CHUNK_SIZE)
+            kind, total, length = 'words', 5, count
+            self.current_header = f"Сгенерированы случайные слова (длина {count}):"
+
+        elif generation_type == 'Словосочетания':
+            chunks = self.generator.iter_random_phrases(count, GUI_CHUNK_SIZE)
+            kind, total, length = 'phrases', count, 0
+            self.current_header = f"Сгенерированы словосочетания ({count} шт.):"
 
-            if generation_type == 'Случайные слова':
-                words = [RandomWordGenerator.generate_random_word(count) for _ in range(5)]
-                result_text = f"Сгенерированы случайные слова (длина {count}):\n{words}"
+        elif generation_type == 'Случайные имена':
+            chunks = self.generator.iter_random_names(count, GUI_CHUNK_SIZE)
+            kind, total, length = 'names', count, 0
+            self.current_header = f"Сгенерированы случайные имена ({count} шт.):"
 
-            elif generation_type == 'Словосочетания':
-                phrases = RandomWordGenerator.generate_random_phrase(count)
-                result_text = f"Сгенерированы словосочетания ({count} шт.):\n{phrases}"
+        self.result.clear(self.current_header)
+        if total <= PREFETCH_LIMIT and self.pool.accepts(kind, length):
+            # Небольшой запрос - выборка из буфера пула прямо в потоке окна;
+            # длинные слова пул не буферизует, они идут в фоновый поток
+            self.result.append_items(self.pool.draw(kind, total, length))
+            self.progress.setValue(100)
+            self.on_generation_finished(False)
+            return
+        self.progress.setValue(0)
+        self.set_generating(True)
+        self.runner.start(chunks, total)
 
-            elif generation_type == 'Случайные имена':
-                names = RandomWordGenerator.generate_random_names(count)
-                result_text = f"Сгенерированы случайные имена ({count} шт.):\n{names}"
+    def set_generating(self, running):
+        """
+        Переключение кнопок на время фоновой генерации.
+        """
+        self.generate_button.setEnabled(not running)
+        self.cancel_button.setEnabled(running)
+
+    def on_chunk_ready(self, chunk):
+        """
+        Добавление очередной порции результата.
+        """
+        self.result.append_items(chunk)
+
+    def on_progress(self, value):
+        """
+        Обновление индикатора выполнения.
+        """
+        self.progress.setValue(value)
+
+    def on_generation_failed(self, message):
+        """
+        Показ ошибки генерации.
+        """
+        self.current_header = None
+        self.result.clear(f"Ошибка: {message}")
+
+    def on_generation_finished(self, cancelled):
+        """
+        Завершение фоновой генерации: запись в историю или отметка об отмене.
+        """
+        self.set_generating(False)
+        if cancelled:
+            self.result.set_header(f"{self.current_header} Генерация отменена")
+        elif self.current_header is not None:
+            self.history.add(self.current_header, self.result.items())
+
+    def copy_result(self):
+        """
+        Копирование всего результата в буфер обмена.
+        """
+        self.result.copy_to_clipboard()
 
-            self.result.setText(result_text)
-            self.history.append(result_text)
-        except Exception as e:
-            self.result.setText(f"Ошибка: {str(e)}")
+    def closeEvent(self, event):
+        """
+        Остановка фоновой генерации и закрытие истории при закрытии окна.
+        """
+        self.runner.shutdown()
+        self.pool.close()
+        self.history.close()
+        super().closeEvent(event)
 
     def apply_theme(self):
         """
@@ -144,13 +204,13 @@ class RandomGenerator(QWidget):
             self.setStyleSheet("""
                 QWidget { background-color: #2E2E2E; color: white; }
                 QPushButton { background-color: #4C4C4C; color: white; }
-                QTextEdit { background-color: #1E1E1E; color: white; }
+                QListView { background-color: #1E1E1E; color: white; }
             """)
         else:
             self.setStyleSheet("""
                 QWidget { background-color: #FFFFFF; color: black; }
                 QPushButton { background-color: #CCCCCC; color: black; }
-                QTextEdit { background-color: #F0F0F0; color: black; }
+                QListView { background-color: #F0F0F0; color: black; }
             """)
 
     def toggle_theme(self):
@@ -172,15 +232,28 @@ class RandomGenerator(QWidget):
 
     def export_history(self):
         """
-        Экспортировать историю генерации в текстовый файл.
+        Экспортировать новые записи истории генерации в файл; формат
+        (текст, JSON Lines, CSV, колоночный) выбирается по расширению.
         """
-        with open("history.txt", "w") as file:
-            for entry in self.history:
-                file.write(entry + "\n")
-        QMessageBox.information(self, "Экспорт", "История генерации экспортирована в history.txt")
+        path, _ = QFileDialog.getSaveFileName(self, "Экспорт истории",
+                                              DEFAULT_EXPORT_PATH, EXPORT_FILTERS)
+        if not path:
+            return
+        try:
+            exported = self.history.export(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Экспорт", f"Ошибка экспорта: {e}")
+            return
+        QMessageBox.information(self, "Экспорт",
+            f"Новых записей экспортировано в {path}: {exported}")
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    if DIAGNOSTICS_FLAG in sys.argv:
+        diagnostics = DiagnosticsPanel(enable_diagnostics(RandomGenerator))
+        diagnostics.show()
     generator = RandomGenerator()
     generator.show()
+    if MEASURE_STARTUP_FLAG in sys.argv:
+        report_startup(STARTED)
     sys.exit(app.exec_()) 
\ No newline at end of file
@@ -1,71 +1,60 @@
 import sys
-import random
-import re
-import secrets
-import string
-import matplotlib.pyplot as plt
+import time
+
+# Начало отсчета времени до готовности окна (--measure-startup)
+STARTED = time.perf_counter()
+
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QPushButton, 
                             QGridLayout, QLineEdit, QLabel, QProgressBar, 
-                            QTextEdit, QMessageBox, QComboBox, QSpinBox, 
-                            QCheckBox, QDialog)
+                            QMessageBox, QComboBox, QSpinBox, 
+                            QCheckBox, QDialog, QFileDialog)
 from PyQt5.QtGui import QFont, QPixmap
 from PyQt5.QtCore import QTimer, Qt, QPropertyAnimation
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
-from PyQt5.QtCore import QUrl
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 
-class RandomWordGenerator:
-    """
-    Класс для генерации случайных слов и словосочетаний.
-    """
-    @staticmethod
-    def generate_random_word(length):
-        """
-        Генерация случайного слова заданной длины.
-        """
-        letters = string.ascii_lowercase
-        return ''.join(random.choice(letters) for _ in range(length))
+from rwg import RandomWordGenerator
+from rwg.gui import (DIAGNOSTICS_FLAG, EXPORT_FILTERS, GUI_CHUNK_SIZE, HISTORY_FLAG,
+                     MEASURE_STARTUP_FLAG, NO_SPLASH_FLAG, PREFETCH_LIMIT, DiagnosticsPanel,
+                     GenerationRunner, ResultView, enable_diagnostics, iter_startup_stages,
+                     report_startup)
 
-    @staticmethod
-    def generate_random_phrase(word_count):
-        """
-        Генерация случайного словосочетания.
-        """
-        nouns = ['кот', 'дом', 'стол', 'книга', 'город', 'друг', 'машина', 'солнце']
-        adjectives = ['красный', 'большой', 'маленький', 'яркий', 'старый', 'новый', 'синий', 'зеленый']
-        verbs = ['идет', 'читает', 'смеется', 'думает', 'работает', 'играет', 'танцует', 'поет']
-
-        phrase_types = [
-            lambda: f"{random.choice(adjectives)} {random.choice(nouns)}",
-            lambda: f"{random.choice(nouns)} {random.choice(verbs)}",
-            lambda: f"{random.choice(adjectives)} {random.choice(nouns)} {random.choice(verbs)}"
-        ]
-
-        return [random.choice(phrase_types)() for _ in range(word_count)]
-
-    @staticmethod
-    def generate_random_names(count):
-        """
-        Генерация случайных имен.
-        """
-        first_names = ["Алексей", "Мария", "Дмитрий", "Анна", "Сергей", "Екатерина", "Иван", "Ольга"]
-        last_names = ["Иванов", "Петров", "Сидоров", "Кузнецов", "Смирнов", "Попов", "Зайцев", "Лебедев"]
-        return [f"{random.choice(first_names)} {random.choice(last_names)}" for _ in range(count)]
+# Длина слова в окне по умолчанию: буфер пула для нее заполняется при загрузке
+DEFAULT_LENGTH = 1
+# Шаблон в поле ввода по умолчанию (см. rwg.pattern)
+DEFAULT_PATTERN = "Cvc-####"
 
 class RandomGenerator(QWidget):
     """
     Класс для создания графического интерфейса генератора случайных слов.
+
+    generator и pool можно подготовить заранее (см. load_resources);
+    иначе они создаются здесь.
     """
-    def __init__(self):
+    def __init__(self, generator=None, pool=None):
         super().__init__()
-        self.player = QMediaPlayer()
+        # Модули с SQLite и фоновым пулом импортируются при создании окна
+        # (или заранее на этапе загрузки), а не при запуске скрипта
+        from rwg.history import DEFAULT_PATH, HistoryStore
+        from rwg.prefetch import PrefetchPool
+
         self.is_dark_theme = True
         self.setWindowTitle("Генератор Случайных Слов")
         self.setGeometry(100, 100, 800, 800)
 
-        self.history = []
+        # Без --history журнал временный и удаляется при закрытии окна
+        self.history = HistoryStore(DEFAULT_PATH if HISTORY_FLAG in sys.argv else None)
+        self.current_header = None
         font = QFont("Arial", 16)
 
+        # Собственный криптографически стойкий генератор окна
+        self.generator = RandomWordGenerator('secure') if generator is None else generator
+        # Небольшие запросы берутся из буферов, которые пополняются в фоне
+        self.pool = PrefetchPool(RandomWordGenerator('secure')) if pool is None else pool
+        self.runner = GenerationRunner(self)
+        self.runner.chunk_ready.connect(self.on_chunk_ready)
+        self.runner.progress.connect(self.on_progress)
+        self.runner.failed.connect(self.on_generation_failed)
+        self.runner.finished.connect(self.on_generation_finished)
+
         # Кнопки управления
         self.theme_button = QPushButton("Светлая тема")
         self.theme_button.clicked.connect(self.toggle_theme)
@@ -76,14 +65,17 @@ class RandomGenerator(QWidget):
         self.export_button = QPushButton("Экспорт")
         self.export_button.clicked.connect(self.export_history)
 
+        self.copy_button = QPushButton("Копировать")
+        self.copy_button.clicked.connect(self.copy_result)
+
         layout = QGridLayout()
         layout.addWidget(self.theme_button, 0, 0)
         layout.addWidget(self.help_button, 0, 1)
         layout.addWidget(self.export_button, 0, 2)
+        layout.addWidget(self.copy_button, 0, 3)
 
         # Результат
-        self.result = QTextEdit()
-        self.result.setReadOnly(True)
+        self.result = ResultView()
         self.result.setFont(font)
         layout.addWidget(self.result, 1, 0, 1, 5)
 
@@ -93,49 +85,155 @@ class RandomGenerator(QWidget):
         self.generation_type.addItems([
             'Случайные слова', 
             'Словосочетания', 
-            'Случайные имена'
+            'Случайные имена',
+            'По шаблону'
         ])
+        self.generation_type.currentTextChanged.connect(self.on_type_changed)
         layout.addWidget(self.generation_type, 2, 1)
 
+        # Шаблон для генерации по шаблону
+        self.pattern_input = QLineEdit(DEFAULT_PATTERN)
+        self.pattern_input.setPlaceholderText("Шаблон, например Cvc-#### или {adj} {noun}")
+        self.pattern_input.setEnabled(False)
+        layout.addWidget(self.pattern_input, 2, 2, 1, 3)
+
         # Длина слова / количество
         layout.addWidget(QLabel("Длина слова/Количество:"), 3, 0)
         self.count_input = QSpinBox()
-        self.count_input.setRange(1, 100)
-        self.count_input.setValue(1)
+        self.count_input.setRange(1, 1_000_000)
+        self.count_input.setValue(DEFAULT_LENGTH)
         layout.addWidget(self.count_input, 3, 1)
 
-        # Кнопка генерации
+        # Кнопки генерации и отмены
         self.generate_button = QPushButton("Сгенерировать")
-        self.generate_button.clicked.connect(self.generate_words)
-        layout.addWidget(self.generate_button, 4, 0, 1, 5)
+        # Через lambda: аргумент checked сигнала clicked не должен попасть в
+        # generate_words, в том числе в обертку пробы (--diagnostics)
+        self.generate_button.clicked.connect(lambda: self.generate_words())
+        layout.addWidget(self.generate_button, 4, 0, 1, 4)
+
+        self.cancel_button = QPushButton("Отмена")
+        self.cancel_button.clicked.connect(self.runner.cancel)
+        self.cancel_button.setEnabled(False)
+        layout.addWidget(self.cancel_button, 4, 4)
+
+        # Индикатор выполнения
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 100)
+        self.progress.setValue(0)
+        layout.addWidget(self.progress, 5, 0, 1, 5)
 
         self.setLayout(layout)
         self.apply_theme()
 
     def generate_words(self):
         """
-        Генерация случайных слов, словосочетаний или имен.
+        Запуск генерации случайных слов, словосочетаний или имен в фоновом потоке.
         """
-        try:
-            count = self.count_input.value()
-            generation_type = self.generation_type.currentText()
+        if self.runner.is_running():
+            return
+        count = self.count_input.value()
+        generation_type = self.generation_type.currentText()
+
+        if generation_type == 'Случайные слова':
+            chunks = self.generator.iter_words_batches(5, count, GUI_CHUNK_SIZE)
+            kind, total, length = 'words', 5, count
+            self.current_header = f"Сгенерированы случайные слова (длина {count}):"
+
+        elif generation_type == 'Словосочетания':
+            chunks = self.generator.iter_random_phrases(count, GUI_CHUNK_SIZE)
+            kind, total, length = 'phrases', count, 0
+            self.current_header = f"Сгенерированы словосочетания ({count} шт.):"
+
+        elif generation_type == 'Случайные имена':
+            chunks = self.generator.iter_random_names(count, GUI_CHUNK_SIZE)
+            kind, total, length = 'names', count, 0
+            self.current_header = f"Сгенерированы случайные имена ({count} шт.):"
+
+        elif generation_type == 'По шаблону':
+            source = self.pattern_input.text()
+            try:
+                # Компиляция сразу: ошибка в шаблоне видна до запуска потока
+                chunks = self.generator.iter_pattern(source, count, GUI_CHUNK_SIZE)
+            except ValueError as e:
+                self.on_generation_failed(str(e))
+                return
+            kind, total, length = 'pattern', count, 0
+            self.current_header = f"Сгенерированы строки по шаблону {source} ({count} шт.):"
+
+        self.result.clear(self.current_header)
+        if kind == 'pattern' and total <= PREFETCH_LIMIT:
+            # Пул не хранит строки по шаблону, но план уже скомпилирован
+            self.result.append_items(self.generator.generate_pattern(source, total))
+            self.progress.setValue(100)
+            self.on_generation_finished(False)
+            return
+        if total <= PREFETCH_LIMIT and self.pool.accepts(kind, length):
+            # Небольшой запрос - выборка из буфера пула прямо в потоке окна;
+            # длинные слова пул не буферизует, они идут в фоновый поток
+            self.result.append_items(self.pool.draw(kind, total, length))
+            self.progress.setValue(100)
+            self.on_generation_finished(False)
+            return
+        self.progress.setValue(0)
+        self.set_generating(True)
+        self.runner.start(chunks, total)
 
-            if generation_type == 'Случайные слова':
-                words = [RandomWordGenerator.generate_random_word(count) for _ in range(5)]
-                result_text = f"Сгенерированы случайные слова (длина {count}):\n{words}"
+    def on_type_changed(self, generation_type):
+        """
+        Поле шаблона доступно только для генерации по шаблону.
+        """
+        self.pattern_input.setEnabled(generation_type == 'По шаблону')
 
-            elif generation_type == 'Словосочетания':
-                phrases = RandomWordGenerator.generate_random_phrase(count)
-                result_text = f"Сгенерированы словосочетания ({count} шт.):\n{phrases}"
+    def set_generating(self, running):
+        """
+        Переключение кнопок на время фоновой генерации.
+        """
+        self.generate_button.setEnabled(not running)
+        self.cancel_button.setEnabled(running)
 
-            elif generation_type == 'Случайные имена':
-                names = RandomWordGenerator.generate_random_names(count)
-                result_text = f"Сгенерированы случайные имена ({count} шт.):\n{names}"
+    def on_chunk_ready(self, chunk):
+        """
+        Добавление очередной порции результата.
+        """
+        self.result.append_items(chunk)
+
+    def on_progress(self, value):
+        """
+        Обновление индикатора выполнения.
+        """
+        self.progress.setValue(value)
 
-            self.result.setText(result_text)
-            self.history.append(result_text)
-        except Exception as e:
-            self.result.setText(f"Ошибка: {str(e)}")
+    def on_generation_failed(self, message):
+        """
+        Показ ошибки генерации.
+        """
+        self.current_header = None
+        self.result.clear(f"Ошибка: {message}")
+
+    def on_generation_finished(self, cancelled):
+        """
+        Завершение фоновой генерации: запись в историю или отметка об отмене.
+        """
+        self.set_generating(False)
+        if cancelled:
+            self.result.set_header(f"{self.current_header} Генерация отменена")
+        elif self.current_header is not None:
+            self.history.add(self.current_header, self.result.items())
+
+    def copy_result(self):
+        """
+        Копирование всего результата в буфер обмена.
+        """
+        self.result.copy_to_clipboard()
+
+    def closeEvent(self, event):
+        """
+        Остановка фоновой генерации и закрытие истории при закрытии окна.
+        """
+        self.runner.shutdown()
+        self.pool.close()
+        self.history.close()
+        super().closeEvent(event)
 
     # Остальные методы (apply_theme, toggle_theme, show_help, export_history) 
     # остаются такими же, как в оригинальном коде
@@ -148,12 +246,16 @@ class RandomGenerator(QWidget):
             self.theme_button.setStyleSheet("background-color: #4C4C4C; color: white;")
             self.help_button.setStyleSheet("background-color: #4C4C4C; color: white;")
             self.export_button.setStyleSheet("background-color: #4C4C4C; color: white;")
+            self.cancel_button.setStyleSheet("background-color: #4C4C4C; color: white;")
+            self.copy_button.setStyleSheet("background-color: #4C4C4C; color: white;")
             self.result.setStyleSheet("background-color: #1E1E1E; color: white;")
         else:
             self.setStyleSheet("background-color: #FFFFFF; color: black;")
             self.theme_button.setStyleSheet("background-color: #CCCCCC; color: black;")
             self.help_button.setStyleSheet("background-color: #CCCCCC; color: black;")
             self.export_button.setStyleSheet("background-color: #CCCCCC; color: black;")
+            self.cancel_button.setStyleSheet("background-color: #CCCCCC; color: black;")
+            self.copy_button.setStyleSheet("background-color: #CCCCCC; color: black;")
             self.result.setStyleSheet("background-color: #F0F0F0; color: black;")
 
     def toggle_theme(self):
@@ -171,23 +273,80 @@ class RandomGenerator(QWidget):
             "Генератор случайных слов:\n"
             "1. Выберите тип генерации.\n"
             "2. Укажите длину слова или количество слов.\n"
+            "   Для генерации по шаблону: C/c - согласная, V/v - гласная,\n"
+            "   # - цифра, [abc] - символ из набора, {adj} {noun} {verb}\n"
+            "   {first} {last} - слова словарей, {word} - случайное слово.\n"
             "3. Нажмите 'Сгенерировать' для получения результата.")
 
     def export_history(self):
         """
-        Экспортировать историю генерации в текстовый файл.
+        Экспортировать новые записи истории генерации в файл; формат
+        (текст, JSON Lines, CSV, колоночный) выбирается по расширению.
         """
-        with open("history.txt", "w") as file:
-            for entry in self.history:
-                file.write(entry + "\n")
-        QMessageBox.information(self, "Экспорт", "История генерации экспортирована в history.txt")
+        from rwg.history import DEFAULT_EXPORT_PATH
+
+        path, _ = QFileDialog.getSaveFileName(self, "Экспорт истории",
+                                              DEFAULT_EXPORT_PATH, EXPORT_FILTERS)
+        if not path:
+            return
+        try:
+            exported = self.history.export(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Экспорт", f"Ошибка экспорта: {e}")
+            return
+        QMessageBox.information(self, "Экспорт",
+            f"Новых записей экспортировано в {path}: {exported}")
+
+def load_resources(resources):
+    """
+    Этапы загрузки для заставки: (название, функция), выполняются в фоне.
+
+    Готовые генератор и пул складываются в resources и передаются окну.
+    История (SQLite) открывается уже при создании окна.
+    """
+    def import_modules():
+        import rwg.history  # noqa: F401
+        import rwg.prefetch  # noqa: F401
+
+    def open_rng():
+        resources['generator'] = RandomWordGenerator('secure')
+        resources['generator'].generate_words_bulk(1, DEFAULT_LENGTH)
+
+    def warm_tables():
+        # Первые вызовы заполняют кэши алфавита и таблиц индексов словарей
+        # для поэлементного и пакетного путей
+        generator = resources['generator']
+        for count in (1, PREFETCH_LIMIT):
+            generator.generate_words_bulk(count, DEFAULT_LENGTH)
+            generator.generate_random_phrase(count)
+            generator.generate_random_names(count)
+
+    def fill_pool():
+        from rwg.prefetch import PrefetchPool
+
+        pool = resources['pool'] = PrefetchPool(RandomWordGenerator('secure'))
+        pool.warm('words', DEFAULT_LENGTH)
+        pool.warm('phrases')
+        pool.warm('names')
+
+    return [
+        ("Загрузка модулей", import_modules),
+        ("Источник случайности", open_rng),
+        ("Словари и алфавиты", warm_tables),
+        ("Буферы генерации", fill_pool),
+    ]
 
 class SplashScreen(QWidget):
     """
     Класс для отображения заставки при запуске приложения.
+
+    Пока заставка видна, этапы load_resources выполняются в фоновом
+    потоке, а индикатор показывает долю пройденных этапов. Окно генератора
+    открывается сразу после последнего этапа.
     """
-    def __init__(self):
+    def __init__(self, measure_startup=False):
         super().__init__()
+        self.measure_startup = measure_startup
         self.setWindowTitle("Загрузка")
         self.setGeometry(100, 100, 600, 600)
         self.setStyleSheet("background-color: #2E2E2E;")
@@ -214,6 +373,12 @@ class SplashScreen(QWidget):
         self.progress.setValue(0)
         layout.addWidget(self.progress)
 
+        # Текущий этап загрузки
+        self.status = QLabel("Загрузка...")
+        self.status.setAlignment(Qt.AlignCenter)
+        self.status.setStyleSheet("color: white; font-size: 14px;")
+        layout.addWidget(self.status)
+
         # Кнопка с текстом
         self.footer_button = QPushButton('Создано Габеркорн Вадимом')
         self.footer_button.setStyleSheet("""
@@ -247,11 +412,6 @@ class SplashScreen(QWidget):
         self.logo_animation.setStartValue(0)
         self.logo_animation.setEndValue(1)
 
-        # Таймер для обновления индикатора загрузки
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_progress)
-        self.timer.start(100)
-
         self.show()
         self.logo_animation.start()
 
@@ -262,6 +422,17 @@ class SplashScreen(QWidget):
         self.title_timer.timeout.connect(self.update_title)
         self.title_timer.start(200)
 
+        # Загрузка в фоне; окно откроется по ее завершении
+        self.resources = {}
+        self.timings = []
+        stages = load_resources(self.resources)
+        self.loader = GenerationRunner(self)
+        self.loader.chunk_ready.connect(self.on_stage_done)
+        self.loader.progress.connect(self.progress.setValue)
+        self.loader.failed.connect(self.on_load_failed)
+        self.loader.finished.connect(self.open_generator)
+        self.loader.start(iter_startup_stages(stages, self.timings), len(stages))
+
     def update_title(self):
         """
         Обновление заголовка заставки.
@@ -279,25 +450,42 @@ class SplashScreen(QWidget):
             self.title_animation.setEndValue(1)
             self.title_animation.start()
 
-    def update_progress(self):
+    def on_stage_done(self, titles):
         """
-        Обновление индикатора загрузки.
+        Показ пройденного этапа загрузки.
         """
-        value = self.progress.value() + 4
-        if value > 100:
-            self.timer.stop()
-            self.close()
-            self.open_generator()
-        self.progress.setValue(value)
+        self.status.setText(f"{titles[-1]}: готово")
+
+    def on_load_failed(self, message):
+        """
+        Ошибка этапа загрузки: недостающее окно создаст само.
+        """
+        self.status.setText(f"Ошибка загрузки: {message}")
 
     def open_generator(self):
         """
         Открытие основного окна генератора случайных слов.
         """
-        self.generator = RandomGenerator()
+        self.status.setText("Открытие окна")
+        start = time.perf_counter()
+        self.generator = RandomGenerator(self.resources.get('generator'),
+                                         self.resources.get('pool'))
         self.generator.show()
+        self.timings.append(("Окно", time.perf_counter() - start))
+        self.close()
+        if self.measure_startup:
+            report_startup(STARTED, self.timings)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
-    splash = SplashScreen()
+    if DIAGNOSTICS_FLAG in sys.argv:
+        diagnostics = DiagnosticsPanel(enable_diagnostics(RandomGenerator))
+        diagnostics.show()
+    if NO_SPLASH_FLAG in sys.argv:
+        generator = RandomGenerator()
+        generator.show()
+        if MEASURE_STARTUP_FLAG in sys.argv:
+            report_startup(STARTED)
+    else:
+        splash = SplashScreen(MEASURE_STARTUP_FLAG in sys.argv)
     sys.exit(app.exec_())
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Скорость пакетной генерации слов в разных алфавитах.
+
+Латиница идет через bytes.translate и decode('ascii'), кириллица и другие
+алфавиты до 256 символов - через codecs.charmap_decode, графемы - через
+кортеж строк в таблице декодирования. Проверка проваливается, если для
+слов до 12 символов кириллица медленнее латиницы больше чем на 10%.
+
+Цель пока не достигнута: кириллица медленнее примерно в 1.3-1.4 раза.
+Таблица алфавита уже однобайтовая и декодируется один раз на пакет;
+основное отставание дает str.split, который создает строки по 2 байта на
+символ (для миллиона слов из 5 букв 109 мс против 78 мс у ASCII).
+
+Запуск: python benchmarks/bench_alphabet.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rwg import RandomWordGenerator
+from rwg.alphabet import compile_alphabet
+
+COUNT = 1_000_000
+MAX_SLOWDOWN = 1.10
+GATED_LENGTH = 12
+ALPHABETS = (
+    ("latin", "latin"),
+    ("cyrillic", "cyrillic"),
+    ("cyrillic_mixed", "cyrillic_mixed"),
+    ("alphanumeric", "alphanumeric"),
+    ("graphemes", ("ch", "sh", "zh", "a", "o", "u", "e", "i")),
+    ("cjk (1000)", "".join(chr(0x4E00 + i) for i in range(1000))),
+)
+
+
+def best_time(function, repeat=5):
+    """
+    Лучшее время из repeat запусков.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure(alphabet, length):
+    """
+    Лучшее время генерации COUNT слов длины length.
+    """
+    engine = RandomWordGenerator(seed=1, alphabet=alphabet)
+    return best_time(lambda: engine.generate_words_bulk(COUNT, length))
+
+
+def check_cache():
+    """
+    Повторная компиляция того же определения берет алфавит из кэша.
+    """
+    assert compile_alphabet("cyrillic") is compile_alphabet("cyrillic")
+    assert compile_alphabet(["ch", "a"]) is compile_alphabet(("ch", "a"))
+
+
+if __name__ == "__main__":
+    check_cache()
+    random.seed(42)
+    assert RandomWordGenerator.generate_words_bulk(3, 5) == ['brvhx', 'xycba', 'zgmgh']
+
+    worst = 0.0
+    print(f"{'alphabet':>16} {'length':>6} {'words/s':>12} {'vs latin':>9}")
+    for length in (5, 12, 20):
+        latin = measure("latin", length)
+        for name, alphabet in ALPHABETS:
+            seconds = latin if name == "latin" else measure(alphabet, length)
+            print(f"{name:>16} {length:>6} {COUNT / seconds:>12,.0f} {seconds / latin:>8.2f}x")
+            if name == "cyrillic" and length <= GATED_LENGTH:
+                worst = max(worst, seconds / latin)
+    print(f"кириллица против латиницы до {GATED_LENGTH} символов: до {worst:.2f}x "
+          f"(допустимо {MAX_SLOWDOWN:.2f}x)")
+    assert worst <= MAX_SLOWDOWN, worst
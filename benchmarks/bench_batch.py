@@ -0,0 +1,90 @@
+"""
+Память результата: список строк Python против rwg.batch.WordBatch.
+
+Для каждого набора замеряются (tracemalloc) память, которая остается
+занятой результатом, и пик во время генерации, в байтах на элемент, а
+также время генерации (отдельным запуском без tracemalloc) и записи в
+файл. Наборы: COUNT слов длины 5 (generate_words_bulk против
+generate_words_batch) и COUNT / 10 имен (generate_random_names против
+WordBatch.from_chunks). Цель для слов - не меньше TARGET_RATIO раз
+меньше памяти, чем у списка; иначе код возврата 1.
+
+Запуск: python benchmarks/bench_batch.py [--count 10000000]
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rwg import RandomWordGenerator
+from rwg.batch import WordBatch
+from rwg.stream import write_to_path
+
+COUNT = 10_000_000
+LENGTH = 5
+TARGET_RATIO = 5
+
+
+def measure(make):
+    """
+    Результат make(), память под него и пик (байты), время генерации (с).
+    """
+    gc.collect()
+    start = time.perf_counter()
+    result = make()
+    seconds = time.perf_counter() - start
+    del result
+    gc.collect()
+    # Трассировка замедляет выделение памяти, поэтому время - без нее
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = make()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained - before, peak - before, seconds
+
+
+def write_seconds(result, path):
+    start = time.perf_counter()
+    write_to_path([result], path)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="память списка строк и WordBatch")
+    parser.add_argument("--count", type=int, default=COUNT, help="количество слов")
+    options = parser.parse_args()
+    count = options.count
+    names = max(count // 10, 1)
+    cases = (
+        (f"слова x{count}", count, "список",
+         lambda: RandomWordGenerator(seed=1).generate_words_bulk(count, LENGTH)),
+        (f"слова x{count}", count, "WordBatch",
+         lambda: RandomWordGenerator(seed=1).generate_words_batch(count, LENGTH)),
+        (f"имена x{names}", names, "список",
+         lambda: RandomWordGenerator(seed=1).generate_random_names(names)),
+        (f"имена x{names}", names, "WordBatch",
+         lambda: WordBatch.from_chunks(RandomWordGenerator(seed=1).iter_random_names(names))),
+    )
+    retained_by_case = {}
+    print(f"{'набор':>16} {'тип':>10} {'байт/эл.':>9} {'пик, байт/эл.':>14} "
+          f"{'генерация, с':>13} {'запись, с':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for title, size, kind, make in cases:
+            result, retained, peak, seconds = measure(make)
+            written = write_seconds(result, os.path.join(directory, "out.txt"))
+            del result
+            retained_by_case[title, kind] = retained
+            print(f"{title:>16} {kind:>10} {retained / size:>9.1f} {peak / size:>14.1f} "
+                  f"{seconds:>13.2f} {written:>10.2f}", flush=True)
+
+    words = f"слова x{count}"
+    ratio = retained_by_case[words, "список"] / max(retained_by_case[words, "WordBatch"], 1)
+    print(f"слова: WordBatch меньше списка в {ratio:.1f} раза "
+          f"(цель {TARGET_RATIO}x) - {'OK' if ratio >= TARGET_RATIO else 'НЕ ДОСТИГНУТА'}")
+    sys.exit(0 if ratio >= TARGET_RATIO else 1)
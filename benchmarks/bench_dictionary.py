@@ -0,0 +1,77 @@
+"""
+Время подключения и память внешнего словаря на 10^6 слов.
+
+Сравниваются: первое открытие (строится индекс), повторное открытие
+(готовый индекс) и загрузка того же файла в список строк Python.
+
+Запуск: python benchmarks/bench_dictionary.py [words]
+"""
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rwg.core import draw_indices
+from rwg.dictionary import MappedWordList
+
+LETTERS = "абвгдеёжзийклмнопрстуфхцчшщъыьэюя"
+
+
+def rss_mb():
+    """
+    Текущий размер резидентной памяти процесса, МБ (Linux).
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * resource.getpagesize() / 1e6
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def make_dictionary(path, count):
+    """
+    Создание файла словаря из count случайных слов.
+    """
+    rng = random.Random(1)
+    with open(path, "w", encoding="utf-8") as file:
+        for _ in range(count):
+            file.write("".join(rng.choices(LETTERS, k=rng.randint(3, 12))) + "\n")
+
+
+def timed(function):
+    """
+    Результат вызова и время в секундах.
+    """
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "words.txt")
+        make_dictionary(path, count)
+        print(f"словарь: {count} слов, {os.path.getsize(path) / 1e6:.1f} МБ")
+
+        words, cold = timed(lambda: MappedWordList(path))
+        words.close()
+        before = rss_mb()
+        words, warm = timed(lambda: MappedWordList(path))
+        open_rss = rss_mb() - before
+        indices = draw_indices(random, 100_000, len(words))
+        _, pick_time = timed(lambda: [words[i] for i in indices])
+        print(f"mmap: построение индекса {cold * 1000:.0f} мс, открытие {warm * 1000:.2f} мс "
+              f"(RSS +{open_rss:.1f} МБ), выбор {pick_time / len(indices) * 1e9:.0f} нс/слово")
+        words.close()
+
+        before = rss_mb()
+        def load_list():
+            with open(path, encoding="utf-8") as file:
+                return file.read().split()
+        loaded, load_time = timed(load_list)
+        print(f"список: загрузка {load_time * 1000:.0f} мс, RSS +{rss_mb() - before:.1f} МБ")
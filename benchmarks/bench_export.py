@@ -0,0 +1,95 @@
+"""
+Скорость экспорта наборов данных (rwg.export) и чтения колоночного файла.
+
+Данные генерируются заранее, замеряется только запись: МБ/с на выходе
+(размер файла после сжатия) и на входе сжатия, лучший из REPEAT
+замеров. Наборы: 10^6 слов длины 8 (ASCII, одна длина) и 10^6 имен
+(кириллица, разная длина). Цель для форматов без сжатия - не меньше
+TARGET_MB_S на выходе на одном ядре; сжатие выводится для сравнения.
+
+Затем колоночный файл слов открывается через mmap: время открытия,
+полный перебор и случайный доступ по номеру.
+
+Запуск: python benchmarks/bench_export.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rwg import RandomWordGenerator
+from rwg.export import ColumnarFile, export_chunks
+
+COUNT = 1_000_000
+CHUNK = 65536
+REPEAT = 3
+TARGET_MB_S = 100
+TARGETS = (
+    ("text", None, ".txt"),
+    ("jsonl", None, ".jsonl"),
+    ("csv", None, ".csv"),
+    ("columnar", None, ".rwgc"),
+    ("jsonl", "gzip", ".jsonl.gz"),
+    ("columnar", "gzip", ".rwgc.gz"),
+)
+LOOKUPS = 100_000
+
+
+def best_write(chunks, path, format, compression):
+    """
+    Лучшее время записи и размер файла.
+    """
+    seconds = []
+    for _ in range(REPEAT):
+        stats = export_chunks(chunks, path, format, compression)
+        seconds.append(stats.seconds)
+    return min(seconds), stats.bytes, os.path.getsize(path)
+
+
+if __name__ == "__main__":
+    engine = RandomWordGenerator(seed=1)
+    datasets = {
+        "слова": list(engine.iter_random_words(COUNT, 8, CHUNK)),
+        "имена": list(engine.iter_random_names(COUNT, CHUNK)),
+    }
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'набор':>6} {'формат':>14} {'МБ/с выход':>11} {'МБ/с вход':>10} {'размер, МБ':>11}")
+        for title, chunks in datasets.items():
+            for format, compression, suffix in TARGETS:
+                path = os.path.join(directory, "data" + suffix)
+                seconds, raw, size = best_write(chunks, path, format, compression)
+                output_rate = size / seconds / 1e6
+                slow = compression is None and output_rate < TARGET_MB_S
+                failed = failed or slow
+                print(f"{title:>6} {format + ('+' + compression if compression else ''):>14} "
+                      f"{output_rate:>11.0f} {raw / seconds / 1e6:>10.0f} {size / 1e6:>11.1f}"
+                      f"{'  МЕДЛЕННО' if slow else ''}", flush=True)
+
+        path = os.path.join(directory, "words.rwgc")
+        export_chunks(datasets["слова"], path)
+        start = time.perf_counter()
+        table = ColumnarFile(path)
+        opened = time.perf_counter() - start
+        column = table["value"]
+        start = time.perf_counter()
+        total = sum(1 for _ in column)
+        scan = time.perf_counter() - start
+        positions = [random.randrange(len(column)) for _ in range(LOOKUPS)]
+        start = time.perf_counter()
+        for position in positions:
+            column.raw(position)
+        raw_ns = (time.perf_counter() - start) / LOOKUPS * 1e9
+        start = time.perf_counter()
+        for position in positions:
+            column[position]
+        item_ns = (time.perf_counter() - start) / LOOKUPS * 1e9
+        del column
+        table.close()
+        print(f"колоночный файл: открытие {opened * 1000:.2f} мс, перебор {total / scan:,.0f} строк/с, "
+              f"raw(i) {raw_ns:.0f} нс, [i] {item_ns:.0f} нс")
+    print(f"цель без сжатия: {TARGET_MB_S} МБ/с - {'НЕ ДОСТИГНУТА' if failed else 'OK'}")
+    sys.exit(1 if failed else 0)
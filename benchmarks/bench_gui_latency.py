@@ -0,0 +1,74 @@
+"""
+Задержка цикла событий окна во время фоновой генерации.
+
+Окно Mini-версии запускается без дисплея (QT_QPA_PLATFORM=offscreen),
+генерирует 10^6 имен, а таймер с интервалом 1 мс измеряет промежутки
+между своими срабатываниями. Цель: p99 не больше 16 мс.
+
+Запуск: python benchmarks/bench_gui_latency.py [count]
+"""
+import importlib.util
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+
+TARGET_MS = 16
+
+
+def load_window_class():
+    """
+    Загрузка класса окна из скрипта Mini-версии.
+    """
+    path = os.path.join(ROOT, "Random_Word_Generator-2-Mini.py")
+    spec = importlib.util.spec_from_file_location("rwg_mini", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.RandomGenerator
+
+
+def percentile(values, share):
+    """
+    Перцентиль отсортированного списка.
+    """
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    app = QApplication(sys.argv)
+    window = load_window_class()()
+    window.show()
+    window.generation_type.setCurrentText('Случайные имена')
+    window.count_input.setValue(count)
+
+    gaps = []
+    last = [time.perf_counter()]
+
+    def tick():
+        now = time.perf_counter()
+        gaps.append((now - last[0]) * 1000)
+        last[0] = now
+
+    timer = QTimer()
+    timer.timeout.connect(tick)
+    timer.start(1)
+    window.runner.finished.connect(lambda cancelled: app.quit())
+
+    start = time.perf_counter()
+    window.generate_words()
+    app.exec_()
+    elapsed = time.perf_counter() - start
+
+    gaps.sort()
+    p99 = percentile(gaps, 0.99)
+    print(f"{count} имен за {elapsed:.2f} с, кадров: {len(gaps)}")
+    print(f"задержка: p50 {percentile(gaps, 0.5):.1f} мс, p99 {p99:.1f} мс, "
+          f"max {gaps[-1]:.1f} мс (цель p99 <= {TARGET_MS} мс)")
+    sys.exit(0 if p99 <= TARGET_MS else 1)
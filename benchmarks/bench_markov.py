@@ -0,0 +1,98 @@
+"""
+Марковская модель слов: обучение на корпусе из 10^6 слов, запись и
+загрузка двоичного файла модели, скорость пакетной генерации.
+
+Корпус без внешних файлов строится так же, как устроен обычный текст:
+словарь из VOCABULARY слов, составленных из слогов (согласная + гласная,
+иногда с замыкающей согласной), и 10^6 словоупотреблений с частотами по
+закону Ципфа. Отдельно замеряется худший случай - 10^6 разных слов.
+Свой корпус можно передать аргументом.
+
+Запуск: python benchmarks/bench_markov.py [corpus.txt]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from itertools import accumulate
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rwg import RandomWordGenerator
+from rwg.markov import MarkovModel
+
+CORPUS_WORDS = 1_000_000
+VOCABULARY = 100_000
+GENERATED = 200_000
+CONSONANTS = "бвгджзклмнпрстфхцчшщ"
+VOWELS = "аеиоуыэюя"
+CODAS = "йлмнрст"
+
+
+def make_words(rng, count):
+    """
+    count слов из 1-4 слогов (возможны повторы).
+    """
+    words = []
+    for _ in range(count):
+        syllables = []
+        for _ in range(rng.randint(1, 4)):
+            syllable = rng.choice(CONSONANTS) + rng.choice(VOWELS)
+            if rng.random() < 0.3:
+                syllable += rng.choice(CODAS)
+            syllables.append(syllable)
+        words.append("".join(syllables))
+    return words
+
+
+def make_corpus(count, vocabulary=VOCABULARY):
+    """
+    count словоупотреблений из словаря с частотами 1 / ранг.
+    """
+    rng = random.Random(1)
+    words = make_words(rng, vocabulary)
+    cumulative = list(accumulate(1 / rank for rank in range(1, vocabulary + 1)))
+    return rng.choices(words, cum_weights=cumulative, k=count)
+
+
+def timed(function):
+    """
+    Результат и время одного вызова function.
+    """
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        model, seconds = timed(lambda: MarkovModel.from_corpus(sys.argv[1]))
+        print(f"обучение на {sys.argv[1]}: {seconds:.2f} с")
+    else:
+        for name, corpus in (("все слова разные", make_words(random.Random(2), CORPUS_WORDS)),
+                             ("текст по Ципфу", make_corpus(CORPUS_WORDS))):
+            model, seconds = timed(lambda: MarkovModel.train(corpus))
+            print(f"обучение на {CORPUS_WORDS:,} словах ({name}, разных: "
+                  f"{len(set(corpus)):,}): {seconds:.2f} с ({CORPUS_WORDS / seconds:,.0f} слов/с)")
+    print(model)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "model.bin")
+        _, saved = timed(lambda: model.save(path))
+        loaded, seconds = timed(lambda: MarkovModel.load(path))
+        print(f"файл модели: {os.path.getsize(path) / 1e3:.0f} КБ, "
+              f"запись {saved * 1e3:.1f} мс, загрузка {seconds * 1e3:.1f} мс")
+
+    engine = RandomWordGenerator(seed=1)
+    state = engine.getstate()
+    first = engine.generate_markov_words(model, 1000)
+    engine.setstate(state)
+    assert engine.generate_markov_words(loaded, 1000) == first, "загруженная модель выдает другое"
+
+    for min_length, max_length in ((1, None), (6, 10)):
+        words, seconds = timed(lambda: engine.generate_markov_words(
+            model, GENERATED, min_length=min_length, max_length=max_length))
+        assert all(min_length <= len(word) <= (max_length or model.longest) for word in words)
+        print(f"длина {min_length}-{max_length or model.longest}: "
+              f"{GENERATED / seconds:,.0f} слов/с, например: {' '.join(words[:5])}")
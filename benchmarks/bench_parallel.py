@@ -0,0 +1,40 @@
+"""
+Масштабирование параллельной генерации от 1 до N процессов.
+
+Эффективность = T(1) / (N * T(N)). Независимость вывода от количества
+процессов проверяет tests/test_parallel.py.
+
+Запуск: python benchmarks/bench_parallel.py [count]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rwg.parallel import KINDS, iter_parallel
+
+SEED = 42
+
+
+def run(kind, count, workers):
+    """
+    Время генерации.
+    """
+    start = time.perf_counter()
+    for _ in iter_parallel(kind, count, 8, SEED, workers):
+        pass
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    cores = os.cpu_count() or 1
+    levels = sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1)))
+    print(f"{'kind':>8} {'workers':>7} {'time, s':>8} {'efficiency':>10}")
+    for kind in KINDS:
+        base_time = run(kind, count, 1)
+        for workers in levels:
+            elapsed = run(kind, count, workers)
+            efficiency = base_time / (workers * elapsed)
+            print(f"{kind:>8} {workers:>7} {elapsed:>8.2f} {efficiency:>10.0%}")
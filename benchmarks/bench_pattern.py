@@ -0,0 +1,96 @@
+"""
+Генерация по шаблонам (rwg.pattern) против написанных вручную аналогов.
+
+Для каждого шаблона сравниваются:
+- generate_pattern - скомпилированный план, пакетное выполнение;
+- вручную, поэлементно - типичный код: rng.choice на каждый символ и слово;
+- вручную, пакетно - лучшее, что можно собрать из пакетных методов
+  генератора (generate_words_bulk и словари) без шаблонов.
+
+Отдельно - время компиляции шаблона и поиска в кэше.
+
+Запуск: python benchmarks/bench_pattern.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rwg import RandomWordGenerator
+from rwg.core import ADJECTIVES, FIRST_NAMES, LAST_NAMES, NOUNS
+from rwg.pattern import CONSONANTS, VOWELS, _compile, compile_pattern
+
+COUNT = 100_000
+UPPER = CONSONANTS.upper()
+
+
+def cvc_manual(rng, count):
+    choice = rng.choice
+    return [f"{choice(UPPER)}{choice(VOWELS)}{choice(CONSONANTS)}-"
+            f"{choice('0123456789')}{choice('0123456789')}"
+            f"{choice('0123456789')}{choice('0123456789')}" for _ in range(count)]
+
+
+def cvc_bulk(engine, count):
+    first = engine.generate_words_bulk(count, 1, alphabet=UPPER)
+    second = engine.generate_words_bulk(count, 1, alphabet=VOWELS)
+    third = engine.generate_words_bulk(count, 1, alphabet=CONSONANTS)
+    digits = engine.generate_words_bulk(count, 4, alphabet="digits")
+    return [f"{a}{b}{c}-{d}" for a, b, c, d in zip(first, second, third, digits)]
+
+
+def phrase_manual(rng, count):
+    choice = rng.choice
+    return [f"{choice(ADJECTIVES)} {choice(NOUNS)}" for _ in range(count)]
+
+
+def phrase_bulk(engine, count):
+    return engine.generate_pattern("{adj} {noun}", count)
+
+
+def email_manual(rng, count):
+    choice = rng.choice
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return [f"{choice(FIRST_NAMES)} {choice(LAST_NAMES)}@"
+            f"{''.join(choice(letters) for _ in range(5))}.ru" for _ in range(count)]
+
+
+def email_bulk(engine, count):
+    names = engine.generate_random_names(count)
+    words = engine.generate_words_bulk(count, 5)
+    return [f"{name}@{word}.ru" for name, word in zip(names, words)]
+
+
+CASES = (
+    ("Cvc-####", cvc_manual, cvc_bulk),
+    ("{adj} {noun}", phrase_manual, None),
+    ("{first} {last}@{word}.ru", email_manual, email_bulk),
+)
+
+
+def rate(function):
+    seconds = min(timeit.repeat(function, number=1, repeat=5))
+    return COUNT / seconds
+
+
+if __name__ == "__main__":
+    engine = RandomWordGenerator(seed=1)
+    rng = random.Random(1)
+    print(f"{'шаблон':>26} {'шаблон, стр/с':>14} {'поэлементно':>12} {'пакетно':>10}")
+    for source, manual, bulk in CASES:
+        pattern = rate(lambda: engine.generate_pattern(source, COUNT))
+        by_item = rate(lambda: manual(rng, COUNT))
+        batched = rate(lambda: bulk(engine, COUNT)) if bulk else float("nan")
+        print(f"{source:>26} {pattern:>14,.0f} {by_item:>12,.0f} {batched:>10,.0f}")
+
+    sources = [source for source, _, _ in CASES]
+    compile_us = min(timeit.repeat(lambda: [_compile.__wrapped__(s) for s in sources],
+                                   number=100, repeat=5)) / 100 / len(sources) * 1e6
+    cached_us = min(timeit.repeat(lambda: [compile_pattern(s) for s in sources],
+                                  number=10_000, repeat=5)) / 10_000 / len(sources) * 1e6
+    print(f"компиляция: {compile_us:.1f} мкс, из кэша: {cached_us:.2f} мкс")
+    single_us = min(timeit.repeat(lambda: engine.generate_pattern("Cvc-####", 1),
+                                  number=10_000, repeat=5)) / 10_000 * 1e6
+    print(f"одна строка Cvc-####: {single_us:.1f} мкс")
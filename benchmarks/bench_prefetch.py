@@ -0,0 +1,75 @@
+"""
+Задержка одиночной выборки: прямая генерация против пула заранее
+сгенерированных элементов (rwg.prefetch.PrefetchPool).
+
+1. Интерактивный режим: выборки с паузой PAUSE между ними (как нажатия
+   кнопки или запросы к сервису); фоновый поток успевает пополнять
+   буферы, и выборка - это popleft.
+2. Поток выборок без пауз: буфер опустошается быстрее, чем пополняется,
+   доля попаданий падает, а среднее время приближается к прямой генерации.
+
+Запуск: python benchmarks/bench_prefetch.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rwg import RandomWordGenerator
+from rwg.prefetch import PrefetchPool
+
+DRAWS = 2000
+PAUSE = 0.0005
+BURST = 100_000
+LENGTH = 8
+
+
+def latencies(draw, count, pause):
+    """
+    Время каждого из count вызовов draw, мкс.
+    """
+    result = []
+    for _ in range(count):
+        start = time.perf_counter_ns()
+        draw()
+        result.append((time.perf_counter_ns() - start) / 1000)
+        if pause:
+            time.sleep(pause)
+    return sorted(result)
+
+
+def report(title, samples):
+    p50 = samples[len(samples) // 2]
+    p99 = samples[int(len(samples) * 0.99)]
+    print(f"{title:>28} {p50:>9.2f} {p99:>9.2f}")
+
+
+if __name__ == "__main__":
+    engine = RandomWordGenerator(seed=1)
+    print(f"{'':>28} {'p50, мкс':>9} {'p99, мкс':>9}")
+    report("слово: generate_random_word",
+           latencies(lambda: engine.generate_random_word(LENGTH), DRAWS, PAUSE))
+    report("слово: generate_words_bulk(1)",
+           latencies(lambda: engine.generate_words_bulk(1, LENGTH), DRAWS, PAUSE))
+    report("фраза: generate_random_phrase",
+           latencies(lambda: engine.generate_random_phrase(1), DRAWS, PAUSE))
+    report("имя: generate_random_name",
+           latencies(lambda: engine.generate_random_name(), DRAWS, PAUSE))
+
+    with PrefetchPool(RandomWordGenerator(seed=2)) as pool:
+        for kind in ("words", "phrases", "names"):
+            pool.warm(kind, LENGTH)
+        report("слово: пул", latencies(lambda: pool.word(LENGTH), DRAWS, PAUSE))
+        report("фраза: пул", latencies(pool.phrase, DRAWS, PAUSE))
+        report("имя: пул", latencies(pool.name, DRAWS, PAUSE))
+        print(f"интерактивно: {pool.stats}")
+        assert pool.stats.hit_rate > 0.99, pool.stats.hit_rate
+
+    with PrefetchPool(RandomWordGenerator(seed=3)) as pool:
+        pool.warm("words", LENGTH)
+        start = time.perf_counter()
+        for _ in range(BURST):
+            pool.word(LENGTH)
+        seconds = time.perf_counter() - start
+        print(f"без пауз: {BURST / seconds:,.0f} слов/с, {pool.stats}")
@@ -0,0 +1,46 @@
+"""
+Скорость выборки с весами (таблица псевдонимов): AliasTable.sample /
+sample_many против random.choices с weights и с cum_weights.
+
+Соответствие частот весам (критерий хи-квадрат) проверяется тестами:
+tests/test_sampling.py.
+
+Запуск: python benchmarks/bench_sampling.py
+"""
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rwg.sampling import AliasTable
+
+SAMPLES = 1_000_000
+
+
+def ns_per_sample(function, count):
+    """
+    Время одной выборки в наносекундах.
+    """
+    start = time.perf_counter()
+    function(count)
+    return (time.perf_counter() - start) / count * 1e9
+
+
+if __name__ == "__main__":
+    rng = random.Random(3)
+    print(f"{'size':>7} {'choices(w)':>11} {'choices(cum)':>13} {'sample':>8} {'sample_many':>12}  (нс)")
+    for size in (8, 1000, 100_000):
+        weights = [1 / rank for rank in range(1, size + 1)]
+        cumulative = list(itertools.accumulate(weights))
+        population = range(size)
+        table = AliasTable(weights)
+        results = [
+            ns_per_sample(lambda n: random.choices(population, weights, k=n), SAMPLES),
+            ns_per_sample(lambda n: random.choices(population, cum_weights=cumulative, k=n), SAMPLES),
+            ns_per_sample(lambda n: [table.sample(rng) for _ in range(n)], SAMPLES // 10),
+            ns_per_sample(lambda n: table.sample_many(rng, n), SAMPLES),
+        ]
+        print(f"{size:>7} {results[0]:>11.0f} {results[1]:>13.0f} {results[2]:>8.0f} {results[3]:>12.0f}")
@@ -0,0 +1,91 @@
+"""
+Сравнение обычной и криптографически стойкой генерации слов.
+
+1. Равномерность: частоты букв SecureRandom проверяются критерием
+   хи-квадрат, проверка проваливается при p < 0.001.
+2. Скорость: пакетная генерация с random.Random и с SecureRandom,
+   а также наивный вариант secrets.choice на каждый символ.
+
+Запуск: python benchmarks/bench_secure.py
+"""
+import math
+import os
+import random
+import secrets
+import string
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rwg import RandomWordGenerator
+from rwg.secure import SecureRandom
+
+LETTERS = string.ascii_lowercase
+P_THRESHOLD = 0.001
+# Во сколько раз стойкий путь может быть медленнее обычного
+MAX_SLOWDOWN = 3.0
+
+
+def chi_square_p_value(observed):
+    """
+    p-значение критерия хи-квадрат для равномерного распределения
+    (приближение Уилсона-Хилферти).
+    """
+    total = sum(observed)
+    expected = total / len(observed)
+    statistic = sum((count - expected) ** 2 / expected for count in observed)
+    freedom = len(observed) - 1
+    z = ((statistic / freedom) ** (1 / 3) - (1 - 2 / (9 * freedom))) / math.sqrt(2 / (9 * freedom))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def check_uniform(rng, count=200_000, length=10):
+    """
+    Проверка равномерности букв в словах, сгенерированных rng.
+    """
+    letters = Counter("".join(RandomWordGenerator.generate_words_bulk(count, length, rng)))
+    p_value = chi_square_p_value([letters[letter] for letter in LETTERS])
+    print(f"хи-квадрат для букв SecureRandom: p = {p_value:.4f}")
+    assert p_value >= P_THRESHOLD, p_value
+
+
+def measure(function, repeat=3):
+    """
+    Лучшее время из repeat запусков.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def naive_secure_words(count, length):
+    """
+    Наивный стойкий вариант: secrets.choice для каждого символа.
+    """
+    return ["".join(secrets.choice(LETTERS) for _ in range(length)) for _ in range(count)]
+
+
+if __name__ == "__main__":
+    check_uniform(SecureRandom())
+
+    mersenne = random.Random(42)
+    secure = SecureRandom()
+    print(f"{'count':>10} {'length':>6} {'random, s':>10} {'secure, s':>10} "
+          f"{'secrets, s':>11} {'secure/random':>14}")
+    worst = 0.0
+    for count in (1_000, 100_000, 1_000_000):
+        for length in (5, 20):
+            plain = measure(lambda: RandomWordGenerator.generate_words_bulk(count, length, mersenne))
+            strong = measure(lambda: RandomWordGenerator.generate_words_bulk(count, length, secure))
+            naive = (measure(lambda: naive_secure_words(count, length), repeat=1)
+                     if count <= 100_000 else float("nan"))
+            worst = max(worst, strong / plain)
+            print(f"{count:>10} {length:>6} {plain:>10.4f} {strong:>10.4f} "
+                  f"{naive:>11.4f} {strong / plain:>13.2f}x")
+    print(f"худшее замедление стойкого пути: {worst:.2f}x (допустимо {MAX_SLOWDOWN:.0f}x)")
+    assert worst <= MAX_SLOWDOWN, worst
@@ -0,0 +1,117 @@
+"""
+Нагрузочный тест HTTP-сервиса (python -m rwg serve).
+
+Сервис запускается отдельным процессом на свободном порту. Клиенты на
+asyncio держат keep-alive соединения и шлют небольшие запросы /words;
+для каждого уровня параллельности выводятся запросов/с и p50/p99
+задержки на стороне клиента, затем - статистика сервиса из /stats
+(сколько запросов в среднем объединялось в один пакет). Отдельно
+замеряется потоковый ответ на 10^6 слов.
+
+Запуск: python benchmarks/bench_server.py [--batch-window MS]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONCURRENCY = (1, 8, 32, 128)
+REQUESTS = 4000
+PATH = "/words?count=10&length=8"
+STREAM_PATH = "/words?count=1000000&length=8"
+
+
+async def read_response(reader):
+    """
+    Статус и тело ответа (Content-Length или chunked).
+    """
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    headers = {name.lower(): value.strip() for name, _, value in
+               (line.partition(":") for line in lines[1:] if line)}
+    if "content-length" in headers:
+        return status, await reader.readexactly(int(headers["content-length"]))
+    parts = []
+    while True:
+        size = int((await reader.readline()).strip(), 16)
+        if size == 0:
+            await reader.readline()
+            return status, b"".join(parts)
+        parts.append(await reader.readexactly(size))
+        await reader.readline()
+
+
+async def client(host, port, path, requests, latencies):
+    """
+    requests запросов подряд по одному соединению.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1")
+    for _ in range(requests):
+        start = time.perf_counter()
+        writer.write(request)
+        status, _ = await read_response(reader)
+        latencies.append(time.perf_counter() - start)
+        assert status == 200, status
+    writer.close()
+
+
+async def fetch(host, port, path):
+    """
+    Один запрос с закрытием соединения.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n"
+                 .encode("latin-1"))
+    result = await read_response(reader)
+    writer.close()
+    return result
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def load_test(host, port):
+    print(f"{'clients':>7} {'requests/s':>11} {'p50, ms':>8} {'p99, ms':>8}")
+    for concurrency in CONCURRENCY:
+        latencies = []
+        per_client = max(1, REQUESTS // concurrency)
+        start = time.perf_counter()
+        await asyncio.gather(*(client(host, port, PATH, per_client, latencies)
+                               for _ in range(concurrency)))
+        seconds = time.perf_counter() - start
+        print(f"{concurrency:>7} {len(latencies) / seconds:>11,.0f} "
+              f"{percentile(latencies, 0.5) * 1000:>8.2f} {percentile(latencies, 0.99) * 1000:>8.2f}")
+
+    start = time.perf_counter()
+    status, body = await fetch(host, port, STREAM_PATH)
+    seconds = time.perf_counter() - start
+    assert status == 200 and body.count(b"\n") == 1_000_000
+    print(f"поток 10^6 слов: {seconds:.2f} с, {len(body) / seconds / 1e6:.1f} МБ/с")
+    _, stats = await fetch(host, port, "/stats")
+    print(f"сервис: {json.dumps(json.loads(stats), ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-window", default="0")
+    options = parser.parse_args()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "rwg", "serve", "--port", "0", "--seed", "1",
+         "--batch-window", options.batch_window],
+        cwd=ROOT, stderr=subprocess.PIPE, text=True)
+    try:
+        # Первая строка stderr: rwg: http://host:port/
+        address = server.stderr.readline().split("//")[1].rstrip("/\n")
+        host, port = address.rsplit(":", 1)
+        asyncio.run(load_test(host, int(port)))
+    finally:
+        server.terminate()
+        server.wait()
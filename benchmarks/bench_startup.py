@@ -0,0 +1,46 @@
+"""
+Замер времени холодного старта консольного пути (python -m rwg).
+
+Время пустого интерпретатора вычитается, чтобы видеть только стоимость
+импорта и работы самого генератора. Цель: не более 50 мс.
+
+Запуск: python benchmarks/bench_startup.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGET_MS = 50
+RUNS = 20
+
+
+def measure(args):
+    """
+    Медианное время запуска интерпретатора с заданными аргументами, мс.
+    """
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, check=True,
+                       stdout=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    baseline = measure(["-c", "pass"])
+    checks = {
+        "import rwg": ["-c", "import rwg"],
+        "rwg words": ["-m", "rwg", "words", "--count", "10", "--length", "5"],
+    }
+    failed = False
+    print(f"интерпретатор: {baseline:.1f} мс")
+    for title, args in checks.items():
+        overhead = measure(args) - baseline
+        status = "OK" if overhead <= TARGET_MS else "МЕДЛЕННО"
+        failed = failed or overhead > TARGET_MS
+        print(f"{title}: +{overhead:.1f} мс ({status}, цель {TARGET_MS} мс)")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,111 @@
+"""
+Генерация из нескольких потоков: общее состояние random против
+собственных экземпляров RandomWordGenerator.
+
+1. Воспроизводимость: каждый поток с экземпляром, созданным с seed,
+   выдает одно и то же при любом чередовании потоков; с общим модулем
+   random результат потока зависит от соседей.
+2. Пропускная способность: суммарное количество слов в секунду для
+   1-8 потоков с общим генератором и с RandomWordGenerator.for_thread().
+
+Запуск: python benchmarks/bench_threads.py
+"""
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rwg import RandomWordGenerator
+
+BATCH = 1_000
+BATCHES = 200
+LENGTH = 8
+
+
+def run_threads(count, target):
+    """
+    Запуск target(номер) в count потоках; возвращает время и результаты.
+    """
+    results = [None] * count
+
+    def worker(index):
+        results[index] = target(index)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(count)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, results
+
+
+def shared_batches(index):
+    """
+    Пакеты слов через общее глобальное состояние модуля random.
+    """
+    return [RandomWordGenerator.generate_words_bulk(BATCH, LENGTH) for _ in range(BATCHES)]
+
+
+def thread_local_batches(index):
+    """
+    Пакеты слов через экземпляр текущего потока.
+    """
+    engine = RandomWordGenerator.for_thread()
+    return [engine.generate_words_bulk(BATCH, LENGTH) for _ in range(BATCHES)]
+
+
+def seeded_batches(index):
+    """
+    Пакеты слов через собственный экземпляр с seed, равным номеру потока.
+    """
+    engine = RandomWordGenerator(seed=index)
+    batches = []
+    for _ in range(BATCHES):
+        batches.append(engine.generate_words_bulk(BATCH, LENGTH))
+        time.sleep(0)  # отдать GIL соседям, чтобы потоки чередовались
+    return batches
+
+
+def global_seeded_batches(index):
+    """
+    То же через общий модуль random, засеянный один раз перед запуском.
+    """
+    batches = []
+    for _ in range(BATCHES):
+        batches.append(RandomWordGenerator.generate_words_bulk(BATCH, LENGTH))
+        time.sleep(0)
+    return batches
+
+
+def check_reproducible(threads=4):
+    """
+    Сравнение вывода каждого потока с однопоточным эталоном.
+    """
+    _, expected = run_threads(threads, lambda index: seeded_batches(index))
+    _, again = run_threads(threads, lambda index: seeded_batches(index))
+    assert expected == again, "экземпляры с seed дали разный вывод"
+    reference = [seeded_batches(index) for index in range(threads)]
+    assert expected == reference, "вывод потока зависит от соседей"
+
+    random.seed(0)
+    _, first = run_threads(threads, global_seeded_batches)
+    random.seed(0)
+    _, second = run_threads(threads, global_seeded_batches)
+    same = sum(a == b for a, b in zip(first, second))
+    print(f"экземпляры с seed: вывод {threads} потоков совпал с эталоном")
+    print(f"общий random с seed: совпало потоков {same} из {threads}")
+
+
+if __name__ == "__main__":
+    check_reproducible()
+    words = BATCH * BATCHES
+    print(f"{'threads':>7} {'shared, words/s':>16} {'for_thread, words/s':>20}")
+    for threads in (1, 2, 4, 8):
+        shared, _ = run_threads(threads, shared_batches)
+        local, _ = run_threads(threads, thread_local_batches)
+        print(f"{threads:>7} {threads * words / shared:>16,.0f} {threads * words / local:>20,.0f}")
+    print(f"процессоров: {os.cpu_count()}")
@@ -0,0 +1,117 @@
+"""
+Время до готовности окна (time-to-interactive) GUI-скриптов и собранных
+PyInstaller-версий (spec/*.spec).
+
+Каждая цель запускается с --measure-startup: окно печатает "ready N ms",
+как только показано и цикл событий готов обрабатывать ввод, и
+завершается. Время считается снаружи, от запуска процесса до этой
+строки, поэтому в него входят запуск интерпретатора (или распаковка
+собранной версии) и импорт PyQt5. Собранные версии замеряются, если они
+есть в dist/ (pyinstaller spec/Random_Word_Generator-2.spec).
+
+Результаты можно сохранить в JSON и сравнить с прошлым замером
+(--compare): рост медианы больше --threshold отмечается как регрессия,
+код возврата 1.
+
+Запуск:
+    python benchmarks/bench_tti.py -o tti.json
+    python benchmarks/bench_tti.py --compare tti.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 5
+TIMEOUT = 60
+THRESHOLD = 0.10
+EXE_SUFFIX = ".exe" if sys.platform == "win32" else ""
+
+
+def targets():
+    """
+    Цели замера: имя -> командная строка.
+    """
+    commands = {
+        "script-2[splash]": [sys.executable, "Random_Word_Generator-2.py"],
+        "script-2[no-splash]": [sys.executable, "Random_Word_Generator-2.py", "--no-splash"],
+        "script-2-Mini": [sys.executable, "Random_Word_Generator-2-Mini.py"],
+    }
+    for name in ("Random_Word_Generator-2", "Random_Word_Generator-2-Mini"):
+        path = os.path.join(ROOT, "dist", name + EXE_SUFFIX)
+        if os.path.exists(path):
+            commands[f"exe:{name}"] = [path]
+            if name == "Random_Word_Generator-2":
+                commands[f"exe:{name}[no-splash]"] = [path, "--no-splash"]
+    return commands
+
+
+def measure_once(command):
+    """
+    Время от запуска процесса до строки готовности и время, которое
+    насчитало само окно, мс.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen([*command, "--measure-startup"], cwd=ROOT,
+                               stdout=subprocess.PIPE, text=True)
+    try:
+        for line in process.stdout:
+            if line.startswith("ready "):
+                wall = (time.perf_counter() - start) * 1000
+                return wall, float(line.split()[1])
+        raise RuntimeError(f"{command[-1]}: окно завершилось без строки готовности")
+    finally:
+        process.wait(TIMEOUT)
+
+
+def measure(command):
+    walls, internals = zip(*(measure_once(command) for _ in range(RUNS)))
+    return {
+        "median_ms": round(statistics.median(walls), 1),
+        "min_ms": round(min(walls), 1),
+        "internal_median_ms": round(statistics.median(internals), 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="время до готовности окна")
+    parser.add_argument("--output", "-o", help="файл JSON для результатов")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON прошлого замера")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="допустимое ухудшение (доля), по умолчанию 0.10")
+    options = parser.parse_args()
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": RUNS,
+        },
+        "results": {},
+    }
+    print(f"{'target':>40} {'median, ms':>11} {'min, ms':>9} {'in window, ms':>14}")
+    for name, command in targets().items():
+        metrics = report["results"][name] = measure(command)
+        print(f"{name:>40} {metrics['median_ms']:>11.1f} {metrics['min_ms']:>9.1f} "
+              f"{metrics['internal_median_ms']:>14.1f}", flush=True)
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+    regressions = []
+    if options.compare:
+        with open(options.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        for name, metrics in report["results"].items():
+            before = baseline["results"].get(name)
+            if before and metrics["median_ms"] > before["median_ms"] * (1 + options.threshold):
+                regressions.append(name)
+                print(f"регрессия: {name}: {before['median_ms']} -> {metrics['median_ms']} мс")
+    sys.exit(1 if regressions else 0)
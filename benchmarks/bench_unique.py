@@ -0,0 +1,62 @@
+"""
+Скорость и память режима unique=True для 10^7 слов.
+
+Память (пик, включая одну порцию слов) считается в байтах на выданное
+слово; для сравнения приводится оценка обычного set из тех же слов.
+
+Запуск: python benchmarks/bench_unique.py [count]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rwg import RandomWordGenerator
+
+
+def run(count, length, trace=False):
+    """
+    Генерация count разных слов без накопления результата.
+
+    При trace=True возвращается пиковая память (tracemalloc сильно
+    замедляет работу, поэтому время и память меряются разными прогонами).
+    """
+    rng = random.Random(1)
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    produced = 0
+    for chunk in RandomWordGenerator.iter_unique_words(count, length, rng=rng):
+        produced += len(chunk)
+    elapsed = time.perf_counter() - start
+    assert produced == count
+    if not trace:
+        return elapsed
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def set_bytes_per_item(length, sample=100_000):
+    """
+    Оценка памяти set из слов той же длины, байт на элемент.
+    """
+    words = RandomWordGenerator.generate_words_bulk(sample, length, random.Random(2))
+    tracemalloc.start()
+    seen = set(words)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / len(seen) + sys.getsizeof(words[0])
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    print(f"{'length':>6} {'index':>12} {'words/s':>12} {'bytes/word':>11} {'set(str)':>9}")
+    for length, index in ((5, "bitmap"), (8, "fingerprint"), (16, "hash fp")):
+        elapsed = run(count, length)
+        peak = run(count, length, trace=True)
+        print(f"{length:>6} {index:>12} {count / elapsed:>12,.0f} {peak / count:>11.1f} "
+              f"{set_bytes_per_item(length):>9.1f}")
@@ -0,0 +1,69 @@
+"""
+Стоимость одного словосочетания и имени до и после предкомпиляции словарей.
+
+"Было" - прежняя реализация: списки и лямбды создаются при каждом вызове,
+каждое слово выбирается отдельным random.choice.
+
+Запуск: python benchmarks/bench_vocab.py [max_power]  (по умолчанию 10^6)
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rwg import RandomWordGenerator
+
+
+def legacy_phrases(word_count):
+    """
+    Прежняя генерация словосочетаний.
+    """
+    nouns = ['кот', 'дом', 'стол', 'книга', 'город', 'друг', 'машина', 'солнце']
+    adjectives = ['красный', 'большой', 'маленький', 'яркий', 'старый', 'новый', 'синий', 'зеленый']
+    verbs = ['идет', 'читает', 'смеется', 'думает', 'работает', 'играет', 'танцует', 'поет']
+    phrase_types = [
+        lambda: f"{random.choice(adjectives)} {random.choice(nouns)}",
+        lambda: f"{random.choice(nouns)} {random.choice(verbs)}",
+        lambda: f"{random.choice(adjectives)} {random.choice(nouns)} {random.choice(verbs)}"
+    ]
+    return [random.choice(phrase_types)() for _ in range(word_count)]
+
+
+def legacy_names(count):
+    """
+    Прежняя генерация имен.
+    """
+    first_names = ["Алексей", "Мария", "Дмитрий", "Анна", "Сергей", "Екатерина", "Иван", "Ольга"]
+    last_names = ["Иванов", "Петров", "Сидоров", "Кузнецов", "Смирнов", "Попов", "Зайцев", "Лебедев"]
+    return [f"{random.choice(first_names)} {random.choice(last_names)}" for _ in range(count)]
+
+
+def ns_per_item(function, count):
+    """
+    Время на один элемент в наносекундах (лучшее из нескольких повторов).
+    """
+    repeat = max(1, min(1000, 100_000 // count))
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            function(count)
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best / count * 1e9
+
+
+if __name__ == "__main__":
+    max_power = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    cases = [
+        ("phrases", legacy_phrases, RandomWordGenerator.generate_random_phrase),
+        ("names", legacy_names, RandomWordGenerator.generate_random_names),
+    ]
+    print(f"{'kind':>8} {'batch':>9} {'before, ns':>11} {'after, ns':>10} {'speedup':>8}")
+    for kind, before, after in cases:
+        for power in range(max_power + 1):
+            count = 10 ** power
+            old = ns_per_item(before, count)
+            new = ns_per_item(after, count)
+            print(f"{kind:>8} {count:>9} {old:>11.0f} {new:>10.0f} {old / new:>7.1f}x")
@@ -0,0 +1,45 @@
+"""
+Сравнение посимвольной и пакетной генерации случайных слов.
+
+Запуск: python benchmarks/bench_words.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rwg import RandomWordGenerator
+
+
+def check_reference(generator):
+    """
+    Проверка эталонного вывода пакетной генерации при фиксированном seed.
+    """
+    random.seed(42)
+    result = generator.generate_words_bulk(3, 5)
+    assert result == ['brvhx', 'xycba', 'zgmgh'], result
+
+
+def bench(generator, count, length, repeat=3):
+    """
+    Замер времени обоих способов генерации для одного размера пакета.
+    """
+    per_char = min(timeit.repeat(
+        lambda: [generator.generate_random_word(length) for _ in range(count)],
+        number=1, repeat=repeat))
+    bulk = min(timeit.repeat(
+        lambda: generator.generate_words_bulk(count, length),
+        number=1, repeat=repeat))
+    return per_char, bulk
+
+
+if __name__ == "__main__":
+    generator = RandomWordGenerator
+    check_reference(generator)
+    print(f"{'count':>10} {'length':>6} {'per-char, s':>12} {'bulk, s':>10} {'speedup':>8}")
+    for count in (1_000, 100_000, 1_000_000):
+        for length in (5, 20):
+            per_char, bulk = bench(generator, count, length)
+            print(f"{count:>10} {length:>6} {per_char:>12.4f} {bulk:>10.4f} {per_char / bulk:>7.1f}x")
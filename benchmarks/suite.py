@@ -0,0 +1,309 @@
+"""
+Набор замеров производительности всех генераторов и путей окна.
+
+Для каждого генератора и размера пакета выводятся и сохраняются в JSON:
+
+- items_per_second и ns_per_item - по лучшему из REPEAT замеров
+  (количество вызовов в замере подбирается timeit.autorange);
+- peak_bytes и peak_bytes_per_item - пик памяти Python за один вызов
+  (tracemalloc);
+- allocations_per_item - сколько выделенных блоков памяти
+  (sys.getallocatedblocks) прибавилось на элемент, пока результат жив.
+
+Пути окна (вывод результата в ResultView, генерация в окнах
+Random_Word_Generator-1 и -2-Mini) замеряются без дисплея
+(QT_QPA_PLATFORM=offscreen); если PyQt5 не установлен, они пропускаются
+с отметкой в JSON.
+
+Режим сравнения (--compare baseline.json) отмечает регрессии: ns/item
+или пик памяти вырос больше чем на --threshold (по умолчанию 10%);
+код возврата 1, если регрессии есть. Время из базового замера сначала
+масштабируется на отношение калибровочных замеров (фиксированный цикл на
+чистом Python в обоих отчетах), чтобы разница в скорости машины или ее
+загрузке не выглядела как регрессия.
+
+Запуск:
+    python benchmarks/suite.py -o baseline.json
+    python benchmarks/suite.py --compare baseline.json [-o current.json]
+    python benchmarks/suite.py --quick --no-gui
+"""
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from rwg import RandomWordGenerator
+from rwg.markov import MarkovModel
+
+SIZES = (1, 100, 10_000, 100_000)
+QUICK_SIZES = (1, 100, 10_000)
+# Окно ограничивает количество миллионом, пути окна медленнее
+GUI_SIZES = (1, 1_000, 100_000)
+QUICK_GUI_SIZES = (1, 1_000)
+REPEAT = 5
+THRESHOLD = 0.10
+LENGTH = 8
+
+
+def markov_model():
+    """
+    Небольшая модель на словах из слогов: замеряется генерация, а не обучение.
+    """
+    rng = random.Random(1)
+    words = ["".join(rng.choice("бвгдклмнпрст") + rng.choice("аеиоуя")
+                     for _ in range(rng.randint(1, 4))) for _ in range(20_000)]
+    return MarkovModel.train(words)
+
+
+def generator_cases():
+    """
+    Генераторы ядра: имя -> функция от размера пакета.
+    """
+    engine = RandomWordGenerator(seed=1)
+    model = markov_model()
+    return {
+        "words.generate_random_word": lambda n: [engine.generate_random_word(LENGTH)
+                                                 for _ in range(n)],
+        "words.generate_words_bulk": lambda n: engine.generate_words_bulk(n, LENGTH),
+        "words.generate_words_batch": lambda n: engine.generate_words_batch(n, LENGTH),
+        "words.generate_words_bulk[cyrillic]": lambda n: engine.generate_words_bulk(
+            n, LENGTH, alphabet="cyrillic"),
+        "words.generate_random_words[unique]": lambda n: engine.generate_random_words(
+            n, LENGTH, unique=True),
+        "phrases.generate_random_phrase": lambda n: engine.generate_random_phrase(n),
+        "names.generate_random_names": lambda n: engine.generate_random_names(n),
+        "markov.generate_markov_words": lambda n: engine.generate_markov_words(model, n),
+        "pattern.generate_pattern": lambda n: engine.generate_pattern(
+            "{first} {last}@{word}.ru", n),
+    }
+
+
+def load_script(filename, history_path):
+    """
+    Модуль GUI-скрипта; история окна пишется во временный файл.
+    """
+    from rwg.history import HistoryStore
+
+    spec = importlib.util.spec_from_file_location(filename.replace("-", "_")[:-3],
+                                                  os.path.join(ROOT, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.HistoryStore = lambda path=None: HistoryStore(history_path)
+    return module
+
+
+def gui_cases(directory):
+    """
+    Пути окна без дисплея: имя -> функция от размера пакета.
+
+    Каждый вызов доводит работу до конца: ждет окончания фоновой
+    генерации и отрисовывает окно в изображение (grab).
+    """
+    from PyQt5.QtCore import QEventLoop
+    from PyQt5.QtWidgets import QApplication
+
+    from rwg.gui import ResultView
+
+    app = QApplication.instance() or QApplication([])
+    history_path = os.path.join(directory, "history.sqlite3")
+    view = ResultView()
+    view.resize(800, 600)
+    view.show()
+    words = RandomWordGenerator(seed=1).generate_words_bulk(max(GUI_SIZES), LENGTH)
+
+    def render(n):
+        view.clear(f"{n} слов:")
+        view.append_items(words[:n])
+        app.processEvents()
+        view.grab()
+
+    windows = []
+
+    def window_case(filename, class_name, prepare):
+        window = getattr(load_script(filename, history_path), class_name)()
+        window.show()
+        windows.append(window)
+
+        def run(n):
+            prepare(window, n)
+            loop = QEventLoop()
+            window.runner.finished.connect(loop.quit)
+            window.generate_words()
+            if window.runner.is_running():
+                loop.exec_()
+            window.runner.finished.disconnect(loop.quit)
+            app.processEvents()
+            window.grab()
+        return run
+
+    def prepare_words(window, n):
+        window.count_input.setValue(n)
+        window.length_input.setValue(LENGTH)
+
+    def prepare_names(window, n):
+        window.generation_type.setCurrentText('Случайные имена')
+        window.count_input.setValue(n)
+
+    return {
+        "gui.ResultView.append_items": render,
+        "gui.WordGenerator.generate_words": window_case(
+            "Random_Word_Generator-1.py", "WordGenerator", prepare_words),
+        "gui.RandomGenerator.generate_words[names]": window_case(
+            "Random_Word_Generator-2-Mini.py", "RandomGenerator", prepare_names),
+    }, windows
+
+
+def calibrate():
+    """
+    Время фиксированной работы на чистом Python, нс (лучшее из 20 замеров).
+    """
+    def work():
+        total = 0
+        for i in range(100_000):
+            total += i * i % 7
+        return total
+    return round(min(timeit.repeat(work, number=1, repeat=20)) * 1e9)
+
+
+def measure(function, size):
+    """
+    Метрики одного генератора для пакета из size элементов.
+    """
+    timer = timeit.Timer(lambda: function(size))
+    number, _ = timer.autorange()
+    seconds = min(timer.repeat(REPEAT, number)) / number
+
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    result = function(size)
+    allocations = sys.getallocatedblocks() - blocks
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    function(size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "items_per_second": round(size / seconds, 1),
+        "ns_per_item": round(seconds / size * 1e9, 2),
+        "peak_bytes": peak,
+        "peak_bytes_per_item": round(peak / size, 2),
+        "allocations_per_item": round(allocations / size, 3),
+    }
+
+
+def run_cases(cases, sizes, results):
+    for name, function in cases.items():
+        results[name] = {}
+        for size in sizes:
+            metrics = results[name][str(size)] = measure(function, size)
+            print(f"{name:>44} {size:>8} {metrics['items_per_second']:>14,.0f} "
+                  f"{metrics['ns_per_item']:>12,.1f} {metrics['peak_bytes'] / 1e6:>9.2f} "
+                  f"{metrics['allocations_per_item']:>8.2f}", flush=True)
+
+
+def run_suite(quick=False, gui=True):
+    """
+    Замер всех генераторов; результат - словарь для JSON.
+    """
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "quick": quick,
+            "calibration_ns": calibrate(),
+        },
+        "results": {},
+        "skipped": {},
+    }
+    print(f"{'generator':>44} {'size':>8} {'items/s':>14} {'ns/item':>12} "
+          f"{'peak, MB':>9} {'allocs':>8}")
+    run_cases(generator_cases(), QUICK_SIZES if quick else SIZES, report["results"])
+    # Повторная калибровка в конце: берется лучшая, как и для генераторов
+    report["meta"]["calibration_ns"] = min(report["meta"]["calibration_ns"], calibrate())
+    if not gui:
+        report["skipped"]["gui"] = "отключено (--no-gui)"
+        return report
+    try:
+        import PyQt5  # noqa: F401
+    except ImportError:
+        report["skipped"]["gui"] = "PyQt5 не установлен"
+        print("пути окна пропущены: PyQt5 не установлен")
+        return report
+    with tempfile.TemporaryDirectory() as directory:
+        cases, windows = gui_cases(directory)
+        run_cases(cases, QUICK_GUI_SIZES if quick else GUI_SIZES, report["results"])
+        for window in windows:
+            window.close()
+    return report
+
+
+def compare(current, baseline, threshold=THRESHOLD):
+    """
+    Список регрессий: (генератор, размер, метрика, было, стало).
+
+    Сравниваются только пары генератор/размер, которые есть в обоих
+    замерах; время базового замера масштабируется на отношение калибровок.
+    """
+    speed = 1.0
+    if baseline["meta"].get("calibration_ns") and current["meta"].get("calibration_ns"):
+        speed = current["meta"]["calibration_ns"] / baseline["meta"]["calibration_ns"]
+    print(f"калибровка: {speed:.2f}x от базового замера (время базового замера "
+          f"умножается на это отношение)")
+    regressions = []
+    print(f"{'generator':>44} {'size':>8} {'ns/item':>18} {'peak, MB':>18}")
+    for name, sizes in current["results"].items():
+        for size, metrics in sizes.items():
+            before = baseline["results"].get(name, {}).get(size)
+            if before is None:
+                continue
+            expected = {"ns_per_item": before["ns_per_item"] * speed,
+                        "peak_bytes": before["peak_bytes"]}
+            ratios = {key: metrics[key] / value if value else 1.0
+                      for key, value in expected.items()}
+            marks = [key for key, ratio in ratios.items() if ratio > 1 + threshold]
+            for key in marks:
+                regressions.append((name, size, key, round(expected[key], 2), metrics[key]))
+            flag = " РЕГРЕССИЯ" if marks else ""
+            print(f"{name:>44} {size:>8} {ratios['ns_per_item']:>17.2f}x "
+                  f"{ratios['peak_bytes']:>17.2f}x{flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="замеры производительности генераторов")
+    parser.add_argument("--output", "-o", help="файл JSON для результатов")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON прошлого замера")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="допустимое ухудшение (доля), по умолчанию 0.10")
+    parser.add_argument("--quick", action="store_true", help="без самых больших пакетов")
+    parser.add_argument("--no-gui", action="store_true", help="без путей окна")
+    options = parser.parse_args()
+
+    report = run_suite(options.quick, not options.no_gui)
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    if options.compare:
+        with open(options.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(report, baseline, options.threshold)
+        for name, size, key, before, after in regressions:
+            print(f"регрессия: {name} [{size}] {key}: {before} -> {after}")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,9 @@
+"""
+Генератор случайных слов, словосочетаний и имен без графического интерфейса.
+
+Графические окна находятся в скриптах Random_Word_Generator-*.py и
+импортируют PyQt5 только при запуске.
+"""
+from .core import RandomWordGenerator
+
+__all__ = ['RandomWordGenerator']
@@ -0,0 +1,225 @@
+"""
+Алфавиты для генерации слов: латиница, кириллица, цифры, произвольные
+наборы символов и графемы из нескольких кодовых точек.
+
+Алфавит компилируется один раз (см. compile_alphabet) в таблицы для
+пакетной генерации. Случайные байты переводятся в символы целым буфером:
+для ASCII-алфавитов - через bytes.translate и decode('ascii'), для
+остальных - через codecs.charmap_decode с таблицей на 256 байтов, как при
+декодировании однобайтовой кодировки (графема из нескольких кодовых
+точек - просто более длинная строка в таблице). Байты сверху диапазона,
+которые дали бы смещение, отбрасываются. Между словами вставляется байт,
+который не встречается в данных, и готовая строка делится одним вызовом
+str.split.
+"""
+import codecs
+import string
+from functools import lru_cache
+from itertools import product
+
+from .unique import Bitmap, FingerprintSet
+
+CYRILLIC_LOWER = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+CYRILLIC_UPPER = CYRILLIC_LOWER.upper()
+
+# Встроенные алфавиты по именам
+ALPHABETS = {
+    'latin': string.ascii_lowercase,
+    'latin_upper': string.ascii_uppercase,
+    'latin_mixed': string.ascii_letters,
+    'cyrillic': CYRILLIC_LOWER,
+    'cyrillic_upper': CYRILLIC_UPPER,
+    'cyrillic_mixed': CYRILLIC_LOWER + CYRILLIC_UPPER,
+    'digits': string.digits,
+    'alphanumeric': string.ascii_lowercase + string.digits,
+    'hex': string.digits + 'abcdef',
+}
+DEFAULT_ALPHABET = 'latin'
+
+# Символы-кандидаты в разделители слов при декодировании
+_SEPARATORS = '\n\x00 \t'
+# Для более длинных слов вставка разделителя (по проходу на каждую
+# позицию в слове) дороже, чем нарезка срезами
+_SPLIT_MAX_LENGTH = 24
+# Цифры для перевода слова в его номер через int(..., base)
+_DIGITS = string.digits + string.ascii_lowercase
+# Битовая карта выбирается, если на элемент запроса приходится не больше
+# стольких битов пространства (иначе таблица отпечатков компактнее).
+_BITMAP_BITS_PER_ITEM = 128
+_UINT64_LIMIT = 1 << 64
+
+
+class Alphabet:
+    """
+    Скомпилированный алфавит: символы и таблицы пакетной генерации.
+
+    Создается через compile_alphabet, который кэширует результат.
+    """
+    def __init__(self, symbols):
+        self.symbols = tuple(symbols)
+        size = len(self.symbols)
+        if size == 0:
+            raise ValueError("Алфавит пуст")
+        if any(not symbol for symbol in self.symbols):
+            raise ValueError("Символ алфавита не может быть пустой строкой")
+        if len(set(self.symbols)) != size:
+            raise ValueError("Символы алфавита повторяются")
+        self.size = size
+        self.graphemes = any(len(symbol) > 1 for symbol in self.symbols)
+        # Ни один символ не начинает другой: тогда разные последовательности
+        # символов всегда дают разные строки
+        ordered = sorted(self.symbols)
+        self.prefix_free = not any(following.startswith(symbol)
+                                   for symbol, following in zip(ordered, ordered[1:]))
+
+        # byte_table переводит случайный байт в байт символа, rejected -
+        # отбрасываемые байты, decoding_table - декодирование в строку;
+        # separator - байт между словами, которого нет среди байтов
+        # символов (None, если такого байта нет)
+        self.byte_table = self.decoding_table = self.rejected = None
+        self.separator = self.separator_char = None
+        if size > 256:
+            return
+        self.rejected = bytes(range(256 - 256 % size, 256))
+        codepoints = ''.join(self.symbols)
+        if not self.graphemes and codepoints.isascii():
+            self.byte_table = bytes(ord(codepoints[b % size]) for b in range(256))
+            free = [b for b in range(128) if chr(b) not in codepoints]
+            if free:
+                self.separator, self.separator_char = free[0], chr(free[0])
+            return
+
+        free = [c for c in _SEPARATORS if c not in codepoints]
+        table = [self.symbols[b % size] for b in range(256)]
+        if free and self.rejected:
+            # Отброшенный байт в данных не встречается и служит разделителем
+            self.separator = self.rejected[-1]
+        elif free and size < 256:
+            # Размер делит 256: байты сначала переводятся в номера символов,
+            # и свободным остается любой байт от size
+            self.byte_table = bytes(b % size for b in range(256))
+            self.separator = 255
+            table = list(self.symbols) + [self.symbols[0]] * (256 - size)
+        elif self.graphemes:
+            # Без разделителя графемы собираются по номерам символов
+            self.byte_table = bytes(b % size for b in range(256))
+        if self.separator is not None:
+            self.separator_char = free[0]
+            table[self.separator] = free[0]
+        # Таблица-строка декодируется быстрее, графемам нужен кортеж строк
+        self.decoding_table = tuple(table) if self.graphemes else ''.join(table)
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return f"Alphabet({self.symbols!r})"
+
+    def word(self, rng, length):
+        """
+        Одно слово: по одному rng.choice на символ.
+        """
+        return ''.join(rng.choice(self.symbols) for _ in range(length))
+
+    def words_from_bytes(self, data, length):
+        """
+        Слова длины length из байтов, уже переведенных через byte_table и
+        очищенных от rejected (по одному байту на символ).
+
+        Если есть свободный байт-разделитель, он вставляется между словами
+        срезами с шагом, и строка делится одним вызовом str.split; иначе
+        (и для длинных слов из одиночных кодовых точек) слова нарезаются
+        срезами строки.
+        """
+        separator = self.separator
+        if separator is not None and (length <= _SPLIT_MAX_LENGTH or self.graphemes):
+            count = len(data) // length
+            joined = bytearray([separator]) * (count * (length + 1) - 1)
+            for position in range(length):
+                joined[position::length + 1] = data[position::length]
+            return self._decode(joined).split(self.separator_char)
+        if self.graphemes:
+            return self.words_from_indices(data, length)
+        text = self._decode(data)
+        return [text[i:i + length] for i in range(0, len(text), length)]
+
+    def words_from_indices(self, indices, length):
+        """
+        Слова длины length по номерам символов (для алфавитов больше 256).
+        """
+        symbols = list(map(self.symbols.__getitem__, indices))
+        return [''.join(symbols[i:i + length]) for i in range(0, len(symbols), length)]
+
+    def _decode(self, data):
+        if self.decoding_table is None:
+            return data.decode('ascii')
+        return codecs.charmap_decode(data, 'strict', self.decoding_table)[0]
+
+    def space(self, length):
+        """
+        Количество всех слов длины length.
+        """
+        return self.size ** length
+
+    def word_number(self, word):
+        """
+        Номер слова в пространстве слов той же длины или None, если
+        для алфавита номер не вычисляется напрямую (графемы или больше
+        36 символов).
+        """
+        digits = self._digits()
+        if digits is None:
+            return None
+        return int(word.translate(digits), self.size)
+
+    def _digits(self):
+        if self.graphemes or self.size > len(_DIGITS):
+            return None
+        return str.maketrans(''.join(self.symbols), _DIGITS[:self.size])
+
+    def unique_index(self, count, length):
+        """
+        Индекс выданных слов для режима без повторов и функция ключа слова.
+
+        Битовая карта по точным номерам - для небольших пространств,
+        иначе таблица 64-битных отпечатков (точный номер, если он
+        помещается в 64 бита, иначе hash слова).
+        """
+        space = self.space(length)
+        digits = self._digits()
+        if digits is None:
+            return FingerprintSet(count), hash
+
+        def key(word, translate=str.translate, digits=digits, base=self.size):
+            return int(translate(word, digits), base)
+
+        if space <= count * _BITMAP_BITS_PER_ITEM:
+            return Bitmap(space), key
+        return FingerprintSet(count), key if space <= _UINT64_LIMIT else hash
+
+    def enumerate_words(self, length):
+        """
+        Все слова длины length по порядку.
+        """
+        return list(map(''.join, product(self.symbols, repeat=length)))
+
+
+@lru_cache(maxsize=64)
+def _compile(symbols):
+    return Alphabet(symbols)
+
+
+def compile_alphabet(definition=DEFAULT_ALPHABET):
+    """
+    Скомпилированный алфавит по определению (с кэшем).
+
+    definition - имя встроенного алфавита (см. ALPHABETS), строка, где
+    каждая кодовая точка - отдельный символ, последовательность символов
+    (в том числе из нескольких кодовых точек, например 'ch' или эмодзи)
+    или уже скомпилированный Alphabet.
+    """
+    if isinstance(definition, Alphabet):
+        return definition
+    if isinstance(definition, str):
+        definition = ALPHABETS.get(definition, definition)
+    return _compile(tuple(definition))
@@ -0,0 +1,86 @@
+"""
+Источники случайности для RandomWordGenerator.
+
+Любой бэкенд - это объект с интерфейсом random.Random (random, getrandbits,
+randbytes, seed, getstate, setstate), поэтому ядро работает с ним так же,
+как с модулем random:
+
+- 'mersenne' - random.Random (вихрь Мерсенна, воспроизводим по seed);
+- 'pcg64' - numpy.random.Generator с PCG64 (нужен numpy);
+- 'secure' - secure.SecureRandom (os.urandom, без seed и состояния).
+"""
+import random
+
+from .secure import SecureRandom
+
+DEFAULT_BACKEND = 'mersenne'
+
+
+def _numpy():
+    """
+    Импорт numpy только при создании бэкенда pcg64.
+    """
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("Для бэкенда pcg64 нужен пакет numpy") from e
+    return numpy
+
+
+class PCG64Random(random.Random):
+    """
+    Адаптер numpy.random.Generator(PCG64) к интерфейсу random.Random.
+
+    Байты берутся из Generator.bytes, состояние - словарь
+    bit_generator.state, поэтому getstate/setstate и pickle работают.
+    """
+    def __init__(self, seed=None):
+        self._generator = None
+        super().__init__(seed)
+
+    def seed(self, a=None, version=2):
+        numpy = _numpy()
+        self._generator = numpy.random.Generator(numpy.random.PCG64(a))
+
+    def getstate(self):
+        return self._generator.bit_generator.state
+
+    def setstate(self, state):
+        self._generator.bit_generator.state = state
+
+    def randbytes(self, n):
+        return self._generator.bytes(n)
+
+    def getrandbits(self, k):
+        if k < 0:
+            raise ValueError("Количество битов не может быть отрицательным")
+        size = (k + 7) // 8
+        return int.from_bytes(self._generator.bytes(size), 'little') >> (size * 8 - k)
+
+    def random(self):
+        return float(self._generator.random())
+
+
+BACKENDS = {
+    'mersenne': random.Random,
+    'pcg64': PCG64Random,
+    'secure': lambda seed=None: SecureRandom(),
+}
+
+
+def make_rng(backend=DEFAULT_BACKEND, seed=None):
+    """
+    Источник случайности по имени бэкенда или готовый объект rng.
+
+    seed задает начальное состояние (для 'secure' недопустим).
+    """
+    if not isinstance(backend, str):
+        if seed is not None:
+            backend.seed(seed)
+        return backend
+    factory = BACKENDS.get(backend)
+    if factory is None:
+        raise ValueError(f"Неизвестный источник случайности: {backend}")
+    if backend == 'secure' and seed is not None:
+        raise ValueError("Источник 'secure' не поддерживает seed")
+    return factory(seed)
@@ -0,0 +1,215 @@
+"""
+Компактный контейнер результата: WordBatch вместо списка строк Python.
+
+Каждая строка Python - отдельный объект (около 50 байт заголовка плюс
+указатель в списке), поэтому список из 10^7 слов длины 5 занимает
+больше 600 МБ. WordBatch хранит все элементы одним буфером байтов UTF-8
+в виде строк текста - элемент и перевод строки за ним:
+
+    слова одной длины   буфер, элемент i - байты [i * (w + 1), ... + w)
+    разная длина        буфер и массив смещений начала элементов
+
+Строки создаются только при обращении (batch[i], перебор порциями),
+срез batch[a:b] - новый WordBatch поверх того же буфера без копирования,
+а запись в файл - один write всего буфера (write_to, stream.write_chunks).
+"""
+import codecs
+from array import array
+from itertools import accumulate, chain
+
+# Сколько элементов декодируется за один раз при переборе
+ITER_CHUNK = 4096
+
+_MAX_OFFSET_I = 0xFFFFFFFF
+
+
+def _offsets_array(positions, total):
+    """
+    Массив смещений: 32-битный, если буфер меньше 4 ГБ.
+    """
+    return array('I' if total <= _MAX_OFFSET_I else 'Q', positions)
+
+
+class WordBatch:
+    """
+    Последовательность строк в одном буфере: len, batch[i], batch[a:b],
+    перебор, raw(i) - байты элемента как memoryview, buffer - все
+    элементы с переводами строк, готовые к записи.
+
+    Создается генератором (RandomWordGenerator.generate_words_batch) или
+    из строк: WordBatch.from_strings, WordBatch.from_chunks.
+    """
+    __slots__ = ('_data', '_count', '_width', '_offsets')
+
+    def __init__(self, data, count, width=None, offsets=None):
+        """
+        data - байты элементов, за каждым перевод строки; для элементов
+        одной длины задается width (байтов в элементе), иначе offsets -
+        count + 1 смещений начала элементов в data.
+        """
+        if (width is None) == (offsets is None):
+            raise ValueError("Нужно задать либо width, либо offsets")
+        self._data = memoryview(data)
+        self._count = count
+        self._width = width
+        self._offsets = offsets
+        if width is not None and len(self._data) != count * (width + 1):
+            raise ValueError("Размер буфера не совпадает с количеством элементов")
+        if offsets is not None and len(offsets) != count + 1:
+            raise ValueError("Смещений должно быть на одно больше, чем элементов")
+
+    @classmethod
+    def from_strings(cls, items):
+        """
+        Пакет из последовательности строк (элементы копируются в буфер).
+        """
+        if not isinstance(items, list):
+            items = list(items)
+        count = len(items)
+        if not count:
+            return cls(b"", 0, 0)
+        text = "\n".join(items) + "\n"
+        data = text.encode("utf-8")
+        if len(data) == len(text):
+            # Только ASCII: длина в байтах равна длине строки
+            sizes = list(map(len, items))
+        else:
+            sizes = list(map(len, data.split(b"\n")))
+            if len(sizes) == count + 1:
+                del sizes[-1]
+            else:
+                # Перевод строки внутри элемента
+                sizes = [len(item.encode("utf-8")) for item in items]
+        width = sizes[0]
+        if sizes.count(width) == count:
+            return cls(data, count, width)
+        ends = accumulate(size + 1 for size in sizes)
+        return cls(data, count, offsets=_offsets_array(chain((0,), ends), len(data)))
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """
+        Один пакет из порций (например, из iter_random_names): в памяти
+        одновременно только одна порция в виде строк.
+        """
+        return cls.concat([chunk if isinstance(chunk, cls) else cls.from_strings(chunk)
+                           for chunk in chunks])
+
+    @classmethod
+    def concat(cls, batches):
+        """
+        Склейка пакетов в один новый буфер.
+        """
+        batches = [batch for batch in batches if batch._count]
+        if not batches:
+            return cls(b"", 0, 0)
+        if len(batches) == 1:
+            return batches[0]
+        data = b"".join([batch.buffer for batch in batches])
+        count = sum(batch._count for batch in batches)
+        width = batches[0]._width
+        if width is not None and all(batch._width == width for batch in batches):
+            return cls(data, count, width)
+        offsets = _offsets_array((), len(data))
+        base = 0
+        for batch in batches:
+            if batch._width is not None:
+                offsets.extend(range(base, base + len(batch.buffer), batch._width + 1))
+            else:
+                shift = base - batch._offsets[0]
+                offsets.extend(map(shift.__add__, batch._offsets[:-1]))
+            base += len(batch.buffer)
+        offsets.append(base)
+        return cls(data, count, offsets=offsets)
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        return f"WordBatch(count={self._count}, width={self._width})"
+
+    @property
+    def buffer(self):
+        """
+        Байты всех элементов с переводом строки после каждого (memoryview).
+        """
+        if self._width is not None:
+            return self._data
+        return self._data[self._offsets[0]:self._offsets[self._count]]
+
+    @property
+    def nbytes(self):
+        """
+        Память под буфер и смещения, байт.
+        """
+        size = len(self.buffer)
+        if self._offsets is not None:
+            size += len(self._offsets) * self._offsets.itemsize
+        return size
+
+    def raw(self, position):
+        """
+        Байты UTF-8 элемента без копирования (memoryview).
+        """
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError("Номер элемента вне пакета")
+        if self._width is not None:
+            start = position * (self._width + 1)
+            return self._data[start:start + self._width]
+        return self._data[self._offsets[position]:self._offsets[position + 1] - 1]
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            start, stop, step = position.indices(self._count)
+            if step != 1:
+                return WordBatch.from_strings([self[i] for i in range(start, stop, step)])
+            count = max(stop - start, 0)
+            if self._width is not None:
+                stride = self._width + 1
+                return WordBatch(self._data[start * stride:(start + count) * stride],
+                                 count, self._width)
+            # Смещения остаются абсолютными: буфер общий, срез - только вид
+            offsets = memoryview(self._offsets)[start:start + count + 1]
+            return WordBatch(self._data, count, offsets=offsets)
+        return codecs.utf_8_decode(self.raw(position))[0]
+
+    def __iter__(self):
+        return chain.from_iterable(self.chunks())
+
+    def chunks(self, size=ITER_CHUNK):
+        """
+        Элементы порциями по size строк: буфер порции декодируется одним
+        вызовом и делится по переводам строк.
+        """
+        for start in range(0, self._count, size):
+            part = self[start:start + size]
+            items = codecs.utf_8_decode(part.buffer)[0].split("\n")
+            if len(items) != len(part) + 1:
+                # Перевод строки внутри элемента: деление только по смещениям
+                items = [part[i] for i in range(len(part))]
+            else:
+                del items[-1]
+            yield items
+
+    def tolist(self):
+        """
+        Все элементы списком строк.
+        """
+        return list(self)
+
+    def text(self):
+        """
+        Все элементы одной строкой через перевод строки (без последнего).
+        """
+        buffer = self.buffer
+        return codecs.utf_8_decode(buffer[:-1])[0] if self._count else ""
+
+    def write_to(self, stream):
+        """
+        Запись буфера в бинарный поток одним вызовом; возвращает размер в байтах.
+        """
+        buffer = self.buffer
+        stream.write(buffer)
+        return len(buffer)
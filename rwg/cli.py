@@ -0,0 +1,248 @@
+"""
+Командная строка генератора: python -m rwg words|phrases|names|markov|pattern|train|serve.
+
+Модуль импортирует только ядро генератора, поэтому работает без PyQt5
+и без дисплея.
+"""
+import argparse
+import sys
+
+from .alphabet import ALPHABETS, DEFAULT_ALPHABET, compile_alphabet
+from .backends import BACKENDS, DEFAULT_BACKEND, make_rng
+from .core import CHUNK_SIZE, DEFAULT_VOCABULARY, RandomWordGenerator
+from .parallel import iter_parallel
+# Модули отдельных команд (export, markov, sampling) загружаются в их
+# обработчиках: каждый импорт на верхнем уровне удлиняет запуск rwg words
+from .stream import COMPRESSIONS, FORMATS, format_for_path, write_to_path
+
+
+def build_parser():
+    """
+    Создание парсера аргументов командной строки.
+    """
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--seed", type=int, default=None,
+                        help="начальное значение генератора для воспроизводимого вывода")
+    common.add_argument("--backend", choices=tuple(BACKENDS), default=DEFAULT_BACKEND,
+                        help="источник случайности (pcg64 требует numpy)")
+    common.add_argument("--secure", dest="backend", action="store_const", const="secure",
+                        help="криптографически стойкий генератор (os.urandom), "
+                             "то же, что --backend secure; несовместим с --seed")
+    common.add_argument("--output", "-o", default=None,
+                        help="файл для записи результата (по умолчанию stdout)")
+    common.add_argument("--format", choices=FORMATS, default=None,
+                        help="формат вывода (по умолчанию по расширению файла: "
+                             ".jsonl, .csv, .rwgc, иначе текст)")
+    common.add_argument("--compress", choices=COMPRESSIONS, default=None,
+                        help="сжатие файла (по умолчанию по расширению: .gz, .bz2, .xz)")
+    common.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="размер порции потоковой генерации")
+    common.add_argument("--stats", action="store_true",
+                        help="вывести пропускную способность записи в stderr")
+    common.add_argument("--dictionary", action="append", default=[],
+                        metavar="CATEGORY=PATH",
+                        help="внешний словарь для категории "
+                             f"({', '.join(DEFAULT_VOCABULARY)}), одно слово на строку")
+    common.add_argument("--weighted-dictionary", action="append", default=[],
+                        metavar="CATEGORY=PATH",
+                        help="словарь с частотами: строки вида \"слово<TAB>вес\"")
+    common.add_argument("--workers", type=int, default=1,
+                        help="количество процессов (вывод при одном seed от него не зависит)")
+    common.add_argument("--profile", action="store_true",
+                        help="вывести в stderr время по этапам генерации "
+                             "(только основной процесс)")
+    common.add_argument("--profile-output", default=None, metavar="PATH",
+                        help="сохранить профиль cProfile для pstats (включает --profile)")
+
+    parser = argparse.ArgumentParser(
+        prog="rwg", description="Генератор случайных слов, словосочетаний и имен")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    words = commands.add_parser("words", parents=[common], help="случайные слова")
+    words.add_argument("--count", type=int, default=1, help="количество слов")
+    words.add_argument("--length", type=int, default=5, help="длина слова")
+    words.add_argument("--unique", action="store_true", help="без повторов (в одном процессе)")
+    words.add_argument("--alphabet", default=DEFAULT_ALPHABET,
+                       help=f"алфавит: {', '.join(ALPHABETS)} или строка символов")
+
+    phrases = commands.add_parser("phrases", parents=[common], help="случайные словосочетания")
+    phrases.add_argument("--count", type=int, default=1, help="количество словосочетаний")
+
+    names = commands.add_parser("names", parents=[common], help="случайные имена")
+    names.add_argument("--count", type=int, default=1, help="количество имен")
+    names.add_argument("--unique", action="store_true", help="без повторов (в одном процессе)")
+
+    markov = commands.add_parser("markov", parents=[common],
+                                 help="правдоподобные слова по марковской модели")
+    markov.add_argument("--model", required=True, help="файл модели (см. команду train)")
+    markov.add_argument("--count", type=int, default=1, help="количество слов")
+    markov.add_argument("--min-length", type=int, default=1, help="минимальная длина слова")
+    markov.add_argument("--max-length", type=int, default=None,
+                        help="максимальная длина слова (по умолчанию - как в корпусе)")
+
+    pattern = commands.add_parser("pattern", parents=[common],
+                                  help="строки по шаблону, например Cvc-#### или {adj} {noun}")
+    pattern.add_argument("pattern", help="шаблон (элементы см. в модуле rwg.pattern)")
+    pattern.add_argument("--count", type=int, default=1, help="количество строк")
+    pattern.add_argument("--alphabet", default=DEFAULT_ALPHABET,
+                         help="алфавит для {word} без явного алфавита")
+
+    train = commands.add_parser("train", help="обучение марковской модели на корпусе")
+    train.add_argument("corpus", help="текстовый файл корпуса (UTF-8)")
+    train.add_argument("--model", required=True, help="файл для записи модели")
+    train.add_argument("--order", type=int, default=None,
+                       help="порядок модели (длина состояния в символах, по умолчанию 3)")
+
+    serve = commands.add_parser("serve", help="локальный HTTP-сервис генерации")
+    serve.add_argument("--host", default="127.0.0.1", help="адрес для прослушивания")
+    serve.add_argument("--port", type=int, default=8080, help="порт (0 - любой свободный)")
+    serve.add_argument("--seed", type=int, default=None,
+                       help="начальное значение генератора сервиса")
+    serve.add_argument("--backend", choices=tuple(BACKENDS), default=DEFAULT_BACKEND,
+                       help="источник случайности (pcg64 требует numpy)")
+    serve.add_argument("--batch-window", type=float, default=0.0, metavar="MS",
+                       help="сколько ждать одновременные запросы для объединения в пакет, мс "
+                            "(0 - только пришедшие в одной итерации цикла событий)")
+    return parser
+
+
+def parse_dictionary(parser, spec):
+    """
+    Разбор аргумента вида CATEGORY=PATH.
+    """
+    category, _, path = spec.partition("=")
+    if category not in DEFAULT_VOCABULARY or not path:
+        parser.error(f"неверный словарь: {spec}")
+    return category, path
+
+
+def generate(args):
+    """
+    Ленивая генерация порций элементов по разобранным аргументам.
+    """
+    length = getattr(args, "length", 0)
+    alphabet = getattr(args, "alphabet", DEFAULT_ALPHABET)
+    if args.command == "markov":
+        from .markov import MarkovModel
+        engine = RandomWordGenerator(args.backend, args.seed)
+        return engine.iter_markov_words(MarkovModel.load(args.model), args.count,
+                                        args.chunk_size, None, args.min_length, args.max_length)
+    if args.command == "pattern":
+        engine = RandomWordGenerator(args.backend, args.seed, alphabet)
+        return engine.iter_pattern(args.pattern, args.count, args.chunk_size)
+    if getattr(args, "unique", False):
+        engine = RandomWordGenerator(args.backend, args.seed, alphabet)
+        if args.command == "words":
+            return engine.iter_unique_words(args.count, length, args.chunk_size)
+        names = engine.generate_random_names(args.count, unique=True)
+        return [names[start:start + args.chunk_size]
+                for start in range(0, len(names), args.chunk_size)]
+    return iter_parallel(args.command, args.count, length, args.seed,
+                         args.workers, args.chunk_size, args.backend, alphabet)
+
+
+def train(parser, args):
+    """
+    Обучение марковской модели на корпусе и запись ее в файл.
+    """
+    from .markov import DEFAULT_ORDER, MarkovModel
+    order = DEFAULT_ORDER if args.order is None else args.order
+    try:
+        model = MarkovModel.from_corpus(args.corpus, order)
+        model.save(args.model)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    print(model, file=sys.stderr)
+    return 0
+
+
+def serve(parser, args):
+    """
+    Запуск HTTP-сервиса (модуль asyncio загружается только здесь).
+    """
+    if args.batch_window < 0:
+        parser.error("--batch-window не может быть отрицательным")
+    try:
+        make_rng(args.backend, args.seed)
+    except (ImportError, ValueError) as e:
+        parser.error(str(e))
+    from .server import run
+    try:
+        return run(args.host, args.port, args.backend, args.seed, args.batch_window / 1000)
+    except OSError as e:
+        # Например, порт уже занят
+        parser.error(f"не удалось запустить сервис на {args.host}:{args.port}: {e}")
+
+
+def main(argv=None):
+    """
+    Точка входа командной строки.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "train":
+        return train(parser, args)
+    if args.command == "serve":
+        return serve(parser, args)
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size должен быть положительным")
+    if args.workers <= 0:
+        parser.error("--workers должен быть положительным")
+    try:
+        # Проверка бэкенда и алфавита заранее: генерация частей начинается лениво
+        make_rng(args.backend, args.seed)
+        compile_alphabet(getattr(args, "alphabet", DEFAULT_ALPHABET))
+    except (ImportError, ValueError) as e:
+        parser.error(str(e))
+    output_format, compression = format_for_path(args.output)
+    output_format = args.format or output_format
+    compression = args.compress or compression
+    if compression is not None and args.output in (None, "-"):
+        parser.error("--compress требует --output")
+    if getattr(args, "unique", False) and args.workers != 1:
+        parser.error("--unique работает только с --workers 1")
+    if args.command in ("markov", "pattern") and args.workers != 1:
+        parser.error(f"{args.command} работает только с --workers 1")
+    for spec in args.dictionary:
+        category, path = parse_dictionary(parser, spec)
+        try:
+            RandomWordGenerator.load_dictionary(category, path)
+        except (OSError, ValueError) as e:
+            parser.error(f"словарь {path}: {e}")
+    if args.weighted_dictionary:
+        from .sampling import WeightedVocabulary
+    for spec in args.weighted_dictionary:
+        category, path = parse_dictionary(parser, spec)
+        try:
+            vocabulary = WeightedVocabulary.from_file(path)
+        except OSError as e:
+            parser.error(f"словарь {path}: {e}")
+        except ValueError as e:
+            parser.error(str(e))
+        RandomWordGenerator.use_vocabulary(category, vocabulary)
+    profiler = None
+    if args.profile or args.profile_output:
+        # Замеры подключаются только по запросу: без них пробы не подменяются
+        from .profiling import default_profiler
+        profiler = default_profiler()
+        profiler.enable(cprofile=args.profile_output is not None)
+    try:
+        try:
+            chunks = generate(args)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        if output_format == 'text' and compression is None:
+            stats = write_to_path(chunks, args.output)
+        else:
+            from .export import export_chunks
+            stats = export_chunks(chunks, args.output, output_format, compression)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+    if args.stats:
+        print(stats, file=sys.stderr)
+    if profiler is not None:
+        print(profiler.summary(), file=sys.stderr)
+        if args.profile_output:
+            profiler.dump_stats(args.profile_output)
+    return 0
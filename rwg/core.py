@@ -0,0 +1,567 @@
+"""
+Ядро генератора случайных слов, словосочетаний и имен.
+
+Модуль не зависит от PyQt5 и matplotlib, поэтому его можно импортировать
+из консольных скриптов и тестовых заданий без графического окружения.
+"""
+import math
+import random
+import string
+import threading
+from array import array
+from functools import lru_cache, update_wrapper
+from itertools import chain
+
+from .alphabet import DEFAULT_ALPHABET, compile_alphabet
+from .backends import DEFAULT_BACKEND, make_rng
+from .batch import WordBatch
+from .dictionary import MappedWordList
+
+# Буквы алфавита по умолчанию (латиница в нижнем регистре)
+LETTERS = string.ascii_lowercase
+
+# Словари собираются один раз при импорте в неизменяемые кортежи.
+NOUNS = ('кот', 'дом', 'стол', 'книга', 'город', 'друг', 'машина', 'солнце')
+ADJECTIVES = ('красный', 'большой', 'маленький', 'яркий', 'старый', 'новый', 'синий', 'зеленый')
+VERBS = ('идет', 'читает', 'смеется', 'думает', 'работает', 'играет', 'танцует', 'поет')
+FIRST_NAMES = ("Алексей", "Мария", "Дмитрий", "Анна", "Сергей", "Екатерина", "Иван", "Ольга")
+LAST_NAMES = ("Иванов", "Петров", "Сидоров", "Кузнецов", "Смирнов", "Попов", "Зайцев", "Лебедев")
+
+# Категории словарей; любую из них можно заменить внешним словарем.
+DEFAULT_VOCABULARY = {
+    'nouns': NOUNS,
+    'adjectives': ADJECTIVES,
+    'verbs': VERBS,
+    'first_names': FIRST_NAMES,
+    'last_names': LAST_NAMES,
+}
+
+# Скомпилированные шаблоны: категория словаря для каждой позиции,
+# слова соединяются пробелом.
+PHRASE_TEMPLATES = (
+    ('adjectives', 'nouns'),
+    ('nouns', 'verbs'),
+    ('adjectives', 'nouns', 'verbs'),
+)
+NAME_TEMPLATE = ('first_names', 'last_names')
+
+# Верхняя граница 32-битных индексов для больших словарей
+_WIDE_RANGE = 1 << 32
+
+# Меньшие пакеты заполняются поэлементно: подготовка массивов индексов
+# для них дороже самих выборов.
+SMALL_BATCH = 16
+
+# Экземпляры генератора, принадлежащие потокам (см. for_thread)
+_thread_engines = threading.local()
+
+# Размер порции для потоковой генерации: память ограничена одной порцией
+# независимо от общего количества элементов.
+CHUNK_SIZE = 65536
+
+
+def random_bytes(rng, size):
+    """
+    size случайных байтов от rng: через randbytes, если он есть (Python 3.9+
+    или SecureRandom), иначе через getrandbits с тем же результатом.
+    """
+    randbytes = getattr(rng, 'randbytes', None)
+    if randbytes is not None:
+        return randbytes(size)
+    return rng.getrandbits(size * 8).to_bytes(size, 'little')
+
+
+@lru_cache(maxsize=None)
+def _index_tables(size):
+    """
+    Таблица перевода байта в индекс [0, size) и байты, которые отбрасываются.
+    """
+    limit = 256 - 256 % size
+    return bytes(b % size for b in range(256)), bytes(range(limit, 256))
+
+
+def _draw_mapped_bytes(rng, count, table, rejected):
+    """
+    count случайных байтов, переведенных через table, с отбрасыванием rejected.
+    """
+    result = bytearray()
+    while len(result) < count:
+        need = count - len(result)
+        # Запас на отброшенные байты (в среднем их не больше 9%)
+        size = need + need // 8 + 16
+        result += random_bytes(rng, size).translate(table, rejected)
+    del result[count:]
+    return result
+
+
+def draw_indices(rng, count, size):
+    """
+    Массив из count случайных индексов в диапазоне [0, size).
+
+    Для словарей до 256 элементов индексы берутся одним буфером байтов,
+    до 2^32 - буфером 32-битных чисел; лишние значения сверху диапазона
+    отбрасываются, чтобы не было смещения.
+    """
+    if size <= 0:
+        raise IndexError("Нельзя выбрать элемент из пустого словаря")
+    if size <= 256:
+        table, rejected = _index_tables(size)
+        return _draw_mapped_bytes(rng, count, table, rejected)
+    if size > _WIDE_RANGE:
+        return [rng.randrange(size) for _ in range(count)]
+    limit = _WIDE_RANGE - _WIDE_RANGE % size
+    result = []
+    while len(result) < count:
+        need = count - len(result)
+        numbers = array('I')
+        numbers.frombytes(random_bytes(rng, 4 * need))
+        result += [number % size for number in numbers if number < limit]
+    del result[count:]
+    return result
+
+
+def table_indices(rng, table, count):
+    """
+    Индексы count слов словаря: с учетом весов, если словарь их задает.
+    """
+    sample_indices = getattr(table, 'sample_indices', None)
+    if sample_indices is not None:
+        return sample_indices(rng, count)
+    return draw_indices(rng, count, len(table))
+
+
+def pick(rng, table):
+    """
+    Одно слово словаря (с учетом весов, если они заданы).
+    """
+    sample = getattr(table, 'sample', None)
+    return sample(rng) if sample is not None else rng.choice(table)
+
+
+def fill_template(rng, template, count):
+    """
+    Ленивое заполнение шаблона count раз по заранее выбранным индексам.
+
+    template - последовательность словарей (по одному на позицию).
+    """
+    if count < SMALL_BATCH:
+        return (' '.join([pick(rng, table) for table in template]) for _ in range(count))
+    columns = [map(table.__getitem__, table_indices(rng, table, count))
+               for table in template]
+    return map(' '.join, zip(*columns))
+
+
+def alphabet_words(rng, alphabet, count, length):
+    """
+    Пакет из count слов длины length в скомпилированном алфавите.
+
+    Для алфавитов до 256 символов все случайные байты берутся одним
+    буфером и переводятся в символы таблицами алфавита, без цикла по
+    символам; для больших алфавитов - по массиву индексов.
+    """
+    total = count * length
+    if total <= 0:
+        return [''] * count
+    if alphabet.rejected is None:
+        return alphabet.words_from_indices(draw_indices(rng, total, alphabet.size), length)
+    data = _draw_mapped_bytes(rng, total, alphabet.byte_table, alphabet.rejected)
+    return alphabet.words_from_bytes(data, length)
+
+
+def alphabet_batch(rng, alphabet, count, length):
+    """
+    Пакет слов как в alphabet_words, но в одном буфере (batch.WordBatch).
+
+    Для ASCII-алфавитов байты символов сразу раскладываются по строкам
+    буфера срезами с шагом, строки Python не создаются; слова те же, что
+    дал бы alphabet_words при том же состоянии rng. Перевод строки в
+    алфавите допустим: элементы пакета одной ширины выделяются по
+    позициям, а не по разделителю.
+    """
+    if alphabet.byte_table is None or alphabet.decoding_table is not None:
+        return WordBatch.from_strings(alphabet_words(rng, alphabet, count, length))
+    count = max(count, 0)
+    data = _draw_mapped_bytes(rng, count * length, alphabet.byte_table, alphabet.rejected)
+    stride = length + 1
+    lines = bytearray(b"\n") * (count * stride)
+    for position in range(length):
+        lines[position::stride] = data[position::length]
+    return WordBatch(lines, count, length)
+
+
+def _iter_unique_words(rng, alphabet, count, length, chunk_size):
+    """
+    Порции неповторяющихся слов длины length в алфавите alphabet.
+    """
+    if count <= 0:
+        return
+    if count * 10 > alphabet.space(length) * 9:
+        # Почти полное покрытие: отсев повторов потребовал бы слишком много
+        # лишних выборок, поэтому слова берутся без возвращения из всего
+        # перечисленного пространства
+        words = rng.sample(alphabet.enumerate_words(length), count)
+        for start in range(0, count, chunk_size):
+            yield words[start:start + chunk_size]
+        return
+
+    seen, key = alphabet.unique_index(count, length)
+    remaining = count
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        chunk = []
+        while len(chunk) < size:
+            candidates = alphabet_words(rng, alphabet, size - len(chunk), length)
+            chunk += seen.select_new(candidates, map(key, candidates))
+        yield chunk
+        remaining -= size
+
+
+def sample_template_unique(rng, template, count):
+    """
+    count разных заполнений шаблона: выборка без возвращения номеров
+    из всех сочетаний слов (веса словарей при этом не учитываются).
+    """
+    sizes = [len(table) for table in template]
+    space = math.prod(sizes)
+    if count > space:
+        raise ValueError(f"Всего {space} разных сочетаний, нельзя выдать {count}")
+    result = []
+    for number in rng.sample(range(space), max(count, 0)):
+        words = []
+        for table, size in zip(template, sizes):
+            number, index = divmod(number, size)
+            words.append(table[index])
+        result.append(' '.join(words))
+    return result
+
+
+class _EngineMethod:
+    """
+    Метод генератора, доступный и у экземпляра, и у самого класса.
+
+    При вызове у класса метод работает с общим экземпляром на глобальном
+    состоянии модуля random (см. RandomWordGenerator.shared).
+    """
+    def __init__(self, function):
+        self.function = function
+        update_wrapper(self, function)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            instance = owner.shared()
+        return self.function.__get__(instance, owner)
+
+
+def _iter_chunks(count, chunk_size, make_chunk):
+    """
+    Разбиение запроса на count элементов на порции по chunk_size.
+    """
+    if chunk_size <= 0:
+        raise ValueError("Размер порции должен быть положительным")
+    remaining = count
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        yield make_chunk(size)
+        remaining -= size
+
+
+class RandomWordGenerator:
+    """
+    Генератор случайных слов, словосочетаний и имен.
+
+    Экземпляр владеет собственным источником случайности (бэкенд
+    'mersenne', 'pcg64', 'secure' или готовый объект с интерфейсом
+    random.Random), поэтому генераторы в разных потоках не делят одно
+    состояние, а запуск можно воспроизвести через seed/getstate/setstate.
+    alphabet - алфавит слов по умолчанию (см. alphabet.compile_alphabet).
+    Методы генерации можно вызывать и у класса: тогда используется
+    глобальное состояние модуля random и латиница, как и раньше.
+    """
+    # Текущие словари по категориям (см. DEFAULT_VOCABULARY)
+    vocabulary = dict(DEFAULT_VOCABULARY)
+
+    def __init__(self, backend=DEFAULT_BACKEND, seed=None, alphabet=DEFAULT_ALPHABET):
+        self.rng = make_rng(backend, seed)
+        self.alphabet = compile_alphabet(alphabet)
+
+    @classmethod
+    def shared(cls):
+        """
+        Общий экземпляр класса на глобальном состоянии модуля random.
+        """
+        engine = cls.__dict__.get('_shared')
+        if engine is None:
+            engine = cls(random)
+            cls._shared = engine
+        return engine
+
+    @classmethod
+    def for_thread(cls, backend=DEFAULT_BACKEND):
+        """
+        Экземпляр для текущего потока (создается при первом обращении).
+
+        У каждого потока свое состояние, поэтому потоки не конкурируют
+        за один генератор.
+        """
+        engines = _thread_engines.__dict__.setdefault('engines', {})
+        engine = engines.get((cls, backend))
+        if engine is None:
+            engine = engines[(cls, backend)] = cls(backend)
+        return engine
+
+    def seed(self, seed=None):
+        """
+        Новое начальное состояние источника случайности.
+        """
+        self.rng.seed(seed)
+
+    def getstate(self):
+        """
+        Текущее состояние источника случайности (для повторения запуска).
+        """
+        return self.rng.getstate()
+
+    def setstate(self, state):
+        """
+        Восстановление состояния, полученного из getstate.
+        """
+        self.rng.setstate(state)
+
+    @classmethod
+    def use_vocabulary(cls, category, words):
+        """
+        Замена словаря категории любой последовательностью слов.
+
+        Последовательность с методами sample/sample_indices (например,
+        sampling.WeightedVocabulary) выбирается с учетом весов.
+        """
+        if category not in DEFAULT_VOCABULARY:
+            raise KeyError(f"Неизвестная категория словаря: {category}")
+        if len(words) == 0:
+            raise ValueError(f"Словарь для категории {category} пуст")
+        cls.vocabulary[category] = words
+
+    @classmethod
+    def load_dictionary(cls, category, path):
+        """
+        Подключение внешнего словаря из файла (одно слово на строку) через mmap.
+        """
+        cls.use_vocabulary(category, MappedWordList(path))
+
+    @classmethod
+    def reset_vocabulary(cls):
+        """
+        Возврат встроенных словарей.
+        """
+        cls.vocabulary = dict(DEFAULT_VOCABULARY)
+
+    def template_tables(self, template):
+        """
+        Словари для позиций шаблона, заданного категориями (словари
+        экземпляра, если они заданы, иначе общие словари класса).
+        """
+        return tuple(self.vocabulary[category] for category in template)
+
+    def _alphabet(self, alphabet):
+        return self.alphabet if alphabet is None else compile_alphabet(alphabet)
+
+    @_EngineMethod
+    def generate_random_word(self, length, rng=None, alphabet=None):
+        """
+        Генерация случайного слова заданной длины.
+
+        Во всех методах rng - источник случайности с интерфейсом модуля
+        random; по умолчанию - источник этого экземпляра (у класса -
+        глобальное состояние модуля random). Для криптографически стойкой
+        генерации - RandomWordGenerator('secure'). alphabet - имя
+        встроенного алфавита, строка символов или последовательность
+        графем; по умолчанию - алфавит экземпляра.
+        """
+        rng = self.rng if rng is None else rng
+        return self._alphabet(alphabet).word(rng, length)
+
+    @_EngineMethod
+    def generate_words_bulk(self, count, length, rng=None, alphabet=None):
+        """
+        Пакетная генерация списка случайных слов заданной длины.
+
+        Все случайные байты берутся одним вызовом random_bytes и
+        переводятся в символы таблицами алфавита, без цикла по символам.
+        Эталон: после random.seed(42) вызов generate_words_bulk(3, 5)
+        возвращает ['brvhx', 'xycba', 'zgmgh'].
+        """
+        rng = self.rng if rng is None else rng
+        return alphabet_words(rng, self._alphabet(alphabet), count, length)
+
+    @_EngineMethod
+    def generate_words_batch(self, count, length, rng=None, alphabet=None):
+        """
+        Пакетная генерация слов в компактный batch.WordBatch: один буфер
+        байтов вместо списка строк, те же слова, что у generate_words_bulk.
+        """
+        rng = self.rng if rng is None else rng
+        return alphabet_batch(rng, self._alphabet(alphabet), count, length)
+
+    @_EngineMethod
+    def generate_random_words(self, count, length, rng=None, unique=False, alphabet=None):
+        """
+        Генерация списка случайных слов заданной длины.
+
+        При unique=True все слова в списке разные.
+        """
+        if unique:
+            chunks = self.iter_unique_words(count, length, CHUNK_SIZE, rng, alphabet)
+            return list(chain.from_iterable(chunks))
+        return self.generate_words_bulk(count, length, rng, alphabet)
+
+    @_EngineMethod
+    def iter_unique_words(self, count, length, chunk_size=CHUNK_SIZE, rng=None, alphabet=None):
+        """
+        Ленивая генерация count разных слов порциями не больше chunk_size.
+
+        Если запрос покрывает больше 90% всех слов этой длины, слова
+        выбираются без возвращения из перечисленного пространства;
+        иначе повторы отсеиваются по битовой карте номеров слов или по
+        компактной таблице 64-битных отпечатков.
+        """
+        if chunk_size <= 0:
+            raise ValueError("Размер порции должен быть положительным")
+        alphabet = self._alphabet(alphabet)
+        if not alphabet.prefix_free:
+            raise ValueError("Режим без повторов требует алфавита, где ни один "
+                             "символ не является началом другого")
+        space = alphabet.space(length)
+        if count > space:
+            raise ValueError(f"Слов длины {length} всего {space}, нельзя выдать {count} разных")
+        rng = self.rng if rng is None else rng
+        return _iter_unique_words(rng, alphabet, count, length, chunk_size)
+
+    @_EngineMethod
+    def generate_markov_word(self, model, rng=None):
+        """
+        Генерация правдоподобного слова по марковской модели
+        (см. markov.MarkovModel).
+        """
+        return self.generate_markov_words(model, 1, rng)[0]
+
+    @_EngineMethod
+    def generate_markov_words(self, model, count, rng=None, min_length=1, max_length=None):
+        """
+        Пакетная генерация слов по марковской модели.
+
+        Длина слов ограничена min_length и max_length (по умолчанию -
+        длиной самого длинного слова корпуса).
+        """
+        rng = self.rng if rng is None else rng
+        return model.generate(rng, count, min_length, max_length)
+
+    @_EngineMethod
+    def generate_pattern(self, pattern, count, rng=None):
+        """
+        Пакетная генерация count строк по шаблону, например 'Cvc-####'
+        или '{first} {last}@{word}.ru' (см. модуль pattern).
+
+        pattern - строка (компилируется с кэшем) или pattern.Pattern;
+        {word} без алфавита использует алфавит экземпляра.
+        """
+        rng = self.rng if rng is None else rng
+        return compile_pattern(pattern).generate(rng, count, self.vocabulary, self.alphabet)
+
+    @_EngineMethod
+    def generate_random_phrase(self, word_count, rng=None):
+        """
+        Генерация списка случайных словосочетаний.
+
+        Сначала для всех словосочетаний выбираются шаблоны, затем каждый
+        шаблон заполняется пакетом по массивам индексов, и результаты
+        собираются в исходном порядке.
+        """
+        rng = self.rng if rng is None else rng
+        if word_count < SMALL_BATCH:
+            templates = [self.template_tables(template) for template in PHRASE_TEMPLATES]
+            return [' '.join([pick(rng, table) for table in rng.choice(templates)])
+                    for _ in range(word_count)]
+        kinds = draw_indices(rng, word_count, len(PHRASE_TEMPLATES))
+        fills = [fill_template(rng, self.template_tables(template), kinds.count(index))
+                 for index, template in enumerate(PHRASE_TEMPLATES)]
+        return list(map(next, map(fills.__getitem__, kinds)))
+
+    @_EngineMethod
+    def generate_random_name(self, rng=None):
+        """
+        Генерация случайного имени.
+        """
+        return self.generate_random_names(1, rng)[0]
+
+    @_EngineMethod
+    def generate_random_names(self, count, rng=None, unique=False):
+        """
+        Генерация случайных имен.
+
+        При unique=True все имена в списке разные.
+        """
+        rng = self.rng if rng is None else rng
+        tables = self.template_tables(NAME_TEMPLATE)
+        if unique:
+            return sample_template_unique(rng, tables, count)
+        return list(fill_template(rng, tables, count))
+
+    @_EngineMethod
+    def iter_random_words(self, count, length, chunk_size=CHUNK_SIZE, rng=None, alphabet=None):
+        """
+        Ленивая генерация слов порциями (списками) не больше chunk_size.
+        """
+        alphabet = self._alphabet(alphabet)
+        return _iter_chunks(count, chunk_size,
+                            lambda size: self.generate_words_bulk(size, length, rng, alphabet))
+
+    @_EngineMethod
+    def iter_words_batches(self, count, length, chunk_size=CHUNK_SIZE, rng=None, alphabet=None):
+        """
+        Ленивая генерация слов порциями-пакетами (WordBatch) не больше chunk_size.
+        """
+        alphabet = self._alphabet(alphabet)
+        return _iter_chunks(count, chunk_size,
+                            lambda size: self.generate_words_batch(size, length, rng, alphabet))
+
+    @_EngineMethod
+    def iter_markov_words(self, model, count, chunk_size=CHUNK_SIZE, rng=None,
+                          min_length=1, max_length=None):
+        """
+        Ленивая генерация слов по марковской модели порциями не больше chunk_size.
+        """
+        min_length, max_length = model.length_range(min_length, max_length)
+        return _iter_chunks(count, chunk_size, lambda size: self.generate_markov_words(
+            model, size, rng, min_length, max_length))
+
+    @_EngineMethod
+    def iter_pattern(self, pattern, count, chunk_size=CHUNK_SIZE, rng=None):
+        """
+        Ленивая генерация строк по шаблону порциями не больше chunk_size.
+
+        Шаблон компилируется сразу, поэтому ошибка в нем видна до первой порции.
+        """
+        pattern = compile_pattern(pattern)
+        return _iter_chunks(count, chunk_size,
+                            lambda size: self.generate_pattern(pattern, size, rng))
+
+    @_EngineMethod
+    def iter_random_phrases(self, count, chunk_size=CHUNK_SIZE, rng=None):
+        """
+        Ленивая генерация словосочетаний порциями не больше chunk_size.
+        """
+        return _iter_chunks(count, chunk_size,
+                            lambda size: self.generate_random_phrase(size, rng))
+
+    @_EngineMethod
+    def iter_random_names(self, count, chunk_size=CHUNK_SIZE, rng=None):
+        """
+        Ленивая генерация имен порциями не больше chunk_size.
+        """
+        return _iter_chunks(count, chunk_size,
+                            lambda size: self.generate_random_names(size, rng))
+
+
+# Модуль шаблонов сам использует функции ядра, поэтому импортируется
+# после их определения
+from .pattern import compile_pattern  # noqa: E402
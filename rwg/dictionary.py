@@ -0,0 +1,140 @@
+"""
+Внешние словари: текстовый файл UTF-8, одно слово на строку.
+
+Файл открывается через mmap, а рядом с ним один раз строится индекс
+смещений слов (файл <словарь>.idx), который тоже отображается в память.
+Выбор слова по номеру - это два чтения из индекса и срез из mmap,
+поэтому словарь на миллионы слов не загружается в строки Python.
+"""
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+
+INDEX_SUFFIX = ".idx"
+_INDEX_MAGIC = b"RWGIDX1\0"
+# Заголовок индекса: сигнатура, размер и время изменения словаря, число слов
+_INDEX_HEADER = struct.Struct("<8sQQQ")
+# Смещения начала и конца слова, по 8 байт
+_INDEX_ENTRY_SIZE = 16
+
+
+def build_index(path, index_path=None):
+    """
+    Построение индекса строк словаря; пустые строки пропускаются.
+
+    В индексе хранятся пары смещений (начало, конец) каждого слова.
+    Индекс пишется во временный файл рядом и заменяет старый одним
+    os.replace, поэтому прерванное построение не оставляет обрезанный
+    индекс.
+    """
+    index_path = index_path or path + INDEX_SUFFIX
+    offsets = array("Q")
+    with open(path, "rb") as file:
+        stat = os.fstat(file.fileno())
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+        size = len(data)
+        start = 0
+        while start < size:
+            end = data.find(b"\n", start)
+            if end < 0:
+                end = size
+            word_end = end - 1 if end > start and data[end - 1] == 0x0D else end
+            if word_end > start:
+                offsets.append(start)
+                offsets.append(word_end)
+            start = end + 1
+        if isinstance(data, mmap.mmap):
+            data.close()
+    descriptor, temporary = tempfile.mkstemp(prefix=os.path.basename(index_path) + ".",
+                                             suffix=".tmp",
+                                             dir=os.path.dirname(os.path.abspath(index_path)))
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(_INDEX_HEADER.pack(_INDEX_MAGIC, stat.st_size, stat.st_mtime_ns,
+                                          len(offsets) // 2))
+            offsets.tofile(file)
+        os.replace(temporary, index_path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+    return index_path
+
+
+class MappedWordList:
+    """
+    Словарь из файла, отображенного в память, с доступом по номеру за O(1).
+
+    Ведет себя как неизменяемая последовательность строк, поэтому его
+    можно подставлять вместо встроенных словарей генератора.
+    """
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_path = index_path or path + INDEX_SUFFIX
+        if not self._index_is_fresh():
+            build_index(path, self.index_path)
+
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        with open(self.index_path, "rb") as file:
+            self._index_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        _, _, _, self._count = _INDEX_HEADER.unpack_from(self._index_map)
+        self._offsets = memoryview(self._index_map)[_INDEX_HEADER.size:].cast("Q")
+
+    def _index_is_fresh(self):
+        """
+        Соответствует ли существующий индекс текущему файлу словаря.
+        """
+        try:
+            with open(self.index_path, "rb") as file:
+                header = file.read(_INDEX_HEADER.size)
+                index_size = os.fstat(file.fileno()).st_size
+        except OSError:
+            return False
+        if len(header) < _INDEX_HEADER.size:
+            return False
+        magic, size, mtime, count = _INDEX_HEADER.unpack(header)
+        stat = os.stat(self.path)
+        # Размер проверяется отдельно: обрезанный индекс (например, от
+        # прежней версии, писавшей его на месте) строится заново
+        return (magic == _INDEX_MAGIC and size == stat.st_size and mtime == stat.st_mtime_ns
+                and index_size == _INDEX_HEADER.size + _INDEX_ENTRY_SIZE * count)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(self._count))]
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError("Номер слова вне словаря")
+        start = self._offsets[2 * position]
+        end = self._offsets[2 * position + 1]
+        return self._data[start:end].decode("utf-8")
+
+    def __iter__(self):
+        for position in range(self._count):
+            yield self[position]
+
+    def __reduce__(self):
+        # В другом процессе словарь открывается заново по тем же путям
+        return MappedWordList, (self.path, self.index_path)
+
+    def close(self):
+        """
+        Освобождение отображений файлов.
+        """
+        self._offsets.release()
+        self._index_map.close()
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,531 @@
+"""
+Экспорт сгенерированных наборов данных: текст, JSON Lines, CSV и
+двоичный колоночный формат.
+
+Данные приходят порциями по колонкам (список значений на колонку, все
+значения - строки) и пишутся потоком: каждая порция собирается в один
+буфер и уходит одним вызовом write в буферизованный файл, при желании
+через сжатие gzip, bz2 или xz. Формат и сжатие можно определить по
+расширению файла (format_for_path).
+
+Колоночный формат (.rwgc) - заголовок с именами колонок и
+последовательность групп строк:
+
+    заголовок: сигнатура RWGCOL1\\0, число колонок (u32), для каждой
+               колонки длина имени (u16) и имя в UTF-8; выравнивание до 8
+    группа:    число строк n (u32), размер тела группы (u64), затем для
+               каждой колонки n + 1 смещений (u32, от начала данных
+               колонки) и данные - значения UTF-8 подряд без
+               разделителей; выравнивание до 4
+
+Все числа little-endian. Длина значения - разность соседних смещений,
+поэтому ColumnarFile отдает значения срезами memoryview прямо из mmap
+без копирования. Группы не зависят друг от друга, поэтому файл можно
+дописывать, а писатель держит в памяти только текущую порцию.
+"""
+import codecs
+import io
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+
+from .batch import WordBatch
+# Форматы и расширения описаны в stream, чтобы командная строка читала
+# их, не загружая этот модуль; здесь они доступны под прежними именами
+from .stream import (BUFFER_SIZE, COMPRESSION_SUFFIXES, COMPRESSIONS,  # noqa: F401
+                     FORMAT_SUFFIXES, FORMATS, StreamStats, format_for_path)
+
+DEFAULT_COLUMNS = ('value',)
+GZIP_LEVEL = 1
+
+_MAGIC = b"RWGCOL1\0"
+_FILE_HEADER = struct.Struct("<8sI")
+_NAME_SIZE = struct.Struct("<H")
+_GROUP_HEADER = struct.Struct("<IQ")
+_OFFSET_LIMIT = 1 << 32
+_COLUMN_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\Z")
+
+
+def _open_compressed(path, mode, compression):
+    """
+    Файл со сжатием (модули сжатия загружаются только здесь).
+    """
+    if compression == 'gzip':
+        import gzip
+        # Самый быстрый уровень: на случайных словах файл всего на ~10% больше,
+        # чем на уровне 9 по умолчанию, а запись в несколько раз быстрее
+        return gzip.open(path, mode, compresslevel=GZIP_LEVEL)
+    if compression == 'bz2':
+        import bz2
+        return bz2.open(path, mode)
+    if compression == 'xz':
+        import lzma
+        return lzma.open(path, mode)
+    raise ValueError(f"Неизвестное сжатие: {compression}")
+
+
+def _check_columns(columns):
+    columns = tuple(columns)
+    if not columns:
+        raise ValueError("Нужна хотя бы одна колонка")
+    for name in columns:
+        if not _COLUMN_NAME.match(name):
+            raise ValueError(f"Недопустимое имя колонки: {name!r}")
+    if len(set(columns)) != len(columns):
+        raise ValueError("Имена колонок повторяются")
+    return columns
+
+
+class _Writer:
+    """
+    Общая часть писателей: бинарный поток, счетчики строк и байтов.
+    """
+    def __init__(self, stream, columns):
+        self.stream = stream
+        self.columns = _check_columns(columns)
+        self.rows = 0
+        self.bytes = 0
+
+    def write_rows(self, values):
+        """
+        Запись порции: по списку значений на каждую колонку.
+        """
+        if len(values) != len(self.columns):
+            raise ValueError(f"Ожидается колонок: {len(self.columns)}")
+        count = len(values[0])
+        if any(len(column) != count for column in values):
+            raise ValueError("Колонки порции разной длины")
+        if count:
+            self._write(values, count)
+            self.rows += count
+
+    def write_chunks(self, chunks):
+        """
+        Запись порций одной колонки (например, из iter_random_words).
+        """
+        for chunk in chunks:
+            self.write_rows((chunk,))
+
+    def _emit(self, data):
+        self.stream.write(data)
+        self.bytes += len(data)
+
+
+class TextWriter(_Writer):
+    """
+    Текст: значения колонок через табуляцию, строка на запись.
+    """
+    def _write(self, values, count):
+        if len(values) == 1 and isinstance(values[0], WordBatch):
+            # Буфер пакета уже в виде строк текста
+            self._emit(values[0].buffer)
+            return
+        if len(values) == 1:
+            text = "\n".join(values[0])
+        else:
+            text = "\n".join(map("\t".join, zip(*values)))
+        self._emit((text + "\n").encode("utf-8"))
+
+
+class JsonLinesWriter(_Writer):
+    """
+    JSON Lines: объект {"колонка": "значение", ...} на строку.
+    """
+    def __init__(self, stream, columns):
+        # json и csv загружаются только писателями своих форматов: модуль
+        # импортируется командной строкой при каждом запуске
+        import json
+
+        super().__init__(stream, columns)
+        self._encode = json.JSONEncoder(ensure_ascii=False).encode
+        keys = [json.dumps(name) + ": " for name in self.columns]
+        self._prefix = "{" + keys[0] + '"'
+        self._template = "{{" + ", ".join(key + '"{}"' for key in keys) + "}}\n"
+
+    def _write(self, values, count):
+        joined = "".join(map("".join, values))
+        if '"' not in joined and "\\" not in joined and joined.isprintable():
+            # Ни одно значение не требует экранирования (управляющие символы
+            # не проходят isprintable)
+            if len(values) == 1:
+                separator = '"}\n' + self._prefix
+                text = self._prefix + separator.join(values[0]) + '"}\n'
+            else:
+                text = "".join(map(self._template.format, *values))
+        else:
+            text = "".join(self._encode(dict(zip(self.columns, row))) + "\n" for row in zip(*values))
+        self._emit(text.encode("utf-8"))
+
+
+class CsvWriter(_Writer):
+    """
+    CSV (RFC 4180, конец строки \\n) со строкой заголовка из имен колонок.
+
+    header=False - без заголовка (при дописывании в существующий файл).
+    """
+    def __init__(self, stream, columns, header=True):
+        import csv
+
+        super().__init__(stream, columns)
+        self._buffer = io.StringIO()
+        self._csv = csv.writer(self._buffer, lineterminator="\n")
+        if header:
+            self._csv.writerow(self.columns)
+            self._flush_buffer()
+
+    def _write(self, values, count):
+        if len(values) == 1 and all(values[0]):
+            text = "\n".join(values[0]) + "\n"
+            # Кавычки не нужны: пустых значений нет, а переводы строк - только
+            # между значениями
+            if ('"' not in text and "," not in text and "\r" not in text
+                    and text.count("\n") == count):
+                self._emit(text.encode("utf-8"))
+                return
+        self._csv.writerows(zip(*values))
+        self._flush_buffer()
+
+    def _flush_buffer(self):
+        self._emit(self._buffer.getvalue().encode("utf-8"))
+        self._buffer.seek(0)
+        self._buffer.truncate()
+
+
+class ColumnarWriter(_Writer):
+    """
+    Двоичный колоночный формат: группа строк на каждую порцию.
+
+    header=False - без заголовка (при дописывании в существующий файл).
+    """
+    def __init__(self, stream, columns, header=True):
+        super().__init__(stream, columns)
+        if header:
+            self._emit(_columnar_header(self.columns))
+
+    def _write(self, values, count):
+        parts = []
+        for column in values:
+            joined = "".join(column)
+            data = joined.encode("utf-8")
+            if len(data) >= _OFFSET_LIMIT:
+                raise ValueError("Данные колонки в одной порции не должны превышать 4 ГБ")
+            if not joined.isascii():
+                parts.append(_offsets_bytes(accumulate(_byte_lengths(column, count), initial=0)))
+            elif len(data) % count == 0 and max(map(len, column)) == len(data) // count:
+                # ASCII, все значения одной длины (сумма длин равна n * максимум):
+                # смещения те же, что у прошлых порций того же размера
+                parts.append(_fixed_offsets(len(data) // count, count))
+            else:
+                # Для ASCII длина в байтах равна числу символов
+                parts.append(_offsets_bytes(accumulate(map(len, column), initial=0)))
+            parts.append(data)
+            parts.append(b"\0" * (-len(data) % 4))
+        # Части пишутся по отдельности: буферизованный поток их все равно
+        # копирует, склеивание было бы лишней копией порции
+        self._emit(_GROUP_HEADER.pack(count, sum(map(len, parts))))
+        for part in parts:
+            self._emit(part)
+
+
+def _byte_lengths(column, count):
+    """
+    Длины значений в байтах UTF-8.
+
+    Если значения часто повторяются (имена, словосочетания), каждое
+    различное значение кодируется один раз.
+    """
+    distinct = set(column)
+    if len(distinct) * 4 <= count:
+        sizes = {value: len(value.encode("utf-8")) for value in distinct}
+        return map(sizes.__getitem__, column)
+    return map(len, map(str.encode, column))
+
+
+def _offsets_bytes(offsets):
+    offsets = array("I", offsets)
+    if sys.byteorder == "big":
+        offsets.byteswap()
+    return offsets.tobytes()
+
+
+@lru_cache(maxsize=16)
+def _fixed_offsets(length, count):
+    """
+    Смещения порции из count значений длины length.
+    """
+    return _offsets_bytes(range(0, length * (count + 1), length) if length else [0] * (count + 1))
+
+
+def _columnar_header(columns):
+    parts = [_FILE_HEADER.pack(_MAGIC, len(columns))]
+    for name in columns:
+        encoded = name.encode("utf-8")
+        parts.append(_NAME_SIZE.pack(len(encoded)) + encoded)
+    header = b"".join(parts)
+    return header + b"\0" * (-len(header) % 8)
+
+
+_WRITERS = {
+    'text': TextWriter,
+    'jsonl': JsonLinesWriter,
+    'csv': CsvWriter,
+    'columnar': ColumnarWriter,
+}
+
+
+def open_writer(stream, format, columns=DEFAULT_COLUMNS, header=True):
+    """
+    Писатель формата format поверх бинарного потока stream.
+
+    header относится к CSV и колоночному формату: заголовок пишется
+    только в начало нового файла.
+    """
+    if format not in _WRITERS:
+        raise ValueError(f"Неизвестный формат: {format}")
+    if format in ('csv', 'columnar'):
+        return _WRITERS[format](stream, columns, header)
+    return _WRITERS[format](stream, columns)
+
+
+class Exporter:
+    """
+    Экспорт в файл по пути path или в stdout (path None или "-").
+
+    format и compression по умолчанию определяются по расширению.
+    append=True дописывает в существующий файл; заголовок CSV и
+    колоночного формата пишется, только если файл пуст. Используется
+    как контекстный менеджер; stats - итоги записи.
+    """
+    def __init__(self, path=None, format=None, columns=DEFAULT_COLUMNS, compression=None,
+                 append=False, buffer_size=BUFFER_SIZE):
+        guessed_format, guessed_compression = format_for_path(path)
+        self.format = format or guessed_format
+        self.compression = compression or guessed_compression
+        if self.format not in FORMATS:
+            raise ValueError(f"Неизвестный формат: {self.format}")
+        if self.compression not in (None, *COMPRESSIONS):
+            raise ValueError(f"Неизвестное сжатие: {self.compression}")
+        self.path = path
+        to_stdout = path is None or path == "-"
+        header = not (append and not to_stdout and os.path.exists(path)
+                      and os.path.getsize(path) > 0)
+        if to_stdout:
+            self._file = None
+            stream = sys.stdout.buffer
+            if self.compression is not None:
+                raise ValueError("Сжатие доступно только при записи в файл")
+        elif self.compression is not None:
+            stream = self._file = _open_compressed(path, "ab" if append else "wb",
+                                                   self.compression)
+        else:
+            stream = self._file = open(path, "ab" if append else "wb", buffering=buffer_size)
+        if not header and self.format == 'columnar':
+            _check_existing_columns(path, self.compression, _check_columns(columns))
+        self.writer = open_writer(stream, self.format, columns, header)
+        self._start = time.perf_counter()
+
+    def write_rows(self, values):
+        self.writer.write_rows(values)
+
+    def write_chunks(self, chunks):
+        self.writer.write_chunks(chunks)
+
+    @property
+    def stats(self):
+        """
+        Итоги записи: строки, байты до сжатия и время.
+        """
+        return StreamStats(self.writer.rows, self.writer.bytes, time.perf_counter() - self._start)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        else:
+            self.writer.stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _check_existing_columns(path, compression, columns):
+    with ColumnarFile(path, compression) as existing:
+        if existing.columns != columns:
+            raise ValueError(f"Колонки файла {path} ({', '.join(existing.columns)}) "
+                             f"не совпадают с записываемыми")
+
+
+def export_chunks(chunks, path=None, format=None, compression=None, column=DEFAULT_COLUMNS[0]):
+    """
+    Потоковая запись порций одной колонки; возвращает StreamStats.
+    """
+    with Exporter(path, format, (column,), compression) as exporter:
+        exporter.write_chunks(chunks)
+    return exporter.stats
+
+
+class StringColumn:
+    """
+    Колонка колоночного файла: последовательность строк с доступом по
+    номеру через поиск группы и два чтения смещений.
+
+    raw(i) - значение как memoryview на байты UTF-8 в отображении файла
+    (без копирования и декодирования).
+    """
+    def __init__(self, name, starts, groups):
+        self.name = name
+        # Первые номера строк групп и (смещения, данные) колонки в каждой группе
+        self._starts = starts
+        self._groups = groups
+        self._count = starts[-1] if starts else 0
+
+    def __len__(self):
+        return self._count
+
+    def raw(self, position):
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError("Номер строки вне колонки")
+        group = bisect_right(self._starts, position) - 1
+        offsets, data = self._groups[group]
+        position -= self._starts[group]
+        return data[offsets[position]:offsets[position + 1]]
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(self._count))]
+        return codecs.utf_8_decode(self.raw(position))[0]
+
+    def __iter__(self):
+        for offsets, data in self._groups:
+            decoded = bytes(data).decode("utf-8")
+            if decoded.isascii():
+                # Смещения в байтах совпадают с позициями символов
+                yield from map(decoded.__getitem__, map(slice, offsets, offsets[1:]))
+            else:
+                for start, end in zip(offsets, offsets[1:]):
+                    yield codecs.utf_8_decode(data[start:end])[0]
+
+    def chunks(self):
+        """
+        Значения по группам строк: список строк на группу.
+        """
+        for offsets, data in self._groups:
+            yield [codecs.utf_8_decode(data[start:end])[0]
+                   for start, end in zip(offsets, offsets[1:])]
+
+
+class ColumnarFile:
+    """
+    Чтение колоночного файла через mmap: columns - имена колонок,
+    column(name) или file[name] - StringColumn.
+
+    Сжатый файл (compression или расширение .gz/.bz2/.xz) распаковывается
+    в память целиком, без отображения.
+    """
+    def __init__(self, path, compression=None):
+        self.path = path
+        compression = compression or format_for_path(path)[1]
+        self._map = None
+        if compression is not None:
+            with _open_compressed(path, "rb", compression) as file:
+                data = file.read()
+        else:
+            with open(path, "rb") as file:
+                size = os.fstat(file.fileno()).st_size
+                data = self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) \
+                    if size else b""
+        self._view = memoryview(data)
+        self.columns, position = self._read_header()
+        self.rows = 0
+        starts = [0]
+        groups = [[] for _ in self.columns]
+        while position < len(self._view):
+            if position + _GROUP_HEADER.size > len(self._view):
+                raise ValueError(f"Файл {path} обрезан")
+            count, size = _GROUP_HEADER.unpack_from(self._view, position)
+            position += _GROUP_HEADER.size
+            end = position + size
+            if end > len(self._view):
+                raise ValueError(f"Файл {path} обрезан")
+            for column in groups:
+                offsets = self._offsets(position, count + 1)
+                position += 4 * (count + 1)
+                data_size = offsets[count]
+                column.append((offsets, self._view[position:position + data_size]))
+                position += data_size + (-data_size % 4)
+            if position != end:
+                raise ValueError(f"Файл {path} поврежден")
+            self.rows += count
+            starts.append(self.rows)
+        self._columns = {name: StringColumn(name, starts, column_groups)
+                         for name, column_groups in zip(self.columns, groups)}
+
+    def _read_header(self):
+        view = self._view
+        if len(view) < _FILE_HEADER.size:
+            raise ValueError(f"Файл {self.path} не является колоночным файлом rwg")
+        magic, count = _FILE_HEADER.unpack_from(view)
+        if magic != _MAGIC:
+            raise ValueError(f"Файл {self.path} не является колоночным файлом rwg")
+        position = _FILE_HEADER.size
+        names = []
+        for _ in range(count):
+            (size,) = _NAME_SIZE.unpack_from(view, position)
+            position += _NAME_SIZE.size
+            names.append(bytes(view[position:position + size]).decode("utf-8"))
+            position += size
+        return tuple(names), position + (-position % 8)
+
+    def _offsets(self, position, count):
+        view = self._view[position:position + 4 * count]
+        if len(view) < 4 * count:
+            raise ValueError(f"Файл {self.path} обрезан")
+        if sys.byteorder == "big":
+            offsets = array("I", view)
+            offsets.byteswap()
+            return offsets
+        return view.cast("I")
+
+    def column(self, name):
+        return self._columns[name]
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    def __len__(self):
+        return self.rows
+
+    def close(self):
+        """
+        Освобождение отображения файла.
+
+        Срезы raw, полученные из колонок, должны быть уже освобождены.
+        """
+        for column in self._columns.values():
+            for offsets, data in column._groups:
+                if isinstance(offsets, memoryview):
+                    offsets.release()
+                data.release()
+        self._columns = {}
+        self._view.release()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,393 @@
+"""
+Общие компоненты графического интерфейса на PyQt5.
+
+Модуль импортируется только GUI-скриптами; ядро rwg и командная строка
+работают без него.
+"""
+import sys
+import threading
+import time
+from bisect import bisect_right
+
+from PyQt5.QtCore import (QAbstractListModel, QModelIndex, QObject, Qt, QThread, QTimer,
+                          pyqtSignal)
+from PyQt5.QtGui import QFontDatabase
+from PyQt5.QtWidgets import (QApplication, QHBoxLayout, QLabel, QListView, QPlainTextEdit,
+                             QPushButton, QVBoxLayout, QWidget)
+
+from .batch import WordBatch
+
+# Размер порции для окна: обработка одной порции в потоке интерфейса
+# должна укладываться в один кадр (16 мс).
+GUI_CHUNK_SIZE = 2048
+
+# Сколько строк модель результата отдает представлению за один fetchMore.
+FETCH_SIZE = 1000
+
+# Запросы до стольких элементов окно берет из пула заранее
+# сгенерированных элементов (rwg.prefetch) без фонового потока.
+PREFETCH_LIMIT = 64
+
+# Аргумент командной строки GUI-скриптов, который включает замеры этапов
+# и окно диагностики
+DIAGNOSTICS_FLAG = "--diagnostics"
+
+# Постоянная история в rwg.history.DEFAULT_PATH; без флага история окна
+# хранится только до его закрытия
+HISTORY_FLAG = "--history"
+
+# Фильтры диалога экспорта истории: формат определяется по расширению
+# файла (rwg.export.format_for_path), к нему можно добавить .gz, .bz2, .xz
+EXPORT_FILTERS = ("Текст (*.txt);;JSON Lines (*.jsonl);;CSV (*.csv);;"
+                  "Колоночный формат rwg (*.rwgc);;Все файлы (*)")
+
+# Период обновления окна диагностики, мс
+DIAGNOSTICS_INTERVAL = 500
+
+# Запуск без заставки: окно создается сразу
+NO_SPLASH_FLAG = "--no-splash"
+
+# Печать времени до готовности окна и выход (для замеров запуска)
+MEASURE_STARTUP_FLAG = "--measure-startup"
+
+
+class GenerationTask(QObject):
+    """
+    Задача генерации, которая выполняется в фоновом потоке.
+
+    Порции элементов (списки или WordBatch) передаются в поток интерфейса
+    сигналом chunk_ready, отмена проверяется между порциями.
+    """
+    chunk_ready = pyqtSignal(object)
+    progress = pyqtSignal(int)
+    failed = pyqtSignal(str)
+    finished = pyqtSignal(bool)
+
+    def __init__(self, chunks, total):
+        super().__init__()
+        self.chunks = chunks
+        self.total = total
+        self._cancelled = threading.Event()
+
+    def run(self):
+        """
+        Перебор порций до конца или до отмены.
+        """
+        done = 0
+        try:
+            for chunk in self.chunks:
+                if self._cancelled.is_set():
+                    break
+                done += len(chunk)
+                self.chunk_ready.emit(chunk)
+                self.progress.emit(done * 100 // max(self.total, 1))
+        except Exception as e:
+            self.failed.emit(str(e))
+        self.finished.emit(self._cancelled.is_set())
+
+    def cancel(self):
+        """
+        Запрос отмены; задача остановится перед следующей порцией.
+        """
+        self._cancelled.set()
+
+
+class GenerationRunner(QObject):
+    """
+    Запуск GenerationTask в отдельном QThread.
+
+    Сигналы задачи пересылаются в поток интерфейса; finished(True)
+    означает, что генерация была отменена.
+    """
+    chunk_ready = pyqtSignal(object)
+    progress = pyqtSignal(int)
+    failed = pyqtSignal(str)
+    finished = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.thread = None
+        self.task = None
+
+    def is_running(self):
+        """
+        Выполняется ли сейчас генерация.
+        """
+        return self.thread is not None
+
+    def start(self, chunks, total):
+        """
+        Запуск генерации порций chunks, всего total элементов.
+        """
+        if self.is_running():
+            raise RuntimeError("Генерация уже выполняется")
+        self.thread = QThread()
+        self.task = GenerationTask(chunks, total)
+        self.task.moveToThread(self.thread)
+        self.thread.started.connect(self.task.run)
+        self.task.chunk_ready.connect(self.chunk_ready)
+        self.task.progress.connect(self.progress)
+        self.task.failed.connect(self.failed)
+        self.task.finished.connect(self._on_finished)
+        self.thread.start()
+
+    def cancel(self):
+        """
+        Отмена текущей генерации, если она выполняется.
+        """
+        if self.task is not None:
+            self.task.cancel()
+
+    def shutdown(self):
+        """
+        Отмена и ожидание завершения потока (при закрытии окна).
+        """
+        if self.is_running():
+            self.task.cancel()
+            self.thread.quit()
+            self.thread.wait()
+
+    def _on_finished(self, cancelled):
+        self.thread.quit()
+        self.thread.wait()
+        self.task.deleteLater()
+        self.thread.deleteLater()
+        self.thread = None
+        self.task = None
+        self.finished.emit(cancelled)
+
+
+def iter_startup_stages(stages, timings):
+    """
+    Выполнение этапов загрузки (название, функция) по одному.
+
+    После каждого этапа выдается порция из его названия, поэтому этапы
+    можно выполнить в фоне через GenerationRunner: индикатор выполнения
+    показывает долю пройденных этапов. Время этапов добавляется в timings.
+    """
+    for title, function in stages:
+        start = time.perf_counter()
+        function()
+        timings.append((title, time.perf_counter() - start))
+        yield [title]
+
+
+def report_startup(started, timings=()):
+    """
+    Печать времени до готовности окна и выход из приложения.
+
+    Вызывается после show окна: время считается в первой итерации цикла
+    событий, когда окно уже может отвечать на ввод. started - значение
+    time.perf_counter() в начале скрипта.
+    """
+    def report():
+        ready = (time.perf_counter() - started) * 1000
+        stages = ", ".join(f"{title} {seconds * 1000:.1f} мс" for title, seconds in timings)
+        print(f"ready {ready:.1f} ms", flush=True)
+        if stages:
+            print(f"этапы: {stages}", file=sys.stderr, flush=True)
+        QApplication.quit()
+    QTimer.singleShot(0, report)
+
+
+class ResultListModel(QAbstractListModel):
+    """
+    Ленивая модель списка результатов.
+
+    Порции элементов хранятся компактно, пакетами batch.WordBatch (строка
+    Python создается только для видимой строки списка), а представлению
+    отдаются порциями по FETCH_SIZE строк через canFetchMore/fetchMore,
+    поэтому открытие результата любой длины занимает постоянное время.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._batches = []
+        # Номер первого элемента каждого пакета и общее количество
+        self._starts = []
+        self._count = 0
+        self._loaded = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._loaded
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            row = index.row()
+            batch = bisect_right(self._starts, row) - 1
+            return self._batches[batch][row - self._starts[batch]]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < self._count
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(FETCH_SIZE, self._count - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def clear(self):
+        """
+        Очистка модели.
+        """
+        self.beginResetModel()
+        self._batches = []
+        self._starts = []
+        self._count = 0
+        self._loaded = 0
+        self.endResetModel()
+
+    def append_items(self, items):
+        """
+        Добавление элементов (список строк или WordBatch); видимыми сразу
+        становится только первая страница.
+        """
+        if not isinstance(items, WordBatch):
+            items = WordBatch.from_strings(items)
+        if not items:
+            return
+        self._batches.append(items)
+        self._starts.append(self._count)
+        self._count += len(items)
+        if self._loaded < FETCH_SIZE:
+            self.fetchMore()
+
+    def items(self):
+        """
+        Все элементы, включая еще не показанные, одним WordBatch.
+        """
+        if len(self._batches) > 1:
+            # Склейка один раз: дальше модель держит один буфер
+            self._batches = [WordBatch.concat(self._batches)]
+            self._starts = [0]
+        return self._batches[0] if self._batches else WordBatch.from_strings([])
+
+
+class ResultView(QWidget):
+    """
+    Панель результата: заголовок и виртуализированный список элементов.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.header = QLabel()
+        self.model = ResultListModel(self)
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setSelectionMode(QListView.ExtendedSelection)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.header)
+        layout.addWidget(self.list_view)
+        self.setLayout(layout)
+
+    def clear(self, header=""):
+        """
+        Очистка списка и установка заголовка.
+        """
+        self.model.clear()
+        self.header.setText(header)
+
+    def set_header(self, header):
+        """
+        Установка заголовка без изменения списка.
+        """
+        self.header.setText(header)
+
+    def append_items(self, items):
+        """
+        Добавление порции элементов.
+        """
+        self.model.append_items(items)
+
+    def items(self):
+        """
+        Все элементы результата (WordBatch).
+        """
+        return self.model.items()
+
+    def copy_to_clipboard(self):
+        """
+        Копирование всего результата (по одному элементу на строку).
+        """
+        QApplication.clipboard().setText(self.model.items().text())
+
+
+def enable_diagnostics(window_class):
+    """
+    Включение замеров этапов ядра, обработчика generate_words окна
+    window_class и вывода результата; возвращает профилировщик.
+
+    Вызывается до создания окна, чтобы сигналы кнопок подключились уже к
+    замеряемому обработчику. Обертка пробы принимает любые аргументы,
+    поэтому окно подключает generate_words через lambda без аргументов:
+    иначе PyQt5 передал бы ей checked сигнала clicked. Без этого вызова
+    пробы не подменяются и замеры ничего не стоят.
+    """
+    from .profiling import default_profiler
+
+    profiler = default_profiler()
+    profiler.add_probe(f"gui.{window_class.__name__}.generate_words",
+                       window_class, "generate_words")
+    profiler.add_probe("gui.GenerationTask.run", GenerationTask, "run")
+    profiler.add_probe("gui.ResultView.append_items", ResultView, "append_items")
+    profiler.add_probe("gui.ResultListModel.fetchMore", ResultListModel, "fetchMore")
+    profiler.add_probe("gui.ResultListModel.data", ResultListModel, "data")
+    profiler.enable()
+    return profiler
+
+
+class DiagnosticsPanel(QWidget):
+    """
+    Окно диагностики: таблица этапов профилировщика, обновляется по таймеру.
+    """
+    def __init__(self, profiler, interval=DIAGNOSTICS_INTERVAL, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Диагностика генерации")
+        self.resize(900, 400)
+        self.profiler = profiler
+
+        self.table = QPlainTextEdit()
+        self.table.setReadOnly(True)
+        self.table.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.table.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+
+        reset_button = QPushButton("Сбросить")
+        reset_button.clicked.connect(self.reset)
+        copy_button = QPushButton("Копировать")
+        copy_button.clicked.connect(
+            lambda: QApplication.clipboard().setText(self.table.toPlainText()))
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(reset_button)
+        buttons.addWidget(copy_button)
+        buttons.addStretch()
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.table)
+        layout.addLayout(buttons)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(interval)
+        self.refresh()
+
+    def refresh(self):
+        """
+        Обновление таблицы, если окно видно.
+        """
+        if self.isVisible():
+            self.table.setPlainText(self.profiler.summary())
+
+    def reset(self):
+        """
+        Обнуление счетчиков.
+        """
+        self.profiler.reset()
+        self.refresh()
@@ -0,0 +1,251 @@
+"""
+История генерации на диске с ограниченным кэшем в памяти.
+
+Записи хранятся в журнале SQLite (только добавление), в памяти держатся
+не больше max_in_memory последних использованных записей (LRU). По
+умолчанию журнал - временный файл сессии, который удаляется при
+закрытии; постоянная история (DEFAULT_PATH или свой путь) включается
+явно. Запись идет в фоновом потоке, поэтому add не задерживает окно даже
+для миллиона элементов; чтение и экспорт сначала дожидаются записи.
+
+Экспорт в текстовый файл инкрементальный: для каждого файла запоминаются
+номер последней выгруженной записи и размер файла после выгрузки, и
+дописываются только новые записи, в UTF-8. Хвост, оставшийся от
+прерванной выгрузки, перед повтором обрезается, поэтому записи не
+дублируются. Кроме текста история выгружается в JSON Lines, CSV и
+колоночный формат rwg.export (строка на каждый элемент записи).
+"""
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from .batch import WordBatch
+from .export import Exporter, format_for_path
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".rwg_history.sqlite3")
+DEFAULT_EXPORT_PATH = "history.txt"
+MAX_IN_MEMORY = 50
+PAGE_SIZE = 50
+# Колонки структурного экспорта и размер порции строк при записи
+EXPORT_COLUMNS = ("id", "created", "header", "value")
+EXPORT_BATCH = 65536
+
+HistoryEntry = namedtuple("HistoryEntry", "id created header items")
+
+
+class HistoryStore:
+    """
+    Журнал истории генерации с LRU-кэшем и постраничным чтением.
+
+    path=None - временный журнал сессии (удаляется в close), иначе файл
+    постоянной истории, например DEFAULT_PATH.
+    """
+    def __init__(self, path=None, max_in_memory=MAX_IN_MEMORY):
+        if max_in_memory < 0:
+            raise ValueError("Размер кэша не может быть отрицательным")
+        self._temporary = path is None
+        if self._temporary:
+            descriptor, path = tempfile.mkstemp(prefix="rwg_history_", suffix=".sqlite3")
+            os.close(descriptor)
+        self.path = path
+        self.max_in_memory = max_in_memory
+        self._cache = OrderedDict()
+        # Соединение общее с потоком записи; обращения к нему - под замком
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._pending = queue.Queue()
+        self._error = None
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created REAL NOT NULL,
+                header TEXT NOT NULL,
+                items TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS exports (
+                path TEXT PRIMARY KEY,
+                last_id INTEGER NOT NULL,
+                size INTEGER
+            );
+        """)
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(exports)")]
+        if "size" not in columns:
+            # Журнал прежней версии: размер файла после выгрузки не хранился
+            self._db.execute("ALTER TABLE exports ADD COLUMN size INTEGER")
+        self._writer = threading.Thread(target=self._write_pending, name="rwg-history",
+                                        daemon=True)
+        self._writer.start()
+
+    def __len__(self):
+        self.flush()
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def add(self, header, items):
+        """
+        Добавление записи: заголовок и список (или batch.WordBatch)
+        сгенерированных элементов.
+
+        Запись уходит на диск в фоновом потоке и в кэш не попадает; items
+        после вызова не должен меняться.
+        """
+        self._pending.put((time.time(), header, items))
+
+    def flush(self):
+        """
+        Ожидание записи всех добавленных записей; ошибка записи
+        (например, переполненный диск) поднимается здесь.
+        """
+        self._pending.join()
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def get(self, entry_id):
+        """
+        Запись по номеру: из кэша или с диска.
+        """
+        entry = self._cache.get(entry_id)
+        if entry is not None:
+            self._cache.move_to_end(entry_id)
+            return entry
+        self.flush()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, created, header, items FROM history WHERE id = ?",
+                (entry_id,)).fetchone()
+        if row is None:
+            raise KeyError(entry_id)
+        entry = self._entry_from_row(row)
+        self._remember(entry)
+        return entry
+
+    def page(self, after_id=0, limit=PAGE_SIZE):
+        """
+        Страница записей с номерами больше after_id (по возрастанию).
+
+        Следующую страницу можно получить, передав номер последней записи.
+        """
+        self.flush()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, created, header, items FROM history WHERE id > ? ORDER BY id LIMIT ?",
+                (after_id, limit)).fetchall()
+        return [self._entry_from_row(row) for row in rows]
+
+    def export(self, path=DEFAULT_EXPORT_PATH, format=None, compression=None):
+        """
+        Дописывание в файл path записей, которые еще не были в него выгружены.
+
+        format ('text', 'jsonl', 'csv', 'columnar') и compression по
+        умолчанию определяются по расширению (см. rwg.export). В структурных
+        форматах каждый элемент - отдельная строка с колонками EXPORT_COLUMNS;
+        запись без элементов дает одну строку с пустым значением.
+        Если файла больше нет, он создается заново со всей историей. Если
+        файл длиннее, чем после прошлой выгрузки (она прервалась), лишний
+        хвост обрезается и записи выгружаются заново, без дублей.
+        Возвращает количество выгруженных записей.
+        """
+        self.flush()
+        key = os.path.abspath(path)
+        guessed_format, guessed_compression = format_for_path(path)
+        format = format or guessed_format
+        compression = compression or guessed_compression
+        with self._lock:
+            row = self._db.execute("SELECT last_id, size FROM exports WHERE path = ?",
+                                   (key,)).fetchone()
+            if row and os.path.exists(path):
+                last_id, size = row
+                if size is not None and os.path.getsize(path) > size:
+                    os.truncate(path, size)
+            else:
+                # Начальное состояние запоминается до записи, чтобы повтор
+                # после сбоя обрезал файл до него
+                last_id = 0
+                size = os.path.getsize(path) if os.path.exists(path) else 0
+                with self._db:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO exports (path, last_id, size) VALUES (?, ?, ?)",
+                        (key, last_id, size))
+            exported = 0
+            rows = self._db.execute(
+                "SELECT id, created, header, items FROM history WHERE id > ? ORDER BY id",
+                (last_id,))
+            if format == 'text' and compression is None:
+                with open(path, "a", encoding="utf-8") as file:
+                    for entry_id, _, header, items in rows:
+                        file.write(f"{header}\n{items}\n" if items else f"{header}\n")
+                        last_id = entry_id
+                        exported += 1
+            else:
+                with Exporter(path, format, EXPORT_COLUMNS, compression,
+                              append=True) as exporter:
+                    columns = ([], [], [], [])
+                    for entry_id, created, header, items in rows:
+                        values = items.split("\n") if items else [""]
+                        count = len(values)
+                        columns[0].extend([str(entry_id)] * count)
+                        columns[1].extend([time.strftime("%Y-%m-%dT%H:%M:%S",
+                                                         time.localtime(created))] * count)
+                        columns[2].extend([header] * count)
+                        columns[3].extend(values)
+                        if len(columns[3]) >= EXPORT_BATCH:
+                            exporter.write_rows(columns)
+                            columns = ([], [], [], [])
+                        last_id = entry_id
+                        exported += 1
+                    exporter.write_rows(columns)
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO exports (path, last_id, size) VALUES (?, ?, ?)",
+                    (key, last_id, os.path.getsize(path)))
+        return exported
+
+    def close(self):
+        """
+        Закрытие журнала: ожидание записи, временный журнал сессии удаляется.
+        """
+        self._pending.put(None)
+        self._writer.join()
+        self._cache.clear()
+        self._db.close()
+        if self._temporary:
+            os.remove(self.path)
+
+    def _write_pending(self):
+        """
+        Поток записи: добавленные записи по очереди уходят в журнал.
+        """
+        while True:
+            record = self._pending.get()
+            try:
+                if record is None:
+                    return
+                created, header, items = record
+                # Склейка элементов тоже в этом потоке: для больших пакетов она заметна
+                text = items.text() if isinstance(items, WordBatch) else "\n".join(items)
+                with self._lock, self._db:
+                    self._db.execute(
+                        "INSERT INTO history (created, header, items) VALUES (?, ?, ?)",
+                        (created, header, text))
+            except Exception as e:
+                self._error = e
+            finally:
+                self._pending.task_done()
+
+    def _remember(self, entry):
+        if self.max_in_memory == 0:
+            return
+        self._cache[entry.id] = entry
+        self._cache.move_to_end(entry.id)
+        while len(self._cache) > self.max_in_memory:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _entry_from_row(row):
+        entry_id, created, header, items = row
+        return HistoryEntry(entry_id, created, header, items.split("\n") if items else [])
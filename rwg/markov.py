@@ -0,0 +1,311 @@
+"""
+Марковская модель слов: правдоподобные ("произносимые") слова по n-граммам
+букв из корпуса.
+
+Модель обучается один раз: состояние - последние order символов слова
+(в начале слова - символы-заполнители), для каждого состояния хранятся
+возможные следующие символы с накопленными вероятностями. Все таблицы
+лежат в плоских массивах array, а не в словарях строк:
+
+- offsets[s]:offsets[s + 1] - переходы состояния s;
+- symbols[i] - номер символа перехода (0 - конец слова);
+- bounds[i] - верхняя граница 32-битной "монетки" для перехода, то есть
+  накопленная вероятность, умноженная на 2**32;
+- targets[i] - номер состояния после перехода.
+
+Шаг генерации - одна монетка и bisect по отрезку bounds, монетки берутся
+большими буферами через random_bytes. Обученная модель сохраняется в
+двоичный файл: заголовок, алфавит и те же массивы подряд, поэтому
+загрузка - это чтение файла и array.frombytes без разбора.
+"""
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from itertools import chain
+
+from .core import random_bytes
+
+DEFAULT_ORDER = 3
+_MAGIC = b"RWGMKV1\0"
+# Заголовок файла: сигнатура, порядок, длина алфавита в байтах UTF-8,
+# количество состояний и переходов, длина самого длинного слова корпуса
+_HEADER = struct.Struct("<8sIIIII")
+# Заполнитель начала слова и конец слова в тексте корпуса при обучении
+_START = "\x00"
+_END = "\n"
+# Точность вероятностей перехода: монетка - 32-битное число
+_COIN_BITS = 32
+_COIN_SCALE = 1 << _COIN_BITS
+# Слова корпуса: последовательности букв без цифр и подчеркиваний
+_WORD_PATTERN = re.compile(r"[^\W\d_]+")
+# Сколько отброшенных слов (вне диапазона длин) допускается на одно
+# выданное, прежде чем генерация считается безнадежной
+MAX_REJECTIONS = 1000
+
+
+def _coin_stream(rng, size):
+    """
+    Бесконечный поток 32-битных монеток, которые берутся буферами по size.
+    """
+    def buffers():
+        while True:
+            coins = array("I")
+            coins.frombytes(random_bytes(rng, 4 * size))
+            yield coins
+    return chain.from_iterable(buffers()).__next__
+
+
+class MarkovModel:
+    """
+    Обученная марковская модель слов порядка order.
+
+    Создается через train/from_corpus или загружается из файла через load.
+    """
+    def __init__(self, order, alphabet, offsets, symbols, bounds, targets, longest):
+        self.order = order
+        # alphabet[0] - конец слова, остальные - символы по номерам
+        self.alphabet = alphabet
+        self.offsets = offsets
+        self.symbols = symbols
+        self.bounds = bounds
+        self.targets = targets
+        self.longest = longest
+        # Проверенные диапазоны длин, в которых модель может закончить слово
+        self._reachable = set()
+
+    @classmethod
+    def train(cls, words, order=DEFAULT_ORDER):
+        """
+        Обучение на последовательности слов.
+
+        Сначала считаются частоты слов (в реальном тексте слова
+        повторяются, и разных слов в десятки раз меньше). Разные слова
+        группируются по частоте; слова группы склеиваются в одну строку,
+        где каждое дополнено order заполнителями в начале и символом
+        конца, и n-граммы длины order + 1 считаются одним Counter по zip
+        сдвинутых строк, без цикла Python по символам. N-граммы через
+        границу слов (с концом слова не на последнем месте)
+        отбрасываются, остальные умножаются на частоту группы.
+        """
+        if order <= 0:
+            raise ValueError("Порядок модели должен быть положительным")
+        frequencies = Counter(words)
+        frequencies.pop("", None)
+        if not frequencies:
+            raise ValueError("Корпус пуст")
+        groups = defaultdict(list)
+        for word, frequency in frequencies.items():
+            groups[frequency].append(word)
+
+        padding = _START * order
+        transitions = defaultdict(Counter)
+        for frequency, group in groups.items():
+            text = padding + (_END + padding).join(group) + _END
+            if text.count(_END) != len(group) or text.count(_START) != order * len(group):
+                raise ValueError("Слова корпуса не могут содержать перевод строки и символ \\x00")
+            grams = Counter(zip(*[text[shift:] for shift in range(order + 1)]))
+            for gram, count in grams.items():
+                if _END not in gram[:-1]:
+                    transitions[gram[:-1]][gram[-1]] += count * frequency
+        return cls._compile(order, transitions, max(map(len, frequencies)))
+
+    @classmethod
+    def from_corpus(cls, path, order=DEFAULT_ORDER, encoding="utf-8"):
+        """
+        Обучение на текстовом файле: слова - последовательности букв,
+        приведенные к нижнему регистру.
+        """
+        with open(path, encoding=encoding) as file:
+            text = file.read().lower()
+        return cls.train(_WORD_PATTERN.findall(text), order)
+
+    @classmethod
+    def _compile(cls, order, transitions, longest):
+        """
+        Перевод счетчиков переходов в плоские массивы.
+
+        Состояния нумеруются обходом в ширину от начала слова, так что
+        в таблицы попадают только достижимые состояния.
+        """
+        letters = sorted({symbol for following in transitions.values()
+                          for symbol in following} - {_END})
+        alphabet = _END + "".join(letters)
+        numbers = {symbol: number for number, symbol in enumerate(alphabet)}
+
+        start = (_START,) * order
+        states = {start: 0}
+        queue = [start]
+        offsets = array("I", [0])
+        symbols = array("I")
+        bounds = array("I")
+        targets = array("I")
+        for state in queue:
+            following = sorted(transitions[state].items(), key=lambda item: numbers[item[0]])
+            total = sum(count for _, count in following)
+            cumulative = 0
+            for symbol, count in following:
+                cumulative += count
+                symbols.append(numbers[symbol])
+                # Граница - последняя монетка, которая еще выбирает этот
+                # переход; у последнего перехода всегда 2**32 - 1
+                bounds.append(cumulative * _COIN_SCALE // total - 1)
+                if symbol == _END:
+                    targets.append(0)
+                    continue
+                target = state[1:] + (symbol,)
+                if target not in states:
+                    states[target] = len(queue)
+                    queue.append(target)
+                targets.append(states[target])
+            offsets.append(len(symbols))
+        return cls(order, alphabet, offsets, symbols, bounds, targets, longest)
+
+    def __len__(self):
+        """
+        Количество состояний модели.
+        """
+        return len(self.offsets) - 1
+
+    def __repr__(self):
+        return (f"MarkovModel(order={self.order}, states={len(self)}, "
+                f"transitions={len(self.symbols)})")
+
+    def save(self, path):
+        """
+        Запись модели в двоичный файл.
+        """
+        encoded = self.alphabet.encode("utf-8")
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, self.order, len(encoded), len(self),
+                                    len(self.symbols), self.longest))
+            file.write(encoded)
+            for table in (self.offsets, self.symbols, self.bounds, self.targets):
+                if sys.byteorder == "big":
+                    table = array(table.typecode, table)
+                    table.byteswap()
+                table.tofile(file)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Загрузка модели, сохраненной через save.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"Файл {path} не является марковской моделью")
+        magic, order, alphabet_size, states, transitions, longest = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError(f"Файл {path} не является марковской моделью")
+        position = _HEADER.size
+        alphabet = data[position:position + alphabet_size].decode("utf-8")
+        position += alphabet_size
+        tables = []
+        for size in (states + 1, transitions, transitions, transitions):
+            table = array("I")
+            end = position + size * table.itemsize
+            if end > len(data):
+                raise ValueError(f"Файл модели {path} поврежден")
+            table.frombytes(data[position:end])
+            if sys.byteorder == "big":
+                table.byteswap()
+            tables.append(table)
+            position = end
+        return cls(order, alphabet, *tables, longest)
+
+    def length_range(self, min_length=1, max_length=None):
+        """
+        Проверенный диапазон длин слов (max_length по умолчанию - длина
+        самого длинного слова корпуса).
+        """
+        max_length = self.longest if max_length is None else max_length
+        if max_length <= 0 or min_length > max_length:
+            raise ValueError(f"Неверный диапазон длин слов: {min_length}-{max_length}")
+        if (min_length, max_length) not in self._reachable:
+            if not self._can_end_within(min_length, max_length):
+                raise ValueError(f"Модель не порождает слов длиной {min_length}-{max_length}")
+            self._reachable.add((min_length, max_length))
+        return min_length, max_length
+
+    def _can_end_within(self, min_length, max_length):
+        """
+        Есть ли путь от начала слова, который заканчивает слово длиной от
+        min_length до max_length.
+
+        Перебираются множества состояний после k символов; последовательность
+        множеств детерминирована, поэтому при повторе она периодична, и
+        оставшиеся длины проверяются одним периодом.
+        """
+        offsets, symbols, targets = self.offsets, self.symbols, self.targets
+        ends = set()
+        following = []
+        for state in range(len(self)):
+            span = range(offsets[state], offsets[state + 1])
+            if any(not symbols[i] for i in span):
+                ends.add(state)
+            following.append({targets[i] for i in span if symbols[i]})
+        frontier = frozenset((0,))
+        seen = {}
+        length = 0
+        while length <= max_length and frontier:
+            if length >= min_length and not frontier.isdisjoint(ends):
+                return True
+            if frontier in seen:
+                period = length - seen[frontier]
+                if length >= min_length + period:
+                    # Весь период уже проверен в диапазоне
+                    return False
+                if length < min_length:
+                    # Переход к той же фазе периода у min_length
+                    skipped = (min_length - length) // period * period
+                    length += skipped
+                    seen = {}
+                    continue
+            seen[frontier] = length
+            frontier = frozenset(chain.from_iterable(map(following.__getitem__, frontier)))
+            length += 1
+        return False
+
+    def generate(self, rng, count, min_length=1, max_length=None):
+        """
+        count слов длиной от min_length до max_length символов.
+
+        Слова вне диапазона отбрасываются и генерируются заново (не
+        больше MAX_REJECTIONS раз на слово, иначе ValueError); max_length
+        по умолчанию - длина самого длинного слова корпуса. Если модель
+        вообще не порождает слов такой длины, ValueError сразу.
+        """
+        min_length, max_length = self.length_range(min_length, max_length)
+        if count <= 0:
+            return []
+        # Монеток на слово нужно примерно столько, сколько в нем символов
+        # (плюс конец слова); остальные буферы подтягиваются по мере надобности
+        coin = _coin_stream(rng, max(count * (min(self.longest, max_length) // 2 + 1), 256))
+        offsets = self.offsets
+        symbols = self.symbols
+        bounds = self.bounds
+        targets = self.targets
+        alphabet = self.alphabet
+        words = []
+        rejections = 0
+        while len(words) < count:
+            state = 0
+            letters = []
+            while True:
+                position = bisect_left(bounds, coin(), offsets[state], offsets[state + 1] - 1)
+                symbol = symbols[position]
+                if not symbol or len(letters) == max_length:
+                    break
+                letters.append(alphabet[symbol])
+                state = targets[position]
+            if not symbol and len(letters) >= min_length:
+                words.append("".join(letters))
+                continue
+            rejections += 1
+            if rejections > MAX_REJECTIONS * count:
+                raise ValueError(f"Слова длиной {min_length}-{max_length} "
+                                 "слишком редки для этой модели")
+        return words
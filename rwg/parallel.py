@@ -0,0 +1,150 @@
+"""
+Параллельная генерация с воспроизводимыми потоками seed для каждой части.
+
+Запрос делится на части фиксированного размера. Часть с номером i всегда
+получает seed, выведенный из главного seed и номера i (по аналогии с
+numpy.random.SeedSequence.spawn), и собственный random.Random. Поэтому
+при одинаковых seed и размере части результат не зависит от количества
+процессов, а части собираются в исходном порядке.
+"""
+import os
+from collections import deque
+
+try:
+    # blake2b без hashlib: тот загружает OpenSSL (_hashlib), а это несколько
+    # миллисекунд на каждом запуске командной строки
+    from _blake2 import blake2b
+except ImportError:
+    from hashlib import blake2b
+
+from .alphabet import DEFAULT_ALPHABET
+from .backends import DEFAULT_BACKEND
+from .core import CHUNK_SIZE, RandomWordGenerator
+
+KINDS = ('words', 'phrases', 'names')
+
+
+class SeedSequence:
+    """
+    Дерево независимых seed: главный seed и путь spawn_key до потомка.
+    """
+    def __init__(self, entropy=None, spawn_key=()):
+        if entropy is None:
+            entropy = int.from_bytes(os.urandom(16), "little")
+        self.entropy = entropy
+        self.spawn_key = tuple(spawn_key)
+
+    def spawn(self, count, start=0):
+        """
+        Создание count дочерних последовательностей, начиная с номера start.
+        """
+        return [SeedSequence(self.entropy, self.spawn_key + (index,))
+                for index in range(start, start + count)]
+
+    def generate_state(self):
+        """
+        128-битное состояние для инициализации random.Random.
+        """
+        key = ":".join(str(part) for part in (self.entropy,) + self.spawn_key)
+        digest = blake2b(key.encode("ascii"), digest_size=16,
+                         person=b"rwg-seed-seq").digest()
+        return int.from_bytes(digest, "little")
+
+
+# Словари основного процесса в процессе пула (см. _start_worker)
+_worker_vocabulary = None
+
+
+def _start_worker(vocabulary):
+    """
+    Инициализация процесса пула: словари передаются один раз на процесс,
+    а не с каждой частью запроса.
+    """
+    global _worker_vocabulary
+    _worker_vocabulary = vocabulary
+
+
+def generate_shard(kind, size, length, state, backend=DEFAULT_BACKEND,
+                   alphabet=DEFAULT_ALPHABET, vocabulary=None):
+    """
+    Генерация одной части запроса собственным экземпляром генератора.
+
+    vocabulary - словари экземпляра; по умолчанию в процессе пула - словари
+    основного процесса (внешние словари открываются заново по своим путям),
+    иначе общие словари класса, которые здесь не меняются. state - seed
+    бэкенда; для 'secure' он равен None. alphabet - алфавит слов.
+    """
+    engine = RandomWordGenerator(backend, state, alphabet)
+    vocabulary = _worker_vocabulary if vocabulary is None else vocabulary
+    if vocabulary is not None:
+        engine.vocabulary = vocabulary
+    if kind == 'words':
+        return engine.generate_words_bulk(size, length)
+    if kind == 'phrases':
+        return engine.generate_random_phrase(size)
+    if kind == 'names':
+        return engine.generate_random_names(size)
+    raise ValueError(f"Неизвестный тип генерации: {kind}")
+
+
+def _shard_tasks(kind, count, length, seed, shard_size, backend=DEFAULT_BACKEND,
+                 alphabet=DEFAULT_ALPHABET):
+    """
+    Описания частей запроса: (тип, размер, длина, состояние генератора,
+    бэкенд, алфавит).
+    """
+    if shard_size <= 0:
+        raise ValueError("Размер части должен быть положительным")
+    if kind not in KINDS:
+        raise ValueError(f"Неизвестный тип генерации: {kind}")
+    root = seed if isinstance(seed, SeedSequence) else SeedSequence(seed)
+    shards = -(-count // shard_size) if count > 0 else 0
+    for index in range(shards):
+        size = min(shard_size, count - index * shard_size)
+        child = root.spawn(1, start=index)[0]
+        state = None if backend == 'secure' else child.generate_state()
+        yield kind, size, length, state, backend, alphabet
+
+
+def iter_parallel(kind, count, length=5, seed=None, workers=None, shard_size=CHUNK_SIZE,
+                  backend=DEFAULT_BACKEND, alphabet=DEFAULT_ALPHABET):
+    """
+    Ленивая параллельная генерация: части выдаются по порядку номеров.
+
+    Одновременно в работе не больше двух частей на процесс, поэтому
+    память не растет вместе с count. backend - имя источника случайности
+    (см. backends.BACKENDS); для 'secure' seed не действует. alphabet -
+    алфавит слов (см. alphabet.compile_alphabet).
+    """
+    tasks = _shard_tasks(kind, count, length, seed, shard_size, backend, alphabet)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for task in tasks:
+            yield generate_shard(*task)
+        return
+
+    # Пул процессов импортируется только при нескольких процессах:
+    # multiprocessing заметно замедляет запуск командной строки
+    from concurrent.futures import ProcessPoolExecutor
+    vocabulary = dict(RandomWordGenerator.vocabulary)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_start_worker,
+                             initargs=(vocabulary,)) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(generate_shard, *task))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def generate_parallel(kind, count, length=5, seed=None, workers=None, shard_size=CHUNK_SIZE,
+                      backend=DEFAULT_BACKEND, alphabet=DEFAULT_ALPHABET):
+    """
+    Параллельная генерация списка слов, словосочетаний или имен.
+    """
+    result = []
+    for shard in iter_parallel(kind, count, length, seed, workers, shard_size,
+                               backend, alphabet):
+        result.extend(shard)
+    return result
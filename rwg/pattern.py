@@ -0,0 +1,301 @@
+"""
+Шаблоны структурированных случайных строк: Cvc-####, {adj} {noun},
+{first} {last}@{word}.ru.
+
+Элементы шаблона:
+
+    C c     согласная латиницы (заглавная / строчная)
+    V v     гласная латиницы
+    L l     любая буква латиницы
+    #       цифра
+    [...]   символ из набора: [abc], диапазоны [a-f0-9]
+    [:имя:] символ встроенного алфавита, например [:cyrillic:] (см.
+            alphabet.ALPHABETS); внутри набора тоже: [[:cyrillic:]0-9]
+    {имя}   слово словаря: adj, noun, verb, first, last или полное имя
+            категории (adjectives, nouns, ...; см. core.DEFAULT_VOCABULARY)
+    {word}  случайное слово в алфавите генератора; {word:8} - длины 8,
+            {word:8:cyrillic} - в другом алфавите
+    {N}     после элемента - повтор элемента N раз: #{4} то же, что ####
+            (N не больше MAX_REPEAT)
+    \\x      символ x как есть
+
+Остальные символы выводятся как есть; буквы классов и скобки
+экранируются: \\c, \\{. Размер шаблона после повторов ограничен
+MAX_SIZE элементами (слово {word:N} считается за N), чтобы шаблон вроде
+#{1000000000} не строил план на миллиард элементов.
+
+Шаблон разбирается один раз (compile_pattern кэширует результат) в план:
+текст, выборки символов из скомпилированных алфавитов (соседние символы
+одного класса - одна выборка слова нужной длины) и выборки из словарей.
+План выполняется пакетом: каждый шаг дает колонку из count значений
+теми же пакетными путями, что и generate_words_bulk и словосочетания,
+а строки собираются одним ''.join на строку по колонкам и тексту шаблона.
+"""
+import string
+from functools import lru_cache
+from itertools import repeat
+
+from .alphabet import ALPHABETS, compile_alphabet
+from .core import DEFAULT_VOCABULARY, SMALL_BATCH, alphabet_words, pick, table_indices
+
+VOWELS = 'aeiou'
+CONSONANTS = ''.join(letter for letter in string.ascii_lowercase if letter not in VOWELS)
+
+# Классы символов шаблона
+CLASSES = {
+    'C': CONSONANTS.upper(),
+    'c': CONSONANTS,
+    'V': VOWELS.upper(),
+    'v': VOWELS,
+    'L': string.ascii_uppercase,
+    'l': string.ascii_lowercase,
+    '#': string.digits,
+}
+
+# Короткие имена категорий словаря
+CATEGORY_ALIASES = {
+    'adj': 'adjectives',
+    'noun': 'nouns',
+    'verb': 'verbs',
+    'first': 'first_names',
+    'last': 'last_names',
+}
+
+WORD_LENGTH = 5
+CACHE_SIZE = 256
+
+# Наибольший повтор {N} и размер шаблона после повторов
+MAX_REPEAT = 1000
+MAX_SIZE = 4096
+
+
+class Pattern:
+    """
+    Скомпилированный шаблон: исходная строка и план шагов.
+
+    Шаг - ('text', строка), ('chars', Alphabet, длина),
+    ('word', Alphabet или None, длина) или ('vocabulary', категория).
+    Алфавит None - алфавит генератора, словари берутся из генератора в
+    момент выполнения, поэтому замена словаря (use_vocabulary) не требует
+    новой компиляции.
+    """
+    def __init__(self, source, steps):
+        self.source = source
+        self.steps = tuple(steps)
+        self._random_steps = tuple(step for step in self.steps if step[0] != 'text')
+        self._needs_alphabet = any(step[0] == 'word' and step[1] is None for step in self.steps)
+
+    def __repr__(self):
+        return f"Pattern({self.source!r})"
+
+    def generate(self, rng, count, vocabulary=DEFAULT_VOCABULARY, alphabet=None):
+        """
+        Список из count строк по шаблону.
+
+        vocabulary - словари по категориям, alphabet - алфавит для {word}
+        без явного алфавита (по умолчанию латиница).
+        """
+        if count <= 0:
+            return []
+        if self._needs_alphabet:
+            alphabet = compile_alphabet() if alphabet is None else compile_alphabet(alphabet)
+        if count < SMALL_BATCH:
+            # Для нескольких строк подготовка пакетов дороже самих выборок
+            return [''.join([step[1] if step[0] == 'text' else
+                             self._draw_one(rng, step, vocabulary, alphabet)
+                             for step in self.steps])
+                    for _ in range(count)]
+        columns = [repeat(step[1]) if step[0] == 'text' else
+                   self._draw_column(rng, step, count, vocabulary, alphabet)
+                   for step in self.steps]
+        if len(columns) == 1:
+            return list(columns[0]) if self._random_steps else [self.steps[0][1]] * count
+        return list(map(''.join, zip(*columns)))
+
+    @staticmethod
+    def _draw_one(rng, step, vocabulary, alphabet):
+        kind = step[0]
+        if kind == 'vocabulary':
+            return pick(rng, vocabulary[step[1]])
+        alphabet = step[1] or alphabet
+        if step[2] == 1:
+            return rng.choice(alphabet.symbols)
+        return alphabet.word(rng, step[2])
+
+    @staticmethod
+    def _draw_column(rng, step, count, vocabulary, alphabet):
+        kind = step[0]
+        if kind == 'vocabulary':
+            table = vocabulary[step[1]]
+            return map(table.__getitem__, table_indices(rng, table, count))
+        return alphabet_words(rng, step[1] or alphabet, count, step[2])
+
+
+def _parse_named(source, start):
+    """
+    Встроенный алфавит [:имя:] с позиции start; возвращает символы и
+    позицию после него.
+    """
+    end = source.find(':]', start + 2)
+    if end < 0:
+        raise ValueError(f"Незакрытое имя алфавита в позиции {start}")
+    name = source[start + 2:end]
+    if name not in ALPHABETS:
+        raise ValueError(f"Неизвестный алфавит: {name}")
+    return ALPHABETS[name], end + 2
+
+
+def _parse_set(source, start):
+    """
+    Символы набора [...] с позиции start (после '['); возвращает строку
+    символов и позицию после ']'.
+    """
+    symbols = []
+    position = start
+    while True:
+        if position >= len(source):
+            raise ValueError(f"Незакрытый набор символов в позиции {start - 1}")
+        char = source[position]
+        if char == ']':
+            break
+        if source.startswith('[:', position):
+            named, position = _parse_named(source, position)
+            symbols.extend(named)
+            continue
+        if char == '\\':
+            position += 1
+            if position >= len(source):
+                raise ValueError("Шаблон заканчивается на \\")
+            char = source[position]
+        if (source[position + 1:position + 2] == '-'
+                and position + 2 < len(source) and source[position + 2] != ']'):
+            last = source[position + 2]
+            if last < char:
+                raise ValueError(f"Неверный диапазон {char}-{last} в позиции {position}")
+            symbols.extend(map(chr, range(ord(char), ord(last) + 1)))
+            position += 3
+            continue
+        symbols.append(char)
+        position += 1
+    if not symbols:
+        raise ValueError(f"Пустой набор символов в позиции {start - 1}")
+    # Повторы символов не меняют набор
+    return ''.join(dict.fromkeys(symbols)), position + 1
+
+
+def _parse_braces(content, position):
+    """
+    Элемент {…}: ('repeat', N), слово или категория словаря.
+    """
+    if content.isdigit():
+        return ('repeat', int(content))
+    name, *arguments = content.split(':')
+    if name == 'word':
+        if len(arguments) > 2:
+            raise ValueError(f"Лишние параметры {{{content}}} в позиции {position}")
+        length = WORD_LENGTH
+        if arguments and arguments[0]:
+            if not arguments[0].isdigit():
+                raise ValueError(f"Длина слова должна быть числом: {{{content}}}")
+            length = int(arguments[0])
+            if length > MAX_SIZE:
+                raise ValueError(f"Длина слова больше {MAX_SIZE}: {{{content}}}")
+        alphabet = compile_alphabet(arguments[1]) if len(arguments) == 2 else None
+        return ('word', alphabet, length)
+    category = CATEGORY_ALIASES.get(name, name)
+    if category not in DEFAULT_VOCABULARY or arguments:
+        raise ValueError(f"Неизвестный элемент {{{content}}} в позиции {position}")
+    return ('vocabulary', category)
+
+
+def _size(atom):
+    """
+    Вклад элемента в размер шаблона: длина слова или 1.
+    """
+    return atom[2] if atom[0] == 'word' else 1
+
+
+def parse(source):
+    """
+    Разбор шаблона в список элементов по одному символу или слову.
+    """
+    atoms = []
+    size = 0
+    position = 0
+    while position < len(source):
+        char = source[position]
+        if char == '\\':
+            if position + 1 >= len(source):
+                raise ValueError("Шаблон заканчивается на \\")
+            atoms.append(('text', source[position + 1]))
+            size += 1
+            position += 2
+        elif char == '[':
+            if source.startswith('[:', position):
+                symbols, position = _parse_named(source, position)
+            else:
+                symbols, position = _parse_set(source, position + 1)
+            atoms.append(('chars', compile_alphabet(symbols), 1))
+            size += 1
+        elif char == '{':
+            end = source.find('}', position)
+            if end < 0:
+                raise ValueError(f"Незакрытая скобка {{ в позиции {position}")
+            atom = _parse_braces(source[position + 1:end], position)
+            if atom[0] == 'repeat':
+                if not atoms:
+                    raise ValueError(f"Повтор без элемента в позиции {position}")
+                if atom[1] > MAX_REPEAT:
+                    raise ValueError(f"Повтор больше {MAX_REPEAT} в позиции {position}")
+                size += _size(atoms[-1]) * (atom[1] - 1)
+                atoms[-1:] = atoms[-1:] * atom[1]
+            else:
+                atoms.append(atom)
+                size += _size(atom)
+            position = end + 1
+        elif char in CLASSES:
+            atoms.append(('chars', compile_alphabet(CLASSES[char]), 1))
+            size += 1
+            position += 1
+        else:
+            atoms.append(('text', char))
+            size += 1
+            position += 1
+        if size > MAX_SIZE:
+            raise ValueError(f"Шаблон больше {MAX_SIZE} элементов после повторов "
+                             f"(позиция {position})")
+    return atoms
+
+
+def plan(atoms):
+    """
+    План выполнения: соседний текст склеивается, соседние символы одного
+    алфавита становятся одной выборкой слова.
+    """
+    steps = []
+    for atom in atoms:
+        previous = steps[-1] if steps else None
+        if previous is not None and atom[0] == previous[0] == 'text':
+            steps[-1] = ('text', previous[1] + atom[1])
+        elif previous is not None and atom[0] == previous[0] == 'chars' \
+                and atom[1] is previous[1]:
+            steps[-1] = ('chars', atom[1], previous[2] + atom[2])
+        else:
+            steps.append(atom)
+    return steps
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile(source):
+    if not source:
+        raise ValueError("Шаблон пуст")
+    return Pattern(source, plan(parse(source)))
+
+
+def compile_pattern(definition):
+    """
+    Скомпилированный шаблон по строке (с кэшем) или уже готовый Pattern.
+    """
+    if isinstance(definition, Pattern):
+        return definition
+    return _compile(definition)
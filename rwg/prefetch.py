@@ -0,0 +1,338 @@
+"""
+Пул заранее сгенерированных элементов для одиночных выборок с малой
+задержкой.
+
+Для каждого вида генерации (слова длины L в алфавите, словосочетания,
+имена) пул держит буфер collections.deque. Фоновый поток дополняет
+буфер пакетной генерацией до верхней границы (high_water), как только
+в нем остается меньше low_water элементов; выборка - это popleft из
+буфера. Если буфер пуст, элемент генерируется сразу (промах). Счетчики
+попаданий, промахов, пополнений и время выборки - в PrefetchPool.stats.
+
+Память пула ограничена: слова, для которых полный буфер занял бы больше
+MAX_BUFFER_CHARS символов, не буферизуются (генерируются сразу), а
+буферов не больше max_buffers - давно не использованные вытесняются.
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+
+from .alphabet import compile_alphabet
+from .core import RandomWordGenerator
+
+HIGH_WATER = 1024
+# Пополнение идет пакетами не больше этого размера, чтобы фоновый поток
+# не держал GIL долго и выборки не ждали
+REFILL_BATCH = 256
+KINDS = ('words', 'phrases', 'names')
+# Предел символов в полном буфере слов (длина * high_water): длинные слова
+# не буферизуются, чтобы пул не держал сотни мегабайт
+MAX_BUFFER_CHARS = 1 << 20
+# Сколько буферов (длин и алфавитов) пул держит одновременно
+MAX_BUFFERS = 16
+
+
+class PrefetchStats:
+    """
+    Счетчики пула: выборки, попадания, пополнения и время выборки.
+
+    Счетчики выборок меняет поток, который делает выборку, счетчики
+    пополнения - фоновый поток; при выборках из нескольких потоков сразу
+    счетчики приблизительны.
+    """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.draw_ns = 0
+        self.refills = 0
+        self.refilled = 0
+        self.refill_seconds = 0.0
+
+    @property
+    def draws(self):
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self):
+        """
+        Доля элементов, взятых из буфера.
+        """
+        return self.hits / self.draws if self.draws else 0.0
+
+    @property
+    def draw_latency_us(self):
+        """
+        Среднее время выдачи одного элемента, мкс.
+        """
+        return self.draw_ns / self.draws / 1000 if self.draws else 0.0
+
+    @property
+    def refill_rate(self):
+        """
+        Скорость пополнения буферов, элементов в секунду.
+        """
+        return self.refilled / self.refill_seconds if self.refill_seconds else 0.0
+
+    def as_dict(self):
+        return {
+            "draws": self.draws,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "draw_latency_us": round(self.draw_latency_us, 3),
+            "refills": self.refills,
+            "refilled": self.refilled,
+            "refill_rate": round(self.refill_rate),
+        }
+
+    def __str__(self):
+        return (f"выборок {self.draws}, попаданий {self.hit_rate:.1%}, "
+                f"выборка {self.draw_latency_us:.2f} мкс, "
+                f"пополнение {self.refill_rate:,.0f} эл./с")
+
+
+class PrefetchPool:
+    """
+    Буферы заранее сгенерированных элементов с фоновым пополнением.
+
+    engine - экземпляр RandomWordGenerator, которым пользуется только
+    пул (по умолчанию - новый экземпляр). Буфер вида заводится при первой
+    выборке или через warm; фоновый поток запускается вместе с первым
+    буфером и останавливается через close (или выходом из with).
+    """
+    def __init__(self, engine=None, high_water=HIGH_WATER, low_water=None,
+                 max_buffers=MAX_BUFFERS):
+        if high_water <= 0:
+            raise ValueError("Верхняя граница буфера должна быть положительной")
+        if max_buffers <= 0:
+            raise ValueError("Количество буферов должно быть положительным")
+        self.engine = RandomWordGenerator() if engine is None else engine
+        self.high_water = high_water
+        self.low_water = high_water // 2 if low_water is None else low_water
+        if not 0 <= self.low_water <= high_water:
+            raise ValueError("Нижняя граница буфера должна быть от 0 до верхней")
+        self.max_buffers = max_buffers
+        self.stats = PrefetchStats()
+        # Буферы по видам в порядке использования (LRU)
+        self.buffers = OrderedDict()
+        # Буферы, которые warm просит заполнить до верхней границы
+        self._fill_requests = set()
+        # Генерация из фонового потока и промахи идут через один экземпляр
+        self._engine_lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._closed = False
+        self._thread = None
+
+    def _key(self, kind, length, alphabet):
+        if kind not in KINDS:
+            raise ValueError(f"Неизвестный вид генерации: {kind}")
+        if kind != 'words':
+            return (kind, 0, None)
+        alphabet = self.engine.alphabet if alphabet is None else compile_alphabet(alphabet)
+        return (kind, length, alphabet)
+
+    def accepts(self, kind, length=5):
+        """
+        Буферизуются ли элементы вида kind: слова - только если полный
+        буфер не больше MAX_BUFFER_CHARS символов.
+        """
+        return kind != 'words' or length * self.high_water <= MAX_BUFFER_CHARS
+
+    def _generate(self, key, count):
+        kind, length, alphabet = key
+        with self._engine_lock:
+            if kind == 'words':
+                return self.engine.generate_words_bulk(count, length, alphabet=alphabet)
+            if kind == 'phrases':
+                return self.engine.generate_random_phrase(count)
+            return self.engine.generate_random_names(count)
+
+    def _buffer(self, key):
+        """
+        Буфер вида key; новый буфер ставится в очередь на пополнение.
+        """
+        buffer = self.buffers.get(key)
+        if buffer is not None:
+            self._touch(key)
+        else:
+            with self._wakeup:
+                if self._closed:
+                    raise RuntimeError("Пул закрыт")
+                buffer = self.buffers.setdefault(key, deque())
+                while len(self.buffers) > self.max_buffers:
+                    evicted, _ = self.buffers.popitem(last=False)
+                    self._fill_requests.discard(evicted)
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._refill_loop,
+                                                    name="rwg-prefetch", daemon=True)
+                    self._thread.start()
+                # Будит и warm, чей буфер мог быть вытеснен
+                self._wakeup.notify_all()
+        return buffer
+
+    def _touch(self, key):
+        """
+        Отметка буфера как недавно использованного.
+        """
+        try:
+            self.buffers.move_to_end(key)
+        except KeyError:
+            # Буфер только что вытеснен другим потоком: текущей выборке
+            # хватит уже полученной ссылки на него
+            pass
+
+    def draw(self, kind, count=1, length=5, alphabet=None):
+        """
+        Список из count элементов вида kind: сначала из буфера, недостающие
+        генерируются сразу.
+        """
+        start = time.perf_counter_ns()
+        key = self._key(kind, length, alphabet)
+        if not self.accepts(kind, length):
+            items = self._generate(key, count)
+            self.stats.misses += count
+            self.stats.draw_ns += time.perf_counter_ns() - start
+            return items
+        buffer = self._buffer(key)
+        items = []
+        try:
+            for _ in range(count):
+                items.append(buffer.popleft())
+        except IndexError:
+            pass
+        hits = len(items)
+        if hits < count:
+            items.extend(self._generate(key, count - hits))
+        if len(buffer) < self.low_water:
+            self._wake()
+        stats = self.stats
+        stats.hits += hits
+        stats.misses += count - hits
+        stats.draw_ns += time.perf_counter_ns() - start
+        return items
+
+    def _draw_one(self, key):
+        """
+        Один элемент: popleft из буфера или генерация при промахе.
+
+        Фоновый поток будится, только когда буфер опускается ниже
+        low_water (или пуст), а не при каждой выборке.
+        """
+        start = time.perf_counter_ns()
+        stats = self.stats
+        if not self.accepts(key[0], key[1]):
+            item = self._generate(key, 1)[0]
+            stats.misses += 1
+            stats.draw_ns += time.perf_counter_ns() - start
+            return item
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            buffer = self._buffer(key)
+        else:
+            self._touch(key)
+        try:
+            item = buffer.popleft()
+            stats.hits += 1
+        except IndexError:
+            item = self._generate(key, 1)[0]
+            stats.misses += 1
+            self._wake()
+        else:
+            if len(buffer) == self.low_water - 1:
+                self._wake()
+        stats.draw_ns += time.perf_counter_ns() - start
+        return item
+
+    def _wake(self):
+        with self._wakeup:
+            self._wakeup.notify()
+
+    def word(self, length=5, alphabet=None):
+        """
+        Одно случайное слово из буфера.
+        """
+        alphabet = self.engine.alphabet if alphabet is None else compile_alphabet(alphabet)
+        return self._draw_one(('words', length, alphabet))
+
+    def phrase(self):
+        """
+        Одно словосочетание из буфера.
+        """
+        return self._draw_one(('phrases', 0, None))
+
+    def name(self):
+        """
+        Одно имя из буфера.
+        """
+        return self._draw_one(('names', 0, None))
+
+    def warm(self, kind, length=5, alphabet=None, timeout=None):
+        """
+        Заведение буфера вида kind и ожидание его заполнения до верхней
+        границы (не дольше timeout секунд); возвращает, заполнен ли буфер.
+        Для слов, которые пул не буферизует (см. accepts), - сразу False;
+        если буфер вытеснен до заполнения, ожидание прекращается с False.
+        """
+        key = self._key(kind, length, alphabet)
+        if not self.accepts(kind, length):
+            return False
+        buffer = self._buffer(key)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._wakeup:
+            self._fill_requests.add(key)
+            self._wakeup.notify_all()
+            while len(buffer) < self.high_water and not self._closed \
+                    and self.buffers.get(key) is buffer:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._wakeup.wait(remaining)
+        return len(buffer) >= self.high_water
+
+    def _refill_loop(self):
+        """
+        Фоновое пополнение: пакетами по REFILL_BATCH до high_water, пока
+        есть буферы ниже low_water; затем ожидание следующей выборки.
+        """
+        while True:
+            with self._wakeup:
+                while not self._closed and not self._pending():
+                    self._wakeup.wait()
+                if self._closed:
+                    return
+                pending = self._pending()
+                for key, _ in pending:
+                    self._fill_requests.discard(key)
+            for key, buffer in pending:
+                # Вытесненный буфер больше не пополняется
+                while len(buffer) < self.high_water and not self._closed \
+                        and self.buffers.get(key) is buffer:
+                    start = time.perf_counter()
+                    items = self._generate(key, min(REFILL_BATCH, self.high_water - len(buffer)))
+                    buffer.extend(items)
+                    self.stats.refills += 1
+                    self.stats.refilled += len(items)
+                    self.stats.refill_seconds += time.perf_counter() - start
+            with self._wakeup:
+                # Разбудить warm, ожидающие заполнения
+                self._wakeup.notify_all()
+
+    def _pending(self):
+        return [(key, buffer) for key, buffer in list(self.buffers.items())
+                if len(buffer) < self.low_water or not buffer or key in self._fill_requests]
+
+    def close(self):
+        """
+        Остановка фонового потока; буферы остаются доступны для выборки.
+        """
+        with self._wakeup:
+            self._closed = True
+            self._wakeup.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
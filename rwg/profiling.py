@@ -0,0 +1,252 @@
+"""
+Необязательные замеры этапов генерации: где уходит время - на случайные
+байты, сборку строк, построение списков или вывод в окне.
+
+Замеры включаются явно (Profiler.enable или with profiler). Тогда
+функции-этапы (пробы) подменяются в своих модулях и классах обертками,
+которые считают вызовы и время; disable возвращает исходные функции. Пока
+замеры выключены, в коде генерации нет ни оберток, ни проверок флага,
+поэтому накладных расходов нет совсем.
+
+Для каждого этапа считаются вызовы, полное время и собственное время
+(без вложенных этапов того же потока), так что сумма собственных времен
+равна времени внешних вызовов. Дополнительно можно собрать профиль
+cProfile и сохранить его для pstats.
+"""
+import cProfile
+import io
+import pstats
+import threading
+import time
+from functools import wraps
+
+from . import alphabet, core, export, markov, pattern, sampling, stream, unique
+
+
+class StageStats:
+    """
+    Счетчики одного этапа: вызовы и время в наносекундах.
+    """
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.self_ns = 0
+        self.max_ns = 0
+
+
+def default_probes():
+    """
+    Пробы ядра: (этап, владелец, имя атрибута).
+
+    Функции, импортированные по имени в другие модули, подменяются и там.
+    """
+    probes = [
+        ('rng.random_bytes', core, 'random_bytes'),
+        ('rng.random_bytes', sampling, 'random_bytes'),
+        ('rng.random_bytes', markov, 'random_bytes'),
+        ('rng.mapped_bytes', core, '_draw_mapped_bytes'),
+        ('rng.draw_indices', core, 'draw_indices'),
+        ('rng.draw_indices', sampling, 'draw_indices'),
+        ('text.word', alphabet.Alphabet, 'word'),
+        ('text.words_from_bytes', alphabet.Alphabet, 'words_from_bytes'),
+        ('text.words_from_indices', alphabet.Alphabet, 'words_from_indices'),
+        ('unique.bitmap', unique.Bitmap, 'select_new'),
+        ('unique.fingerprints', unique.FingerprintSet, 'select_new'),
+        ('markov.generate', markov.MarkovModel, 'generate'),
+        ('pattern.generate', pattern.Pattern, 'generate'),
+        ('io.write_chunks', stream, 'write_chunks'),
+        ('io.export_rows', export._Writer, 'write_rows'),
+    ]
+    for name, attribute in vars(core.RandomWordGenerator).items():
+        if isinstance(attribute, core._EngineMethod):
+            probes.append((f'engine.{name}', core.RandomWordGenerator, name))
+    return probes
+
+
+class Profiler:
+    """
+    Счетчики этапов генерации, которые собираются, пока замеры включены.
+
+    Каждый поток пишет в собственный словарь счетчиков без блокировок;
+    снимок (rows, summary) складывает словари всех потоков.
+    """
+    def __init__(self, probes=()):
+        self.enabled = False
+        self._probes = []
+        self._patched = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._thread_stages = []
+        self._profile = None
+        for probe in probes:
+            self.add_probe(*probe)
+
+    def add_probe(self, stage, owner, attribute):
+        """
+        Замер функции owner.attribute (атрибут модуля или класса) как этапа stage.
+
+        Методы классов нужно добавить до того, как на них будут ссылаться
+        связанные методы (например, до подключения сигналов окна).
+        """
+        self._probes.append((stage, owner, attribute))
+        if self.enabled:
+            self._patch(stage, owner, attribute)
+
+    def _patch(self, stage, owner, attribute):
+        original = vars(owner)[attribute]
+        if isinstance(original, core._EngineMethod):
+            replacement = core._EngineMethod(self._wrap(stage, original.function))
+        else:
+            replacement = self._wrap(stage, original)
+        setattr(owner, attribute, replacement)
+        self._patched.append((owner, attribute, original))
+
+    def _wrap(self, stage, function):
+        """
+        Обертка, которая считает вызов, полное и собственное время этапа.
+
+        Счетчики этапа - список [вызовы, полное, собственное, максимум]
+        в словаре текущего потока.
+        """
+        clock = time.perf_counter_ns
+        local = self._local
+        thread_state = self._thread_state
+
+        @wraps(function)
+        def probe(*args, **kwargs):
+            try:
+                stack = local.stack
+            except AttributeError:
+                stack = thread_state()
+            stack.append(0)
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                children = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                counters = local.stages.get(stage)
+                if counters is None:
+                    counters = local.stages[stage] = [0, 0, 0, 0]
+                counters[0] += 1
+                counters[1] += elapsed
+                counters[2] += elapsed - children
+                if elapsed > counters[3]:
+                    counters[3] = elapsed
+        return probe
+
+    def _thread_state(self):
+        """
+        Стек вложенных этапов и словарь счетчиков для нового потока.
+        """
+        self._local.stack = []
+        self._local.stages = {}
+        with self._lock:
+            self._thread_stages.append(self._local.stages)
+        return self._local.stack
+
+    def enable(self, cprofile=False):
+        """
+        Подмена проб обертками; при cprofile=True еще и сбор профиля
+        cProfile (только для текущего потока).
+        """
+        if not self.enabled:
+            for probe in self._probes:
+                self._patch(*probe)
+            self.enabled = True
+        if cprofile and self._profile is None:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def disable(self):
+        """
+        Возврат исходных функций; собранные счетчики сохраняются.
+        """
+        if self._profile is not None:
+            self._profile.disable()
+        for owner, attribute, original in reversed(self._patched):
+            setattr(owner, attribute, original)
+        self._patched = []
+        self.enabled = False
+
+    def reset(self):
+        """
+        Обнуление счетчиков этапов во всех потоках.
+        """
+        with self._lock:
+            for stages in self._thread_stages:
+                stages.clear()
+
+    @property
+    def stages(self):
+        """
+        Счетчики этапов, сложенные по всем потокам: этап -> StageStats.
+        """
+        with self._lock:
+            snapshots = [list(stages.items()) for stages in self._thread_stages]
+        merged = {}
+        for items in snapshots:
+            for stage, (calls, total, own, longest) in items:
+                stats = merged.get(stage)
+                if stats is None:
+                    stats = merged[stage] = StageStats()
+                stats.calls += calls
+                stats.total_ns += total
+                stats.self_ns += own
+                stats.max_ns = max(stats.max_ns, longest)
+        return merged
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def rows(self):
+        """
+        Снимок счетчиков: (этап, StageStats) по убыванию собственного времени.
+        """
+        rows = list(self.stages.items())
+        return sorted(rows, key=lambda row: row[1].self_ns, reverse=True)
+
+    def summary(self):
+        """
+        Таблица этапов: вызовы, полное и собственное время, доля, среднее и максимум.
+        """
+        rows = self.rows()
+        own_total = sum(stats.self_ns for _, stats in rows) or 1
+        lines = [f"{'stage':<40} {'calls':>9} {'total, ms':>10} {'self, ms':>10} "
+                 f"{'self %':>7} {'mean, us':>10} {'max, us':>10}"]
+        for stage, stats in rows:
+            lines.append(f"{stage:<40} {stats.calls:>9} {stats.total_ns / 1e6:>10.2f} "
+                         f"{stats.self_ns / 1e6:>10.2f} {stats.self_ns * 100 / own_total:>6.1f}% "
+                         f"{stats.total_ns / stats.calls / 1e3:>10.1f} {stats.max_ns / 1e3:>10.1f}")
+        return "\n".join(lines)
+
+    def pstats(self, sort='cumulative', limit=30):
+        """
+        Отчет pstats по собранному профилю cProfile.
+        """
+        if self._profile is None:
+            raise ValueError("Профиль cProfile не собирался (enable(cprofile=True))")
+        stream = io.StringIO()
+        pstats.Stats(self._profile, stream=stream).sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def dump_stats(self, path):
+        """
+        Запись профиля cProfile в файл для pstats и других инструментов.
+        """
+        if self._profile is None:
+            raise ValueError("Профиль cProfile не собирался (enable(cprofile=True))")
+        self._profile.dump_stats(path)
+
+
+def default_profiler():
+    """
+    Профилировщик с пробами ядра (см. default_probes).
+    """
+    return Profiler(default_probes())
@@ -0,0 +1,134 @@
+"""
+Выборка с весами методом псевдонимов (Walker/Vose).
+
+Таблица строится один раз за O(n); одна выборка - это выбор столбца и
+одно сравнение, то есть O(1) независимо от размера словаря. Пакетная
+выборка берет номера столбцов и все "монетки" заранее большими буферами.
+"""
+import math
+from array import array
+
+from .core import draw_indices, random_bytes
+
+# Точность "монетки": вероятности хранятся как 32-битные пороги
+_COIN_BITS = 32
+_COIN_SCALE = 1 << _COIN_BITS
+
+
+class AliasTable:
+    """
+    Таблица псевдонимов для выборки индексов [0, n) с заданными весами.
+    """
+    def __init__(self, weights):
+        weights = [float(weight) for weight in weights]
+        if not weights:
+            raise ValueError("Список весов пуст")
+        if not all(map(math.isfinite, weights)):
+            # inf сломал бы пороги, а nan не попал бы ни в один список столбцов
+            raise ValueError("Веса должны быть конечными числами")
+        if any(weight < 0 for weight in weights):
+            raise ValueError("Веса не могут быть отрицательными")
+        total = sum(weights)
+        if not math.isfinite(total):
+            raise ValueError("Сумма весов слишком велика")
+        if total <= 0:
+            raise ValueError("Сумма весов должна быть положительной")
+
+        size = len(weights)
+        scaled = [weight * size / total for weight in weights]
+        self.thresholds = array("Q", [_COIN_SCALE]) * size
+        self.aliases = array("L", range(size))
+        small = [index for index, value in enumerate(scaled) if value < 1.0]
+        large = [index for index, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.thresholds[less] = int(scaled[less] * _COIN_SCALE)
+            self.aliases[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Остатки из-за погрешности округления считаются полными столбцами
+
+    def __len__(self):
+        return len(self.thresholds)
+
+    def sample(self, rng):
+        """
+        Один случайный индекс.
+        """
+        column = rng.randrange(len(self.thresholds))
+        if rng.getrandbits(_COIN_BITS) < self.thresholds[column]:
+            return column
+        return self.aliases[column]
+
+    def sample_many(self, rng, count):
+        """
+        count случайных индексов; столбцы и монетки берутся одним буфером каждые.
+        """
+        if count <= 0:
+            return []
+        columns = draw_indices(rng, count, len(self.thresholds))
+        coins = array("I")
+        coins.frombytes(random_bytes(rng, 4 * count))
+        thresholds = self.thresholds
+        aliases = self.aliases
+        return [column if coin < thresholds[column] else aliases[column]
+                for column, coin in zip(columns, coins)]
+
+
+class WeightedVocabulary:
+    """
+    Словарь с частотами: слова выбираются пропорционально весам.
+
+    Подставляется в RandomWordGenerator.use_vocabulary так же, как
+    обычный кортеж слов.
+    """
+    def __init__(self, words, weights):
+        self.words = tuple(words)
+        if len(self.words) != len(weights):
+            raise ValueError("Количество слов и весов не совпадает")
+        self.table = AliasTable(weights)
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Загрузка из файла UTF-8 строк вида "слово<TAB>вес" (вес по умолчанию 1).
+
+        Неверный вес - ValueError с именем файла и номером строки.
+        """
+        words = []
+        weights = []
+        with open(path, encoding="utf-8") as file:
+            for number, line in enumerate(file, 1):
+                word, _, weight = line.rstrip("\r\n").partition("\t")
+                if word:
+                    try:
+                        weights.append(float(weight) if weight else 1.0)
+                    except ValueError:
+                        raise ValueError(f"{path}:{number}: неверный вес {weight!r}") from None
+                    words.append(word)
+        try:
+            return cls(words, weights)
+        except ValueError as e:
+            raise ValueError(f"{path}: {e}") from None
+
+    def __len__(self):
+        return len(self.words)
+
+    def __getitem__(self, position):
+        return self.words[position]
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def sample(self, rng):
+        """
+        Одно слово с учетом весов.
+        """
+        return self.words[self.table.sample(rng)]
+
+    def sample_indices(self, rng, count):
+        """
+        Пакет из count индексов слов с учетом весов.
+        """
+        return self.table.sample_many(rng, count)
@@ -0,0 +1,76 @@
+"""
+Криптографически стойкий источник случайности с буферизацией.
+
+SecureRandom берет энтропию из os.urandom блоками по BLOCK_SIZE байт и
+выдает ее через интерфейс random.Random, поэтому его можно передавать
+как rng в любой метод генератора. Буквы и индексы получаются из байтов
+тем же отбрасыванием значений сверху диапазона, что и для обычного
+генератора, то есть без смещения по модулю и без системного вызова на
+каждый символ.
+"""
+import os
+import random
+
+# Размер блока, который читается из os.urandom за один вызов
+BLOCK_SIZE = 1 << 16
+_DOUBLE_SCALE = 2.0 ** -53
+
+
+class SecureRandom(random.Random):
+    """
+    Генератор на os.urandom с буфером; seed и состояние не поддерживаются.
+
+    Экземпляр не делится на потоки: у каждого потока должен быть свой.
+    После fork буфер сбрасывается, чтобы процессы не выдавали одни и те
+    же байты.
+    """
+    def __init__(self, block_size=BLOCK_SIZE):
+        if block_size <= 0:
+            raise ValueError("Размер блока должен быть положительным")
+        self.block_size = block_size
+        self._buffer = b""
+        self._position = 0
+        self._pid = os.getpid()
+        super().__init__()
+
+    def seed(self, *args, **kwargs):
+        """
+        Не используется: энтропия всегда берется из os.urandom.
+        """
+
+    def getstate(self):
+        raise NotImplementedError("У SecureRandom нет воспроизводимого состояния")
+
+    def setstate(self, state):
+        raise NotImplementedError("У SecureRandom нет воспроизводимого состояния")
+
+    def randbytes(self, n):
+        """
+        n случайных байтов из буфера (большие запросы - напрямую из os.urandom).
+        """
+        if n >= self.block_size:
+            return os.urandom(n)
+        if self._pid != os.getpid():
+            self._buffer, self._position, self._pid = b"", 0, os.getpid()
+        start = self._position
+        end = start + n
+        if end > len(self._buffer):
+            self._buffer = os.urandom(self.block_size)
+            start, end = 0, n
+        self._position = end
+        return self._buffer[start:end]
+
+    def getrandbits(self, k):
+        """
+        Целое число из k случайных битов.
+        """
+        if k < 0:
+            raise ValueError("Количество битов не может быть отрицательным")
+        size = (k + 7) // 8
+        return int.from_bytes(self.randbytes(size), 'little') >> (size * 8 - k)
+
+    def random(self):
+        """
+        Число с плавающей точкой в [0, 1) из 53 случайных битов.
+        """
+        return (int.from_bytes(self.randbytes(7), 'little') >> 3) * _DOUBLE_SCALE
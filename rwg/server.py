@@ -0,0 +1,412 @@
+"""
+Локальный HTTP-сервис генерации на asyncio без внешних зависимостей.
+
+Адреса (GET, ответ - текст UTF-8, по элементу на строку):
+
+- /words?count=N&length=L&alphabet=A - случайные слова;
+- /phrases?count=N - словосочетания;
+- /names?count=N - имена;
+- /stats - JSON с p50/p99 задержки и статистикой пакетов.
+
+Небольшие запросы (до stream_threshold элементов и до stream_bytes
+байт ответа), пришедшие одновременно, объединяются: для одинаковых
+параметров делается один пакетный вызов генератора, и результат делится
+между запросами. Большие ответы генерируются порциями не больше
+stream_bytes и отдаются с Transfer-Encoding: chunked, поэтому память
+сервера не зависит от размера запроса. Длина слова ограничена
+MAX_LENGTH. Пакеты и порции больше stream_bytes генерируются в отдельном
+потоке, чтобы не держать цикл событий и остальных клиентов.
+"""
+import asyncio
+import json
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from .alphabet import DEFAULT_ALPHABET, compile_alphabet
+from .backends import DEFAULT_BACKEND
+from .core import RandomWordGenerator
+from .parallel import SeedSequence
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+# Запросы больше этого количества элементов отдаются потоком, без пакетов
+STREAM_THRESHOLD = 4096
+# Размер порции потокового ответа: генерация порции не держит цикл
+# событий дольше нескольких миллисекунд
+STREAM_CHUNK_SIZE = 8192
+# Ответы больше стольких байт (по оценке) отдаются потоком, а пакеты и
+# порции такого размера генерируются вне цикла событий
+STREAM_BYTES = 1 << 18
+# Максимальная длина слова в /words; длиннее - ответ 400
+MAX_LENGTH = 4096
+# Оценка размера словосочетания или имени в байтах UTF-8 с переводом строки
+_TEXT_ITEM_BYTES = 32
+# Сколько последних запросов учитывается в p50/p99
+LATENCY_WINDOW = 10000
+_MAX_HEADER_SIZE = 1 << 16
+
+
+class HTTPError(Exception):
+    """
+    Ошибка запроса с HTTP-статусом ответа.
+    """
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class LatencyRecorder:
+    """
+    Задержки последних window запросов и их процентили.
+    """
+    def __init__(self, window=LATENCY_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.requests = 0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.requests += 1
+
+    def percentile(self, fraction):
+        """
+        Процентиль задержки в секундах (fraction от 0 до 1).
+        """
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def snapshot(self):
+        return {
+            "requests": self.requests,
+            "p50_ms": round(self.percentile(0.50) * 1000, 3),
+            "p99_ms": round(self.percentile(0.99) * 1000, 3),
+        }
+
+
+class Batcher:
+    """
+    Объединение одновременных запросов с одинаковыми параметрами.
+
+    Первый запрос с ключом key планирует сброс через window секунд (при
+    window=0 - на следующей итерации цикла событий); все запросы с тем же
+    ключом, пришедшие до сброса, получают свою часть одного вызова
+    generate(key, общее количество). Если offload(key, количество)
+    истинно, вызов идет в executor, а не в цикле событий.
+    """
+    def __init__(self, generate, window=0.0, offload=None, executor=None):
+        self.generate = generate
+        self.window = window
+        self.offload = offload
+        self.executor = executor
+        self.pending = {}
+        self.batches = 0
+        self.items = 0
+
+    def request(self, key, count):
+        """
+        Future со списком из count элементов.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiting = self.pending.get(key)
+        if waiting is None:
+            waiting = self.pending[key] = []
+            if self.window > 0:
+                loop.call_later(self.window, self.flush, key)
+            else:
+                loop.call_soon(self.flush, key)
+        waiting.append((count, future))
+        return future
+
+    def flush(self, key):
+        """
+        Один вызов генератора на все ожидающие запросы с ключом key.
+        """
+        waiting = self.pending.pop(key)
+        total = sum(count for count, _ in waiting)
+        if self.offload is not None and self.offload(key, total):
+            loop = asyncio.get_running_loop()
+            generated = loop.run_in_executor(self.executor, self.generate, key, total)
+            generated.add_done_callback(lambda done: self._deliver(waiting, done))
+            return
+        try:
+            items = self.generate(key, total)
+        except Exception as e:
+            self._fail(waiting, e)
+            return
+        self._split(waiting, items)
+
+    def _deliver(self, waiting, generated):
+        if generated.cancelled():
+            self._fail(waiting, asyncio.CancelledError())
+        elif generated.exception() is not None:
+            self._fail(waiting, generated.exception())
+        else:
+            self._split(waiting, generated.result())
+
+    @staticmethod
+    def _fail(waiting, error):
+        for _, future in waiting:
+            if not future.done():
+                future.set_exception(error)
+
+    def _split(self, waiting, items):
+        """
+        Раздача частей пакета ожидающим запросам.
+        """
+        self.batches += 1
+        self.items += len(waiting)
+        start = 0
+        for count, future in waiting:
+            if not future.done():
+                future.set_result(items[start:start + count])
+            start += count
+
+    def snapshot(self):
+        return {
+            "batches": self.batches,
+            "batched_requests": self.items,
+            "requests_per_batch": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
+
+
+class GenerationServer:
+    """
+    HTTP-сервис генерации со своими экземплярами RandomWordGenerator.
+
+    Небольшие пакеты генерируются в цикле событий, большие пакеты и
+    порции потоковых ответов - в одном фоновом потоке. У фонового потока
+    собственный генератор: источники случайности не потокобезопасны
+    (SecureRandom ведет буфер байтов без блокировки), поэтому один
+    экземпляр на два потока мог бы выдать двум клиентам одни и те же
+    байты. При заданном seed генератор фонового потока получает
+    производный seed (parallel.SeedSequence).
+    """
+    def __init__(self, backend=DEFAULT_BACKEND, seed=None, batch_window=0.0,
+                 stream_threshold=STREAM_THRESHOLD, chunk_size=STREAM_CHUNK_SIZE,
+                 stream_bytes=STREAM_BYTES):
+        self.engine = RandomWordGenerator(backend, seed)
+        worker_seed = None if seed is None else SeedSequence(seed).spawn(1)[0].generate_state()
+        self.worker_engine = RandomWordGenerator(backend, worker_seed)
+        self._local = threading.local()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rwg-serve",
+                                           initializer=self._start_worker)
+        self.batcher = Batcher(self._generate, batch_window, self._offload, self.executor)
+        self.stream_threshold = stream_threshold
+        self.chunk_size = chunk_size
+        self.stream_bytes = stream_bytes
+        self.latency = LatencyRecorder()
+
+    def _start_worker(self):
+        self._local.engine = self.worker_engine
+
+    def _current_engine(self):
+        """
+        Генератор текущего потока: фонового или цикла событий.
+        """
+        return getattr(self._local, "engine", self.engine)
+
+    @staticmethod
+    def _item_bytes(key):
+        """
+        Оценка размера элемента в ответе, байт.
+        """
+        kind, length, _ = key
+        return length + 1 if kind == "words" else _TEXT_ITEM_BYTES
+
+    def _offload(self, key, count):
+        return count * self._item_bytes(key) > self.stream_bytes
+
+    def _generate(self, key, count):
+        kind, length, alphabet = key
+        engine = self._current_engine()
+        if kind == "words":
+            return engine.generate_words_bulk(count, length, alphabet=alphabet)
+        if kind == "phrases":
+            return engine.generate_random_phrase(count)
+        return engine.generate_random_names(count)
+
+    def _iter_chunks(self, key, count):
+        """
+        Порции потокового ответа; они генерируются в фоновом потоке, поэтому
+        на его генераторе.
+        """
+        kind, length, alphabet = key
+        engine = self.worker_engine
+        # Порция не больше stream_bytes, даже для длинных слов
+        chunk_size = max(1, min(self.chunk_size, self.stream_bytes // self._item_bytes(key)))
+        if kind == "words":
+            return engine.iter_random_words(count, length, chunk_size, alphabet=alphabet)
+        if kind == "phrases":
+            return engine.iter_random_phrases(count, chunk_size)
+        return engine.iter_random_names(count, chunk_size)
+
+    def stats(self):
+        """
+        Статистика сервиса: задержки и пакеты.
+        """
+        return {"latency": self.latency.snapshot(), "batching": self.batcher.snapshot()}
+
+    async def handle(self, reader, writer):
+        """
+        Обработка соединения (с keep-alive) до его закрытия клиентом.
+        """
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                start = time.perf_counter()
+                keep_alive = await self._respond(head, writer)
+                self.latency.add(time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, head, writer):
+        """
+        Ответ на один запрос; возвращает, оставлять ли соединение открытым.
+        """
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            await self._send(writer, HTTPStatus.BAD_REQUEST, b"malformed request line\n")
+            return False
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+        connection = headers.get("connection", "")
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+        try:
+            if method != "GET":
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "only GET is supported")
+            url = urlsplit(target)
+            if url.path == "/stats":
+                body = json.dumps(self.stats()).encode("utf-8") + b"\n"
+                await self._send(writer, HTTPStatus.OK, body, keep_alive, "application/json")
+                return keep_alive
+            key, count = self._parse(url.path, parse_qs(url.query))
+            if count > self.stream_threshold or self._offload(key, count):
+                await self._stream(writer, key, count, keep_alive)
+                return keep_alive
+            items = await self.batcher.request(key, count) if count else []
+        except HTTPError as e:
+            await self._send(writer, e.status, f"{e}\n".encode("utf-8"), keep_alive)
+            return keep_alive
+        body = "".join(item + "\n" for item in items).encode("utf-8")
+        await self._send(writer, HTTPStatus.OK, body, keep_alive)
+        return keep_alive
+
+    def _parse(self, path, query):
+        """
+        Ключ пакета (вид, длина, алфавит) и количество элементов из адреса.
+        """
+        kind = path.strip("/")
+        if kind not in ("words", "phrases", "names"):
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"unknown path: {path}")
+
+        def number(name, default):
+            values = query.get(name)
+            try:
+                value = int(values[-1]) if values else default
+            except ValueError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must be an integer") from None
+            if value < 0:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must not be negative")
+            return value
+
+        count = number("count", 1)
+        if kind != "words":
+            return (kind, 0, None), count
+        alphabet = query.get("alphabet", [DEFAULT_ALPHABET])[-1]
+        try:
+            alphabet = compile_alphabet(alphabet)
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(e)) from None
+        length = number("length", 5)
+        if length > MAX_LENGTH:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"length must not exceed {MAX_LENGTH}")
+        return (kind, length, alphabet), count
+
+    async def _send(self, writer, status, body, keep_alive=False,
+                    content_type="text/plain; charset=utf-8"):
+        writer.write(self._head(status, keep_alive, content_type,
+                                f"Content-Length: {len(body)}") + body)
+        await writer.drain()
+
+    async def _stream(self, writer, key, count, keep_alive):
+        """
+        Потоковый ответ порциями с Transfer-Encoding: chunked.
+        """
+        writer.write(self._head(HTTPStatus.OK, keep_alive, "text/plain; charset=utf-8",
+                                "Transfer-Encoding: chunked"))
+        loop = asyncio.get_running_loop()
+        chunks = self._iter_chunks(key, count)
+        while True:
+            # Порция генерируется в фоновом потоке: цикл событий тем временем
+            # обслуживает остальных клиентов
+            chunk = await loop.run_in_executor(self.executor, next, chunks, None)
+            if chunk is None:
+                break
+            data = ("\n".join(chunk) + "\n").encode("utf-8")
+            writer.write(b"%x\r\n%b\r\n" % (len(data), data))
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    @staticmethod
+    def _head(status, keep_alive, content_type, length_header):
+        return (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"{length_header}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                "\r\n").encode("latin-1")
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, backend=DEFAULT_BACKEND, seed=None,
+                batch_window=0.0, ready=None):
+    """
+    Запуск сервиса до отмены задачи.
+
+    ready(адрес) вызывается, когда сокет уже слушает (port=0 - любой
+    свободный порт).
+    """
+    server = GenerationServer(backend, seed, batch_window)
+    listener = await asyncio.start_server(server.handle, host, port, limit=_MAX_HEADER_SIZE)
+    address = listener.sockets[0].getsockname()
+    if ready is not None:
+        ready(address)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.executor.shutdown(wait=False)
+        print(f"статистика: {json.dumps(server.stats())}", file=sys.stderr)
+
+
+def run(host=DEFAULT_HOST, port=DEFAULT_PORT, backend=DEFAULT_BACKEND, seed=None,
+        batch_window=0.0):
+    """
+    Блокирующий запуск сервиса; адрес печатается в stderr, Ctrl+C - остановка.
+    """
+    def ready(address):
+        print(f"rwg: http://{address[0]}:{address[1]}/", file=sys.stderr, flush=True)
+
+    try:
+        asyncio.run(serve(host, port, backend, seed, batch_window, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
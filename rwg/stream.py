@@ -0,0 +1,91 @@
+"""
+Потоковая запись сгенерированных элементов в файл или stdout.
+
+Элементы приходят порциями из RandomWordGenerator.iter_random_*; каждая
+порция склеивается в одну строку и пишется одним вызовом write в
+буферизованный бинарный поток, поэтому память ограничена размером порции.
+Порция batch.WordBatch уже хранит строки в виде байтов и пишется своим
+буфером без склейки и кодирования.
+"""
+import os
+import sys
+import time
+
+from .batch import WordBatch
+
+BUFFER_SIZE = 1 << 20
+
+# Форматы и сжатие файлов (запись всех форматов, кроме текста, - rwg.export)
+FORMATS = ('text', 'jsonl', 'csv', 'columnar')
+COMPRESSIONS = ('gzip', 'bz2', 'xz')
+
+# Расширения файлов: формат и сжатие
+FORMAT_SUFFIXES = {'.jsonl': 'jsonl', '.csv': 'csv', '.rwgc': 'columnar'}
+COMPRESSION_SUFFIXES = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz'}
+
+
+class StreamStats:
+    """
+    Итоги потоковой записи: количество элементов, байтов и время.
+    """
+    def __init__(self, items, size, seconds):
+        self.items = items
+        self.bytes = size
+        self.seconds = seconds
+
+    @property
+    def mb_per_second(self):
+        """
+        Пропускная способность записи в МБ/с.
+        """
+        if self.seconds <= 0:
+            return 0.0
+        return self.bytes / self.seconds / 1e6
+
+    def __str__(self):
+        return (f"{self.items} шт., {self.bytes / 1e6:.1f} МБ за {self.seconds:.2f} с "
+                f"({self.mb_per_second:.1f} МБ/с)")
+
+
+def format_for_path(path):
+    """
+    Формат и сжатие по расширению файла: ('jsonl', 'gzip') для data.jsonl.gz.
+
+    Неизвестное расширение - текст без сжатия.
+    """
+    root, suffix = os.path.splitext(path or "")
+    compression = COMPRESSION_SUFFIXES.get(suffix.lower())
+    if compression is not None:
+        root, suffix = os.path.splitext(root)
+    return FORMAT_SUFFIXES.get(suffix.lower(), 'text'), compression
+
+
+def write_chunks(chunks, stream, encoding="utf-8"):
+    """
+    Запись порций элементов (по одному на строку) в бинарный поток.
+    """
+    items = 0
+    size = 0
+    start = time.perf_counter()
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if isinstance(chunk, WordBatch) and encoding == "utf-8":
+            data = chunk.buffer
+        else:
+            data = ("\n".join(chunk) + "\n").encode(encoding)
+        stream.write(data)
+        items += len(chunk)
+        size += len(data)
+    stream.flush()
+    return StreamStats(items, size, time.perf_counter() - start)
+
+
+def write_to_path(chunks, path=None, buffer_size=BUFFER_SIZE):
+    """
+    Запись порций в файл по пути path или в stdout, если путь не задан.
+    """
+    if path is None or path == "-":
+        return write_chunks(chunks, sys.stdout.buffer)
+    with open(path, "wb", buffering=buffer_size) as stream:
+        return write_chunks(chunks, stream)
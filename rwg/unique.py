@@ -0,0 +1,107 @@
+"""
+Компактные индексы уже выданных значений для режима unique=True.
+
+Bitmap - один бит на каждое значение пространства (подходит, когда
+пространство невелико относительно запроса), FingerprintSet - открытая
+адресация по 64-битным отпечаткам в одном массиве array('Q')
+(около 16 байт на элемент при заполнении до половины).
+"""
+from array import array
+
+# Заполнение таблицы отпечатков, после которого она увеличивается вдвое
+_MAX_LOAD = 0.5
+_MASK64 = (1 << 64) - 1
+
+
+class Bitmap:
+    """
+    Битовая карта для значений 0..size-1.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.bits = bytearray((size + 7) // 8)
+
+    def select_new(self, items, numbers):
+        """
+        Элементы items, чьи номера numbers еще не отмечены (с отметкой).
+        """
+        bits = self.bits
+        result = []
+        for item, number in zip(items, numbers):
+            byte, bit = number >> 3, 1 << (number & 7)
+            if not bits[byte] & bit:
+                bits[byte] |= bit
+                result.append(item)
+        return result
+
+    def memory(self):
+        """
+        Объем памяти под биты, байт.
+        """
+        return len(self.bits)
+
+
+class FingerprintSet:
+    """
+    Множество 64-битных отпечатков с открытой адресацией в array('Q').
+
+    Ноль означает пустую ячейку, поэтому отпечаток 0 хранится не в
+    таблице, а отдельным флагом (иначе точные номера слов 0 и 1
+    совпали бы). Совпадение отпечатков у разных значений (для hash
+    слова) приводит лишь к лишнему отказу, а не к повтору в результате.
+    """
+    def __init__(self, capacity=1024):
+        size = 16
+        while size * _MAX_LOAD < capacity:
+            size *= 2
+        self.slots = array('Q', [0]) * size
+        self.mask = size - 1
+        self.count = 0
+        self.has_zero = False
+
+    def select_new(self, items, fingerprints):
+        """
+        Элементы items, чьих отпечатков еще нет в множестве (с добавлением).
+        """
+        result = []
+        for item, fingerprint in zip(items, fingerprints):
+            fingerprint &= _MASK64
+            if not fingerprint:
+                if not self.has_zero:
+                    self.has_zero = True
+                    result.append(item)
+                continue
+            slots = self.slots
+            mask = self.mask
+            position = fingerprint & mask
+            current = slots[position]
+            while current and current != fingerprint:
+                position = (position + 1) & mask
+                current = slots[position]
+            if current:
+                continue
+            slots[position] = fingerprint
+            self.count += 1
+            result.append(item)
+            if self.count > len(slots) * _MAX_LOAD:
+                self._grow()
+        return result
+
+    def _grow(self):
+        old = self.slots
+        self.slots = array('Q', [0]) * (2 * len(old))
+        self.mask = len(self.slots) - 1
+        slots = self.slots
+        mask = self.mask
+        for fingerprint in old:
+            if fingerprint:
+                position = fingerprint & mask
+                while slots[position]:
+                    position = (position + 1) & mask
+                slots[position] = fingerprint
+
+    def memory(self):
+        """
+        Объем памяти таблицы, байт.
+        """
+        return self.slots.itemsize * len(self.slots)
@@ -0,0 +1,7 @@
+"""
+Тесты импортируют пакет rwg из корня репозитория.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,57 @@
+"""
+Источники случайности (rwg.backends). Адаптер pcg64 проверяется, только
+если установлен numpy.
+"""
+import pickle
+
+import pytest
+
+from rwg import RandomWordGenerator
+from rwg.backends import make_rng
+
+
+@pytest.fixture
+def pcg64():
+    pytest.importorskip("numpy")
+    return make_rng('pcg64', 12345)
+
+
+def test_pcg64_values(pcg64):
+    values = [pcg64.random() for _ in range(1000)]
+    assert all(isinstance(value, float) and 0.0 <= value < 1.0 for value in values)
+    assert len(set(values)) == len(values)
+    for bits in (0, 1, 7, 8, 63, 64, 65, 200):
+        assert 0 <= pcg64.getrandbits(bits) < 1 << bits
+    assert max(pcg64.getrandbits(3) for _ in range(200)) == 7
+    with pytest.raises(ValueError):
+        pcg64.getrandbits(-1)
+    data = pcg64.randbytes(1000)
+    assert isinstance(data, bytes) and len(data) == 1000
+    assert pcg64.randbytes(0) == b""
+
+
+def test_pcg64_seed_and_state(pcg64):
+    first = make_rng('pcg64', 7)
+    second = make_rng('pcg64', 7)
+    assert first.randbytes(64) == second.randbytes(64)
+    assert first.random() == second.random()
+    assert make_rng('pcg64', 8).randbytes(64) != make_rng('pcg64', 7).randbytes(64)
+
+    state = pcg64.getstate()
+    expected = pcg64.randbytes(32), pcg64.getrandbits(100), pcg64.random()
+    pcg64.setstate(state)
+    assert (pcg64.randbytes(32), pcg64.getrandbits(100), pcg64.random()) == expected
+    copy = pickle.loads(pickle.dumps(pcg64))
+    assert copy.randbytes(32) == pcg64.randbytes(32)
+
+
+def test_pcg64_engine_is_reproducible(pcg64):
+    words = RandomWordGenerator('pcg64', 3).generate_words_bulk(100, 6)
+    assert RandomWordGenerator('pcg64', 3).generate_words_bulk(100, 6) == words
+    assert RandomWordGenerator('pcg64', 3).generate_random_phrase(5) == \
+        RandomWordGenerator('pcg64', 3).generate_random_phrase(5)
+
+
+def test_secure_rejects_seed():
+    with pytest.raises(ValueError):
+        make_rng('secure', 1)
@@ -0,0 +1,63 @@
+"""
+Компактный контейнер результата (rwg.batch.WordBatch): len, номера,
+срезы и перебор совпадают со списком строк.
+"""
+import io
+
+import pytest
+
+from rwg import RandomWordGenerator
+from rwg.batch import WordBatch
+
+FIXED = ["abc", "def", "ghi", "jkl", "mno"]
+MIXED = ["кот", "", "слон", "a\nb", "ёж"]
+
+
+@pytest.mark.parametrize("items", [FIXED, MIXED], ids=["fixed", "mixed"])
+def test_sequence_matches_list(items):
+    batch = WordBatch.from_strings(items)
+    assert len(batch) == len(items)
+    assert [batch[i] for i in range(len(items))] == items
+    assert batch[-1] == items[-1]
+    assert list(batch) == items
+    assert batch.tolist() == items
+    assert [item for chunk in batch.chunks(2) for item in chunk] == items
+    assert batch.text() == "\n".join(items)
+    with pytest.raises(IndexError):
+        batch[len(items)]
+
+
+@pytest.mark.parametrize("items", [FIXED, MIXED], ids=["fixed", "mixed"])
+def test_slices(items):
+    batch = WordBatch.from_strings(items)
+    for start, stop, step in ((1, 4, 1), (0, 5, 2), (-2, None, 1), (3, 1, 1), (4, 0, -1)):
+        part = batch[start:stop:step]
+        assert isinstance(part, WordBatch)
+        assert list(part) == items[start:stop:step]
+    assert list(batch[1:4][1:]) == items[2:4]
+
+
+def test_concat_and_write():
+    batch = WordBatch.concat([WordBatch.from_strings(FIXED), WordBatch.from_strings(MIXED),
+                              WordBatch.from_strings([])])
+    assert list(batch) == FIXED + MIXED
+    stream = io.BytesIO()
+    assert batch.write_to(stream) == len(stream.getvalue())
+    assert stream.getvalue() == ("\n".join(FIXED + MIXED) + "\n").encode("utf-8")
+
+
+def test_empty_batch():
+    batch = WordBatch.from_strings([])
+    assert len(batch) == 0 and list(batch) == [] and batch.text() == ""
+
+
+@pytest.mark.parametrize("alphabet", ["latin", "cyrillic", "a\n", ("ch", "\n", "o")])
+def test_generated_batch_matches_list(alphabet):
+    # Алфавит с переводом строки: элементы все равно берутся по ширине
+    # или смещениям, а не по разделителю
+    words = RandomWordGenerator(seed=3, alphabet=alphabet).generate_words_bulk(500, 4)
+    batch = RandomWordGenerator(seed=3, alphabet=alphabet).generate_words_batch(500, 4)
+    assert len(batch) == 500
+    assert list(batch) == words
+    assert batch[123] == words[123]
+    assert list(batch[10:20]) == words[10:20]
@@ -0,0 +1,20 @@
+"""
+Ядро генератора (rwg.core): эталонный вывод при фиксированном seed.
+"""
+import random
+
+from rwg import RandomWordGenerator
+
+# Эталон из документации generate_words_bulk
+REFERENCE = ['brvhx', 'xycba', 'zgmgh']
+
+
+def test_words_bulk_reference():
+    random.seed(42)
+    assert RandomWordGenerator.generate_words_bulk(3, 5) == REFERENCE
+
+
+def test_seeded_instance_is_reproducible():
+    first = RandomWordGenerator(seed=7).generate_words_bulk(100, 8)
+    assert RandomWordGenerator(seed=7).generate_words_bulk(100, 8) == first
+    assert all(len(word) == 8 for word in first)
@@ -0,0 +1,36 @@
+"""
+Словари в файлах (rwg.dictionary): индекс строится заново, если он
+устарел или обрезан.
+"""
+import os
+
+from rwg.dictionary import MappedWordList
+
+WORDS = ["кот", "пес", "", "ёж\r", "слон"]
+
+
+def write_dictionary(tmp_path):
+    path = str(tmp_path / "words.txt")
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        file.write("\n".join(WORDS) + "\n")
+    return path
+
+
+def test_words_by_position(tmp_path):
+    with MappedWordList(write_dictionary(tmp_path)) as words:
+        assert list(words) == ["кот", "пес", "ёж", "слон"]
+        assert words[-1] == "слон"
+        assert words[1:3] == ["пес", "ёж"]
+
+
+def test_truncated_index_is_rebuilt(tmp_path):
+    path = write_dictionary(tmp_path)
+    MappedWordList(path).close()
+    index_path = path + ".idx"
+    size = os.path.getsize(index_path)
+    with open(index_path, "r+b") as file:
+        file.truncate(size - 8)
+    with MappedWordList(path) as words:
+        assert list(words) == ["кот", "пес", "ёж", "слон"]
+    assert os.path.getsize(index_path) == size
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
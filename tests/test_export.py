@@ -0,0 +1,56 @@
+"""
+Колоночный формат (rwg.export): запись и чтение дают те же значения,
+файл можно дописывать, а запись с другими колонками отклоняется.
+"""
+import pytest
+
+from rwg.export import ColumnarFile, Exporter
+
+COLUMNS = ("word", "note")
+ROWS = (["кот", "dog", ""], ["первый", "", "ёж 🦔"])
+
+
+def write(path, rows=ROWS, columns=COLUMNS, append=False, compression=None):
+    with Exporter(path, "columnar", columns, compression, append=append) as exporter:
+        exporter.write_rows([list(column) for column in rows])
+
+
+@pytest.mark.parametrize("name, compression", [("data.rwgc", None),
+                                               ("data.rwgc.gz", "gzip")])
+def test_round_trip(tmp_path, name, compression):
+    path = str(tmp_path / name)
+    write(path, compression=compression)
+    with ColumnarFile(path) as data:
+        assert data.columns == COLUMNS
+        assert len(data) == 3
+        assert list(data["word"]) == ROWS[0]
+        assert list(data["note"]) == ROWS[1]
+        assert data["note"][-1] == "ёж 🦔"
+        assert bytes(data["word"].raw(0)) == "кот".encode("utf-8")
+
+
+def test_append_adds_a_group(tmp_path):
+    path = str(tmp_path / "data.rwgc")
+    write(path)
+    write(path, (["x"], ["y"]), append=True)
+    with ColumnarFile(path) as data:
+        assert list(data["word"]) == ROWS[0] + ["x"]
+        assert [list(chunk) for chunk in data["note"].chunks()] == [ROWS[1], ["y"]]
+
+
+def test_append_with_other_columns_rejected(tmp_path):
+    path = str(tmp_path / "data.rwgc")
+    write(path)
+    with pytest.raises(ValueError):
+        write(path, (["x"],), columns=("word",), append=True)
+    with ColumnarFile(path) as data:
+        assert len(data) == 3
+
+
+def test_truncated_file_rejected(tmp_path):
+    path = str(tmp_path / "data.rwgc")
+    write(path)
+    with open(path, "r+b") as file:
+        file.truncate(file.seek(0, 2) - 4)
+    with pytest.raises(ValueError):
+        ColumnarFile(path)
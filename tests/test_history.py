@@ -0,0 +1,51 @@
+"""
+История генерации (rwg.history): журнал сессии по умолчанию временный,
+а повтор прерванной выгрузки не дублирует записи.
+"""
+import os
+
+import pytest
+
+from rwg.batch import WordBatch
+from rwg.history import HistoryStore
+
+
+def test_session_store_is_removed_on_close():
+    store = HistoryStore()
+    path = store.path
+    store.add("Слова", WordBatch.from_strings(["abc", "def"]))
+    assert len(store) == 1
+    assert store.get(1).items == ["abc", "def"]
+    store.close()
+    assert not os.path.exists(path)
+
+
+def test_persistent_store_keeps_entries(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    store = HistoryStore(path)
+    store.add("Имена", ["Анна Иванова"])
+    store.close()
+    store = HistoryStore(path)
+    assert [entry.header for entry in store.page()] == ["Имена"]
+    store.close()
+
+
+@pytest.mark.parametrize("name", ["history.txt", "history.jsonl"])
+def test_export_retry_after_partial_write(tmp_path, name):
+    store = HistoryStore()
+    store.add("first", ["a"])
+    path = str(tmp_path / name)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("earlier\n")
+    assert store.export(path) == 1
+    store.add("second", ["b"])
+    # Прерванная выгрузка: хвост дописан, номер последней записи не сохранен
+    with open(path, "a", encoding="utf-8") as file:
+        file.write("partial")
+    assert store.export(path) == 1
+    with open(path, encoding="utf-8") as file:
+        text = file.read()
+    assert text.startswith("earlier\n")
+    assert "partial" not in text
+    assert text.count("first") == 1
+    store.close()
@@ -0,0 +1,34 @@
+"""
+Марковская модель (rwg.markov): сохранение и загрузка не меняют вывод,
+а недостижимый диапазон длин отклоняется сразу.
+"""
+import random
+
+import pytest
+
+from rwg.markov import MarkovModel
+
+CORPUS = ["привет", "пример", "прибор", "мир", "мирный", "пирог", "порог", "город"]
+
+
+def test_save_load_round_trip(tmp_path):
+    model = MarkovModel.train(CORPUS, order=2)
+    path = str(tmp_path / "model.rwgm")
+    model.save(path)
+    loaded = MarkovModel.load(path)
+    assert (loaded.order, len(loaded), loaded.longest) == (model.order, len(model), model.longest)
+    expected = model.generate(random.Random(5), 200, 3, 8)
+    assert loaded.generate(random.Random(5), 200, 3, 8) == expected
+    assert all(3 <= len(word) <= 8 for word in expected)
+
+
+def test_unreachable_lengths_rejected():
+    # Порядок 1 и цикл a -> b -> c -> a: длины слов кратны 3
+    model = MarkovModel.train(["abc", "abcabc"], order=1)
+    for min_length, max_length in ((4, 5), (100, 101)):
+        with pytest.raises(ValueError):
+            model.length_range(min_length, max_length)
+        with pytest.raises(ValueError):
+            model.generate(random.Random(1), 1, min_length, max_length)
+    assert model.length_range(100, 102) == (100, 102)
+    assert model.generate(random.Random(1), 5, 7, 9) == ["abcabcabc"] * 5
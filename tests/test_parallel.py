@@ -0,0 +1,40 @@
+"""
+Параллельная генерация (rwg.parallel): при одном seed вывод не зависит
+от количества процессов, а словари основного процесса доходят до
+процессов пула без изменения общих словарей класса.
+"""
+import pytest
+
+from rwg import RandomWordGenerator
+from rwg.parallel import KINDS, generate_parallel, generate_shard
+
+SEED = 42
+COUNT = 5000
+SHARD_SIZE = 1000
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_output_does_not_depend_on_workers(kind):
+    single = generate_parallel(kind, COUNT, 6, SEED, workers=1, shard_size=SHARD_SIZE)
+    assert len(single) == COUNT
+    for workers in (2, 3):
+        assert generate_parallel(kind, COUNT, 6, SEED, workers=workers,
+                                 shard_size=SHARD_SIZE) == single
+
+
+def test_vocabulary_reaches_workers():
+    RandomWordGenerator.use_vocabulary('first_names', ['Ия'])
+    try:
+        names = generate_parallel('names', 200, seed=SEED, workers=2, shard_size=50)
+    finally:
+        RandomWordGenerator.reset_vocabulary()
+    assert {name.split(' ')[0] for name in names} == {'Ия'}
+
+
+def test_shard_vocabulary_does_not_change_class():
+    before = RandomWordGenerator.vocabulary
+    vocabulary = dict(before, first_names=['Ия'])
+    names = generate_shard('names', 10, 0, SEED, vocabulary=vocabulary)
+    assert {name.split(' ')[0] for name in names} == {'Ия'}
+    assert RandomWordGenerator.vocabulary is before
+    assert 'Ия' not in before['first_names']
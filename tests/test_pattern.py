@@ -0,0 +1,27 @@
+"""
+Шаблоны (rwg.pattern): повторы и размер шаблона ограничены, лишнее
+отклоняется ValueError еще при разборе.
+"""
+import random
+
+import pytest
+
+from rwg.pattern import MAX_REPEAT, MAX_SIZE, compile_pattern
+
+
+def test_repeat_within_limits():
+    pattern = compile_pattern(f"#{{{MAX_REPEAT}}}")
+    assert [len(line) for line in pattern.generate(random.Random(1), 3)] == [MAX_REPEAT] * 3
+
+
+@pytest.mark.parametrize("source", [
+    "#{1000000000}",
+    f"#{{{MAX_REPEAT + 1}}}",
+    f"{{word:{MAX_SIZE + 1}}}",
+    f"{{word:{MAX_SIZE}}}#",
+    f"{{word:8}}{{{MAX_REPEAT}}}",
+    "x" * (MAX_SIZE + 1),
+])
+def test_oversized_pattern_rejected(source):
+    with pytest.raises(ValueError):
+        compile_pattern(source)
@@ -0,0 +1,65 @@
+"""
+Пул заранее сгенерированных элементов (rwg.prefetch): выборка из буфера,
+заполнение через warm, вытеснение давно не использованных буферов.
+"""
+import threading
+
+import pytest
+
+from rwg import RandomWordGenerator
+from rwg.prefetch import MAX_BUFFER_CHARS, PrefetchPool
+
+
+def test_warm_fills_and_draw_hits():
+    with PrefetchPool(RandomWordGenerator(seed=1), high_water=64) as pool:
+        assert pool.warm('words', length=6, timeout=10)
+        words = pool.draw('words', 10, length=6)
+        assert [len(word) for word in words] == [6] * 10
+        assert pool.stats.hits == 10 and pool.stats.misses == 0
+        assert len(pool.word(6)) == 6
+        assert pool.warm('names', timeout=10) and pool.name()
+        assert pool.warm('phrases', timeout=10) and pool.phrase()
+
+
+def test_long_words_are_not_buffered():
+    length = MAX_BUFFER_CHARS // 64 + 1
+    with PrefetchPool(high_water=64) as pool:
+        assert pool.accepts('words', length - 1)
+        assert not pool.accepts('words', length)
+        assert not pool.warm('words', length=length)
+        assert len(pool.word(length)) == length
+        assert not pool.buffers and pool.stats.misses == 1
+
+
+def test_least_recently_used_buffer_is_evicted():
+    with PrefetchPool(high_water=16, max_buffers=2) as pool:
+        pool.draw('words', length=3)
+        pool.draw('words', length=4)
+        pool.draw('words', length=3)
+        pool.draw('words', length=5)
+        assert [key[1] for key in pool.buffers] == [3, 5]
+
+
+def test_warm_returns_when_its_buffer_is_evicted():
+    pool = PrefetchPool(high_water=16, max_buffers=1)
+    result = []
+    # Фоновый поток не может генерировать, пока тест держит блокировку
+    with pool._engine_lock:
+        waiter = threading.Thread(target=lambda: result.append(pool.warm('names')))
+        waiter.start()
+        while ('names', 0, None) not in pool.buffers:
+            waiter.join(0.01)
+        pool.warm('phrases', timeout=0)
+        waiter.join(10)
+        alive = waiter.is_alive()
+    pool.close()
+    assert not alive and result == [False]
+
+
+def test_closed_pool_rejects_new_buffers():
+    pool = PrefetchPool(high_water=16)
+    pool.draw('names')
+    pool.close()
+    assert pool.draw('names', 3)
+    with pytest.raises(RuntimeError):
+        pool.draw('phrases')
@@ -0,0 +1,91 @@
+"""
+Выборка с весами (rwg.sampling): частоты соответствуют весам по критерию
+хи-квадрат. Генераторы с фиксированным seed, поэтому результат
+воспроизводим.
+"""
+import math
+import random
+
+import pytest
+
+from rwg.sampling import AliasTable, WeightedVocabulary
+
+SAMPLES = 200_000
+P_THRESHOLD = 0.001
+WEIGHTS = {
+    "small": [10, 1, 1, 5, 3, 0.5, 7, 2],
+    "zipf": [1 / rank for rank in range(1, 1001)],
+}
+
+
+def chi_square_p_value(observed, weights):
+    """
+    p-значение критерия хи-квадрат (приближение Уилсона-Хилферти).
+    """
+    total = sum(observed)
+    weight_sum = sum(weights)
+    statistic = 0.0
+    for count, weight in zip(observed, weights):
+        expected = total * weight / weight_sum
+        statistic += (count - expected) ** 2 / expected
+    freedom = len(observed) - 1
+    z = ((statistic / freedom) ** (1 / 3) - (1 - 2 / (9 * freedom))) / math.sqrt(2 / (9 * freedom))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def frequencies(samples, size):
+    observed = [0] * size
+    for index in samples:
+        observed[index] += 1
+    return observed
+
+
+@pytest.mark.parametrize("name", sorted(WEIGHTS))
+def test_sample_many_matches_weights(name):
+    weights = WEIGHTS[name]
+    table = AliasTable(weights)
+    observed = frequencies(table.sample_many(random.Random(1), SAMPLES), len(weights))
+    assert chi_square_p_value(observed, weights) >= P_THRESHOLD
+
+
+@pytest.mark.parametrize("name", sorted(WEIGHTS))
+def test_sample_matches_weights(name):
+    weights = WEIGHTS[name]
+    table = AliasTable(weights)
+    rng = random.Random(2)
+    observed = frequencies([table.sample(rng) for _ in range(SAMPLES)], len(weights))
+    assert chi_square_p_value(observed, weights) >= P_THRESHOLD
+
+
+def test_zero_weight_is_never_drawn():
+    table = AliasTable([1, 0, 1])
+    assert 1 not in set(table.sample_many(random.Random(3), 10_000))
+
+
+def test_skewed_distribution_is_rejected():
+    # Проверка самого критерия: равномерная выборка не проходит для весов Ципфа
+    weights = WEIGHTS["zipf"]
+    rng = random.Random(4)
+    observed = frequencies([rng.randrange(len(weights)) for _ in range(SAMPLES)], len(weights))
+    assert chi_square_p_value(observed, weights) < P_THRESHOLD
+
+
+def test_vocabulary_from_file_reports_line(tmp_path):
+    path = tmp_path / "weights.txt"
+    path.write_text("кот\t2\nпес\tмного\n", encoding="utf-8")
+    with pytest.raises(ValueError, match=r"weights\.txt:2"):
+        WeightedVocabulary.from_file(path)
+
+
+@pytest.mark.parametrize("weights", [[1, math.inf], [1, math.nan], [-math.inf, 1],
+                                     [1e308, 1e308]])
+def test_non_finite_weights_rejected(weights):
+    with pytest.raises(ValueError):
+        AliasTable(weights)
+
+
+def test_vocabulary_from_file_rejects_inf(tmp_path):
+    path = tmp_path / "weights.txt"
+    path.write_text("кот\t2\nпес\tinf\n", encoding="utf-8")
+    with pytest.raises(ValueError, match=r"weights\.txt"):
+        WeightedVocabulary.from_file(path)
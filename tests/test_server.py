@@ -0,0 +1,116 @@
+"""
+HTTP-сервис (rwg.server): проверка запросов, объединение в пакеты и
+потоковые ответы. Сервис запускается на свободном порту 127.0.0.1.
+"""
+import asyncio
+
+import pytest
+
+from rwg.server import MAX_LENGTH, Batcher, GenerationServer
+
+
+async def fetch(address, target, method="GET"):
+    """
+    Статус и тело ответа на один запрос (Connection: close).
+    """
+    reader, writer = await asyncio.open_connection(*address)
+    writer.write(f"{method} {target} HTTP/1.1\r\nConnection: close\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    rest = await reader.read()
+    writer.close()
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    if "Transfer-Encoding: chunked" in lines:
+        body = b""
+        while True:
+            size, _, rest = rest.partition(b"\r\n")
+            size = int(size, 16)
+            if not size:
+                break
+            body, rest = body + rest[:size], rest[size + 2:]
+        rest = body
+    return status, rest.decode("utf-8"), "Transfer-Encoding: chunked" in lines
+
+
+def run_server(check, **options):
+    """
+    Запуск GenerationServer на время корутины check(server, address).
+    """
+    async def main():
+        server = GenerationServer(**options)
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        try:
+            return await check(server, listener.sockets[0].getsockname()[:2])
+        finally:
+            listener.close()
+            await listener.wait_closed()
+            server.executor.shutdown()
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("target, method, status", [
+    ("/unknown", "GET", 404),
+    ("/words?count=abc", "GET", 400),
+    ("/words?count=-1", "GET", 400),
+    (f"/words?length={MAX_LENGTH + 1}", "GET", 400),
+    ("/words?alphabet=aa", "GET", 400),
+    ("/words", "POST", 405),
+])
+def test_invalid_requests(target, method, status):
+    async def check(server, address):
+        return await fetch(address, target, method)
+    assert run_server(check)[0] == status
+
+
+def test_concurrent_requests_share_a_batch():
+    async def check(server, address):
+        responses = await asyncio.gather(*[fetch(address, "/words?count=3&length=6")
+                                           for _ in range(8)])
+        return server, responses
+    server, responses = run_server(check, batch_window=0.05)
+    for status, body, chunked in responses:
+        assert status == 200 and not chunked
+        assert [len(word) for word in body.splitlines()] == [6] * 3
+    assert server.batcher.batches < len(responses)
+    assert server.batcher.snapshot()["batched_requests"] == len(responses)
+
+
+def test_large_response_is_streamed():
+    async def check(server, address):
+        return await fetch(address, "/names?count=20000")
+    status, body, chunked = run_server(check, chunk_size=1000)
+    assert status == 200 and chunked
+    assert len(body.splitlines()) == 20000
+
+
+def test_secure_requests_are_distinct():
+    # Пакеты в цикле событий и порции в фоновом потоке одновременно:
+    # у потоков свои генераторы, поэтому байты не повторяются
+    async def check(server, address):
+        targets = ["/words?count=2000&length=16", "/words?count=20&length=16"] * 10
+        return await asyncio.gather(*[fetch(address, target) for target in targets])
+    responses = run_server(check, backend="secure", stream_threshold=100, chunk_size=100)
+    words = [word for _, body, _ in responses for word in body.splitlines()]
+    assert len(words) == 10 * 2020
+    assert len(set(words)) == len(words)
+
+
+def test_batcher_splits_and_fails():
+    async def check():
+        calls = []
+
+        def generate(key, count):
+            calls.append(count)
+            if key == "bad":
+                raise ValueError("bad key")
+            return list(range(count))
+
+        batcher = Batcher(generate)
+        first, second = batcher.request("k", 2), batcher.request("k", 3)
+        failed = batcher.request("bad", 1)
+        assert await first == [0, 1] and await second == [2, 3, 4]
+        with pytest.raises(ValueError):
+            await failed
+        return calls
+    assert sorted(asyncio.run(check())) == [1, 5]
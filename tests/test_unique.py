@@ -0,0 +1,46 @@
+"""
+Режим без повторов (rwg.unique, RandomWordGenerator.iter_unique_words):
+слова не повторяются, а запрос больше пространства слов отклоняется.
+"""
+import pytest
+
+from rwg import RandomWordGenerator
+from rwg.unique import Bitmap, FingerprintSet
+
+
+@pytest.mark.parametrize("count, length", [
+    (5000, 3),     # битовая карта номеров
+    (5000, 8),     # таблица точных номеров
+    (17000, 3),    # почти все пространство: выборка без возвращения
+    (2000, 20),    # больше 2^64 слов: hash слова
+])
+def test_unique_words_do_not_repeat(count, length):
+    words = RandomWordGenerator(seed=1).generate_random_words(count, length, unique=True)
+    assert len(words) == count
+    assert len(set(words)) == count
+    assert all(len(word) == length for word in words)
+
+
+def test_request_larger_than_space_is_rejected():
+    with pytest.raises(ValueError):
+        RandomWordGenerator(seed=1).generate_random_words(27, 1, unique=True)
+    with pytest.raises(ValueError):
+        RandomWordGenerator(seed=1).iter_unique_words(101, 2, alphabet='digits')
+
+
+def test_fingerprint_zero_does_not_collide_with_one():
+    seen = FingerprintSet()
+    assert seen.select_new(['a', 'b', 'c'], [0, 1, 1 << 64]) == ['a', 'b']
+    assert seen.select_new(['d', 'e', 'f'], [0, 1, 2]) == ['f']
+
+
+def test_fingerprint_set_grows():
+    seen = FingerprintSet(capacity=4)
+    numbers = [index * 7919 for index in range(1, 10001)]
+    assert len(seen.select_new(numbers, numbers)) == len(numbers)
+    assert seen.select_new(numbers, numbers) == []
+
+
+def test_bitmap_marks_numbers():
+    seen = Bitmap(10)
+    assert seen.select_new('abc', [0, 9, 0]) == ['a', 'b']